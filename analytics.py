@@ -0,0 +1,113 @@
+"""
+추천 threshold 백테스트 (NumPy)
+
+stock_daily_recommendations의 positive_ratio / actual_is_up을 배열로 한 번 읽고,
+threshold 여러 개에 대한 성과를 정렬 없이 bincount + 누적합 한 번으로 계산한다.
+
+threshold t에서
+- 추천      : positive_ratio > t   (import 때 is_recommended와 같은 규칙)
+- hit_rate  : 추천 여부와 실제 상승 여부가 맞은 비율 (추천 X & 하락도 맞은 것으로 봄)
+- precision : 추천 중 실제 상승 비율 (= 추천 건의 is_hit 평균)
+- recall    : 실제 상승 중 추천한 비율
+"""
+import numpy as np
+
+
+def threshold_grid(lo: float, hi: float, steps: int) -> np.ndarray:
+    return np.round(np.linspace(lo, hi, steps), 6)
+
+
+def _ratio(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+    out = np.full(num.shape, np.nan)
+    np.divide(num, den, out=out, where=den > 0)
+    return out
+
+
+def _counts(bins: np.ndarray, weights, groups: int, width: int) -> np.ndarray:
+    """
+    (group, k) 칸별 개수 -> threshold j에서 추천된 개수 = k > j 인 칸의 합 (뒤에서부터 누적합)
+    """
+    c = np.bincount(bins, weights=weights, minlength=groups * width).reshape(groups, width)
+    tail = np.cumsum(c[:, ::-1], axis=1)[:, ::-1]
+    return tail[:, 1:]
+
+
+def sweep(ratio: np.ndarray, up: np.ndarray, thresholds: np.ndarray,
+          day_idx: np.ndarray | None = None, days: int = 1) -> dict[str, np.ndarray]:
+    """
+    ratio / up(0·1) / day_idx: 행 단위 배열, thresholds: 오름차순
+    return: 지표별 (days, len(thresholds)) 배열
+    """
+    m = len(thresholds)
+    # k = ratio보다 작은 threshold 개수 -> thresholds[:k]에서 추천
+    k = np.searchsorted(thresholds, ratio, side="left")
+    if day_idx is None:
+        day_idx = np.zeros(len(ratio), dtype=np.int64)
+    bins = day_idx * (m + 1) + k
+
+    up = up.astype(np.float64)
+    n = np.bincount(day_idx, minlength=days).astype(np.float64)[:, None]
+    n_up = np.bincount(day_idx, weights=up, minlength=days)[:, None]
+    rec = _counts(bins, None, days, m + 1)
+    tp = _counts(bins, up, days, m + 1)
+    tn = (n - n_up) - (rec - tp)
+
+    return {
+        "rec_count": rec.astype(np.int64),
+        "hits": tp.astype(np.int64),
+        "hit_rate": _ratio(tp + tn, np.broadcast_to(n, rec.shape)),
+        "precision": _ratio(tp, rec),
+        "recall": _ratio(tp, np.broadcast_to(n_up, rec.shape)),
+    }
+
+
+def factorize_dates(values: list) -> tuple[list, np.ndarray]:
+    """
+    날짜 리스트 -> (정렬된 고유 날짜, 행별 날짜 인덱스)
+    date 객체를 datetime64로 변환하는 것보다 dict로 번호 매기는 쪽이 10배 이상 빠름
+    """
+    seen: dict = {}
+    idx = np.fromiter((seen.setdefault(d, len(seen)) for d in values), dtype=np.int64, count=len(values))
+    uniq = list(seen)
+    order = sorted(range(len(uniq)), key=uniq.__getitem__)
+    rank = np.empty(len(uniq), dtype=np.int64)
+    rank[order] = np.arange(len(uniq))
+    return [uniq[i] for i in order], rank[idx]
+
+
+def _floats(a: np.ndarray) -> list:
+    """NaN -> None (JSON)"""
+    out = np.round(a, 6).astype(object)
+    out[np.isnan(a)] = None
+    return out.tolist()
+
+
+def sweep_report(cols: dict[str, list], thresholds: np.ndarray, daily: bool) -> dict:
+    """
+    cols: {"signal_date": [...], "positive_ratio": [...], "actual_is_up": [...]}
+    """
+    ratio = np.asarray(cols["positive_ratio"], dtype=np.float64)
+    up = np.asarray(cols["actual_is_up"], dtype=np.int8)
+    dates, day_idx = factorize_dates(cols["signal_date"])
+
+    total = sweep(ratio, up, thresholds)
+    report = {
+        "rows": int(len(ratio)),
+        "days": int(len(dates)),
+        "thresholds": thresholds.tolist(),
+        "aggregate": {
+            "rec_count": total["rec_count"][0].tolist(),
+            "hits": total["hits"][0].tolist(),
+            "hit_rate": _floats(total["hit_rate"][0]),
+            "precision": _floats(total["precision"][0]),
+            "recall": _floats(total["recall"][0]),
+        },
+    }
+    if daily:
+        per_day = sweep(ratio, up, thresholds, day_idx, len(dates))
+        metrics = {k: v.tolist() if v.dtype.kind == "i" else _floats(v) for k, v in per_day.items()}
+        report["daily"] = [
+            {"signal_date": str(d), **{k: v[i] for k, v in metrics.items()}}
+            for i, d in enumerate(dates)
+        ]
+    return report
@@ -0,0 +1,3 @@
+"""
+finsight 성능 측정 스크립트 모음
+"""
@@ -0,0 +1,117 @@
+"""
+API 부하 테스트: 동시 접속 수별 p50 / p99 지연 비교
+
+예) 동기/비동기 모드 비교
+    ASYNC_DB=0 uvicorn main:app --port 8000 --workers 1
+    python -m benchmarks.load_test --label sync
+
+    ASYNC_DB=1 uvicorn main:app --port 8000 --workers 1
+    python -m benchmarks.load_test --label async
+
+동시 접속 1000은 클라이언트/서버 모두 ulimit -n 을 넉넉히(4096 이상) 잡고 실행.
+"""
+import json
+import time
+import asyncio
+import argparse
+import statistics
+
+import httpx
+
+DEFAULT_PATHS = [
+    "/recommendations/latest?limit=20",
+    "/recommendations/dates",
+    "/hot-topics/latest?limit=20",
+]
+
+
+def percentile(sorted_values: list[float], p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, max(0, round(p / 100 * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+async def run_level(base_url: str, paths: list[str], concurrency: int, requests_per_client: int) -> dict:
+    """
+    concurrency개의 클라이언트가 동시에 requests_per_client번씩 요청 (paths는 순서대로 돌아가며 사용)
+    """
+    latencies: list[float] = []
+    errors = 0
+    # 2xx가 아닌 응답은 상태 코드별로 세고 지연 분포에서는 뺌 (404가 빠른 성공으로 잡히지 않게)
+    statuses: dict[str, int] = {}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+        async def worker(i: int):
+            nonlocal errors
+            for n in range(requests_per_client):
+                path = paths[(i + n) % len(paths)]
+                t0 = time.perf_counter()
+                try:
+                    r = await client.get(path)
+                except httpx.HTTPError as e:
+                    errors += 1
+                    statuses[type(e).__name__] = statuses.get(type(e).__name__, 0) + 1
+                    continue
+                if not 200 <= r.status_code < 300:
+                    errors += 1
+                    statuses[str(r.status_code)] = statuses.get(str(r.status_code), 0) + 1
+                    continue
+                latencies.append((time.perf_counter() - t0) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "error_statuses": statuses,
+        "rps": round(len(latencies) / elapsed, 1) if elapsed > 0 else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "mean_ms": round(statistics.fmean(latencies), 2) if latencies else 0.0,
+    }
+
+
+async def run(base_url: str, paths: list[str], levels: list[int], requests_per_client: int) -> list[dict]:
+    # 워밍업 (커넥션 풀 / 캐시 채우기)
+    await run_level(base_url, paths, min(10, levels[0]), 2)
+
+    results = []
+    for c in levels:
+        res = await run_level(base_url, paths, c, requests_per_client)
+        print(
+            f"concurrency={res['concurrency']:>5}  rps={res['rps']:>9,.1f}  "
+            f"p50={res['p50_ms']:>8.2f}ms  p99={res['p99_ms']:>8.2f}ms  errors={res['errors']}"
+        )
+        results.append(res)
+    return results
+
+
+def main():
+    ap = argparse.ArgumentParser(description="finsight API load test")
+    ap.add_argument("--base-url", default="http://127.0.0.1:8000")
+    ap.add_argument("--path", action="append", dest="paths", help="요청할 경로 (여러 번 지정 가능)")
+    ap.add_argument("--concurrency", default="50,200,1000", help="쉼표로 구분한 동시 접속 수")
+    ap.add_argument("--requests-per-client", type=int, default=20)
+    ap.add_argument("--label", default="", help="결과 구분용 이름 (sync / async 등)")
+    ap.add_argument("--out", help="결과를 저장할 JSON 파일")
+    args = ap.parse_args()
+
+    levels = [int(x) for x in args.concurrency.split(",") if x.strip()]
+    paths = args.paths or DEFAULT_PATHS
+
+    results = asyncio.run(run(args.base_url, paths, levels, args.requests_per_client))
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"label": args.label, "base_url": args.base_url, "paths": paths, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,453 @@
+"""
+MySQL 8 실서버 확인: 스키마 적용 / 캔들 파티션 migrate / 파티션 관리 / 쿼리 계획 / 대시보드 부하 -> JSON
+
+SQLite(suite.py --db sqlite)로는 못 보는 것들 (RANGE COLUMNS 파티션, LATERAL, EXPLAIN)을
+빈 스키마(--db, 기본 finsight_check)에서 확인. 접속 정보는 importer와 같은 DB_HOST / DB_USER / DB_PASS 등.
+--db 스키마는 매번 DROP 후 새로 만듦 (DB_NAME과 같은 이름은 거부)
+
+1) schema    : finsight.sql 그대로 적용 (CREATE DATABASE / USE만 --db로 바꿈), MySQL >= 8.0.14 확인 (LATERAL)
+2) migrate   : 파티션 전 stock_price_candles(PK id, fk_candle_stock, idx_candle_stock_time)를 만들고
+               합성 1H / 1D 캔들(또는 --copy-from 스키마의 테이블 복사)을 넣은 뒤
+               maintain_candle_partitions로 dry run -> migrate. 행 수 / 파티션 / PK / FK / 인덱스 비교
+3) maintain  : 두 달 뒤 날짜로 실행해서 p_1h_max REORGANIZE, 보관 기간이 지난 월 파티션 archive / DROP dry run
+               (가장 오래된 월 파티션은 실제로 gzip CSV로 보관해서 행 수 비교, DROP은 안 함)
+4) explain   : /stocks/{id}/candles plan(1H / 1D 원본, 1W / 1M 집계)의 EXPLAIN partitions 컬럼 (파티션 pruning)
+5) dashboard : 관심 종목 5 / 200개 사용자 + 추천 / hot_topics / latest_quotes 적재,
+               dashboard plan 쿼리 3개의 EXPLAIN (key), /users/{id}/dashboard 부하 테스트 (--skip-api면 생략)
+
+예)
+    DB_HOST=127.0.0.1 DB_PASS=... python -m benchmarks.mysql_check --out mysql_check.json
+    # 운영 테이블 복사본으로 migrate 확인 (FK는 CREATE TABLE LIKE가 복사하지 않음)
+    python -m benchmarks.mysql_check --copy-from finsight --skip-api
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import tempfile
+import argparse
+from datetime import date, datetime, timedelta, timezone
+
+import pymysql
+from fastapi import HTTPException
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import URL
+
+from benchmarks.suite import ROOT, IMPORT_DIR, git_commit, start_server
+from benchmarks.load_test import run_level
+
+if IMPORT_DIR not in sys.path:
+    sys.path.insert(0, IMPORT_DIR)
+import backfill_outcomes
+import latest_quotes
+import maintain_candle_partitions as mcp
+from importer_core import DB
+
+import queries
+from registry import Registry
+
+SCHEMA_PATH = os.path.join(ROOT, "finsight.sql")
+
+MIN_VERSION = (8, 0, 14)  # LATERAL
+
+SOURCE_CODE = "NAVER"
+FAVORITE_COUNTS = [5, 200]
+
+# dashboard plan EXPLAIN에서 기대하는 인덱스 (별칭 -> key): 종목마다 인덱스 한 번씩
+DASHBOARD_KEYS = {"x": "uq_daily_stock_source", "q": "PRIMARY", "h": "uq_hot_source_date_stock"}
+
+# 파티션 적용 전 stock_price_candles (finsight.sql 변경 전 정의)
+PRE_PARTITION_CANDLES_DDL = """
+CREATE TABLE stock_price_candles (
+    id           BIGINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+    stock_id     BIGINT UNSIGNED NOT NULL,
+    timeframe    VARCHAR(10) NOT NULL,
+    candle_time  DATETIME NOT NULL,
+    open_price   DECIMAL(15, 2) NOT NULL,
+    high_price   DECIMAL(15, 2) NOT NULL,
+    low_price    DECIMAL(15, 2) NOT NULL,
+    close_price  DECIMAL(15, 2) NOT NULL,
+    volume       BIGINT UNSIGNED NOT NULL,
+    created_at   DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    CONSTRAINT fk_candle_stock
+        FOREIGN KEY (stock_id) REFERENCES stocks(id)
+        ON DELETE CASCADE,
+    CONSTRAINT uq_candle_unique
+        UNIQUE (stock_id, timeframe, candle_time),
+    INDEX idx_candle_stock_time (stock_id, timeframe, candle_time)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+"""
+
+SEED_STOCKS_SQL = """
+INSERT INTO stocks (ticker, name_ko)
+WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < %s)
+SELECT LPAD(i, 6, '0'), CONCAT('종목', i) FROM n
+"""
+
+# 평일 09~15시 1H + 같은 날 1D (가격은 종목 / 날짜로 정해지는 값, 분포는 상관없음)
+SEED_CANDLES_SQL = """
+INSERT INTO stock_price_candles
+  (stock_id, timeframe, candle_time, open_price, high_price, low_price, close_price, volume)
+WITH RECURSIVE
+  d(dt) AS (SELECT CAST(%(start)s AS DATE) UNION ALL SELECT dt + INTERVAL 1 DAY FROM d WHERE dt < %(end)s),
+  h(hr) AS (SELECT {first_hour} UNION ALL SELECT hr + 1 FROM h WHERE hr < {last_hour})
+SELECT s.id, %(tf)s, TIMESTAMP(d.dt) + INTERVAL h.hr HOUR,
+       100, 110, 90, 100 + MOD(s.id * 7 + DAYOFYEAR(d.dt) + h.hr, 13), 1000 + s.id
+FROM stocks s CROSS JOIN d CROSS JOIN h
+WHERE WEEKDAY(d.dt) < 5
+"""
+
+SEED_USERS_SQL = "INSERT INTO users (email, password_hash, nickname) VALUES (%s, 'x', %s)"
+
+SEED_FAVORITES_SQL = """
+INSERT INTO user_favorites (user_id, stock_id)
+SELECT %s, id FROM stocks ORDER BY id LIMIT %s
+"""
+
+SEED_RECOMMENDATIONS_SQL = """
+INSERT INTO stock_daily_recommendations
+  (stock_id, source_id, signal_date, positive_ratio, threshold_used, is_recommended)
+WITH RECURSIVE d(dt) AS (SELECT CAST(%(start)s AS DATE) UNION ALL SELECT dt + INTERVAL 1 DAY FROM d WHERE dt < %(end)s)
+SELECT s.id, %(sid)s, d.dt, MOD(s.id * 31 + DAYOFYEAR(d.dt) * 17, 100) / 100, 0.35,
+       MOD(s.id * 31 + DAYOFYEAR(d.dt) * 17, 100) / 100 > 0.35
+FROM stocks s CROSS JOIN d
+WHERE WEEKDAY(d.dt) < 5
+"""
+
+SEED_HOT_TOPICS_SQL = """
+INSERT INTO hot_topics (source_id, topic_date, stock_id, mentions, mentions_7d_ma, popularity)
+WITH RECURSIVE d(dt) AS (SELECT CAST(%(start)s AS DATE) UNION ALL SELECT dt + INTERVAL 1 DAY FROM d WHERE dt < %(end)s)
+SELECT %(sid)s, d.dt, s.id, 1 + MOD(s.id + DAYOFYEAR(d.dt), 50), 10, 1 + MOD(s.id + DAYOFYEAR(d.dt), 50)
+FROM stocks s CROSS JOIN d
+"""
+
+
+def server_version(conn) -> tuple[int, ...]:
+    with conn.cursor() as cur:
+        cur.execute("SELECT VERSION()")
+        v = cur.fetchone()[0]
+    return tuple(int(x) for x in v.split("-")[0].split(".")[:3])
+
+
+def schema_statements(path: str) -> list[str]:
+    """finsight.sql -> 문장 리스트 (주석 줄 제거, CREATE DATABASE / USE 제외)"""
+    with open(path, encoding="utf-8") as f:
+        lines = [ln for ln in f.read().splitlines() if not ln.lstrip().startswith("--")]
+    stmts = [s.strip() for s in "\n".join(lines).split(";")]
+    return [s for s in stmts if s and not s.upper().startswith(("CREATE DATABASE", "USE "))]
+
+
+def count_rows(cur, where: str = "") -> int:
+    cur.execute(f"SELECT COUNT(*) FROM stock_price_candles {where}")
+    return int(cur.fetchone()[0])
+
+
+def table_shape(cur) -> dict:
+    cur.execute(mcp.CONSTRAINT_EXISTS_SQL, (mcp.TABLE, "fk_candle_stock"))
+    fk = bool(cur.fetchone()[0])
+    cur.execute(mcp.INDEX_EXISTS_SQL, (mcp.TABLE, "idx_candle_stock_time"))
+    idx = bool(cur.fetchone()[0])
+    cur.execute(
+        "SELECT COLUMN_NAME FROM information_schema.STATISTICS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = 'PRIMARY' ORDER BY SEQ_IN_INDEX",
+        (mcp.TABLE,),
+    )
+    pk = [r[0] for r in cur.fetchall()]
+    return {"rows": count_rows(cur), "partitions": mcp.load_partitions(cur), "primary_key": pk,
+            "fk_candle_stock": fk, "idx_candle_stock_time": idx}
+
+
+# 1) schema
+def check_schema(server, db_name: str) -> dict:
+    with server.cursor() as cur:
+        cur.execute(f"DROP DATABASE IF EXISTS `{db_name}`")
+        cur.execute(f"CREATE DATABASE `{db_name}` DEFAULT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci")
+    server.select_db(db_name)
+    stmts = schema_statements(SCHEMA_PATH)
+    with server.cursor() as cur:
+        for s in stmts:
+            cur.execute(s)
+        partitions = mcp.load_partitions(cur)
+    server.commit()
+    print(f"schema: {len(stmts)} statements, {mcp.TABLE} partitions={partitions}")
+    return {"statements": len(stmts), "partitions": partitions}
+
+
+# 2) migrate
+def seed_candles(conn, n_stocks: int, months: int, today: date, copy_from: str | None):
+    with conn.cursor() as cur:
+        cur.execute(f"DROP TABLE {mcp.TABLE}")
+        if copy_from:
+            cur.execute(f"INSERT INTO stocks SELECT * FROM `{copy_from}`.stocks")
+            cur.execute(f"CREATE TABLE {mcp.TABLE} LIKE `{copy_from}`.{mcp.TABLE}")
+            cur.execute(f"INSERT INTO {mcp.TABLE} SELECT * FROM `{copy_from}`.{mcp.TABLE}")
+        else:
+            cur.execute(SEED_STOCKS_SQL, (n_stocks,))
+            cur.execute(PRE_PARTITION_CANDLES_DDL)
+            params = {"start": mcp.add_months(today.replace(day=1), -months), "end": today}
+            cur.execute(SEED_CANDLES_SQL.format(first_hour=9, last_hour=15), {**params, "tf": mcp.HOURLY})
+            cur.execute(SEED_CANDLES_SQL.format(first_hour=0, last_hour=0), {**params, "tf": "1D"})
+    conn.commit()
+
+
+def check_migrate(conn, today: date) -> dict:
+    with conn.cursor() as cur:
+        before = table_shape(cur)
+    print(f"before: {before}")
+
+    # 월 파티션을 전부 만든 상태로 3)을 보기 위해 migrate 때는 보관 기간 없이
+    mcp.CANDLE_PARTITION_MIGRATE = True
+    retention = mcp.CANDLE_1H_RETENTION_MONTHS
+    mcp.CANDLE_1H_RETENTION_MONTHS = 0
+    try:
+        print("-- dry run")
+        mcp.maintain(conn, today, dry_run=True)
+        print("-- migrate")
+        t0 = time.perf_counter()
+        res = mcp.maintain(conn, today, dry_run=False)
+        elapsed = time.perf_counter() - t0
+    finally:
+        mcp.CANDLE_1H_RETENTION_MONTHS = retention
+
+    with conn.cursor() as cur:
+        after = table_shape(cur)
+        cur.execute(f"SHOW CREATE TABLE {mcp.TABLE}")
+        ddl = cur.fetchone()[1]
+    print(f"after ({elapsed:.2f}s): {after}")
+    ok = (after["rows"] == before["rows"] and after["primary_key"] == ["id", "timeframe", "candle_time"]
+          and not after["fk_candle_stock"] and not after["idx_candle_stock_time"]
+          and after["partitions"][0] == mcp.LOW_PARTITION and after["partitions"][-2:] == [mcp.MAX_PARTITION, mcp.HIGH_PARTITION])
+    return {"ok": ok, "result": res, "elapsed_sec": round(elapsed, 3), "before": before, "after": after, "ddl": ddl}
+
+
+# 3) maintain
+def check_maintain(conn, today: date) -> dict:
+    with conn.cursor() as cur:
+        before = table_shape(cur)
+
+    # 두 달 뒤에 돌았을 때처럼 p_1h_max를 나눔 (보관 / DROP은 아래 dry run으로만)
+    retention = mcp.CANDLE_1H_RETENTION_MONTHS
+    mcp.CANDLE_1H_RETENTION_MONTHS = 0
+    try:
+        t0 = time.perf_counter()
+        res = mcp.maintain(conn, mcp.add_months(today, 2), dry_run=False)
+        reorganize_sec = time.perf_counter() - t0
+    finally:
+        mcp.CANDLE_1H_RETENTION_MONTHS = retention
+    with conn.cursor() as cur:
+        after = table_shape(cur)
+    print(f"reorganize {mcp.MAX_PARTITION}: created={res['created']} in {reorganize_sec:.2f}s, partitions={after['partitions']}")
+
+    # archive / DROP PARTITION dry run (이번 달 기준 보관 기간)
+    print("-- archive / drop dry run")
+    mcp.maintain(conn, today, dry_run=True)
+    cutoff = mcp.add_months(today.replace(day=1), -mcp.CANDLE_1H_RETENTION_MONTHS)
+    expired = mcp.expired_partitions(after["partitions"], cutoff)
+
+    archive = None
+    if expired:
+        with conn.cursor() as cur:
+            rows = count_rows(cur, f"PARTITION ({expired[0]})")
+        with tempfile.TemporaryDirectory() as d:
+            t0 = time.perf_counter()
+            path, archived = mcp.archive_partition(conn, expired[0], d)
+            archive = {"partition": expired[0], "partition_rows": rows, "archived_rows": archived,
+                       "bytes": os.path.getsize(path), "elapsed_sec": round(time.perf_counter() - t0, 3)}
+        print(f"archive {expired[0]}: {archive}")
+
+    ok = (after["rows"] == before["rows"] and res["created"] > 0
+          and (archive is None or archive["partition_rows"] == archive["archived_rows"]))
+    return {"ok": ok, "created": res["created"], "reorganize_sec": round(reorganize_sec, 3),
+            "partitions": after["partitions"], "expired": expired, "archive": archive}
+
+
+# 4), 5) plan을 그대로 돌리면서 단계마다 EXPLAIN
+def run_plan(sa_conn, plan, steps: list | None = None):
+    """db.execute와 같은 규칙으로 plan 실행. steps를 주면 단계마다 EXPLAIN 결과를 쌓음"""
+    try:
+        stmt, params, fetch = next(plan)
+        while True:
+            if steps is not None:
+                rows = sa_conn.execute(text("EXPLAIN " + stmt.text), params).mappings().all()
+                steps.append({"sql": " ".join(stmt.text.split()), "params": {k: str(v) for k, v in params.items()},
+                              "explain": [{k: r[k] for k in ("table", "partitions", "type", "key", "rows", "Extra")}
+                                          for r in rows]})
+            result = sa_conn.execute(stmt, params).mappings()
+            if fetch == "first":
+                row = result.first()
+                out = dict(row) if row is not None else None
+            else:
+                out = [dict(r) for r in result.all()]
+            stmt, params, fetch = plan.send(out)
+    except StopIteration as stop:
+        return stop.value
+
+
+def candle_cases(today: date) -> list[dict]:
+    month = mcp.add_months(today.replace(day=1), -3)
+    m = datetime.combine(month, datetime.min.time())
+    return [
+        {"name": "1H one month", "timeframe": "1H", "source": None, "start": m,
+         "end": datetime.combine(mcp.add_months(month, 1), datetime.min.time()),
+         "expect": [mcp.partition_name(month)]},
+        {"name": "1H three months", "timeframe": "1H", "source": None, "start": m,
+         "end": datetime.combine(mcp.add_months(month, 3), datetime.min.time()),
+         "expect": [mcp.partition_name(mcp.add_months(month, i)) for i in range(3)]},
+        {"name": "1W from 1H", "timeframe": "1W", "source": "1H", "start": m,
+         "end": datetime.combine(mcp.add_months(month, 1), datetime.min.time()),
+         "expect": [mcp.partition_name(month)]},
+        {"name": "1D raw", "timeframe": "1D", "source": None, "start": m - timedelta(days=90), "end": m,
+         "expect": [mcp.LOW_PARTITION]},
+        {"name": "1M from 1D", "timeframe": "1M", "source": None, "start": datetime(1970, 1, 1),
+         "end": datetime(9999, 12, 31), "expect": [mcp.LOW_PARTITION]},
+    ]
+
+
+def explain_candles(sa_conn, today: date) -> list[dict]:
+    stock_id = sa_conn.execute(text("SELECT MIN(stock_id) FROM stock_price_candles")).scalar()
+    out = []
+    for case in candle_cases(today):
+        plan = queries.candles_plan(stock_id, case["start"], case["end"], case["timeframe"], case["source"], None)
+        steps = []
+        try:
+            count = run_plan(sa_conn, plan, steps)["count"]
+        except HTTPException:
+            # 구간에 캔들 없음 (--copy-from 데이터) -> EXPLAIN만
+            count = 0
+        parts = [p for s in steps for r in s["explain"] if r["partitions"] for p in r["partitions"].split(",")]
+        ok = sorted(set(parts)) == sorted(case["expect"])
+        print(f"candles {case['name']:>16}: partitions={parts} expect={case['expect']} ok={ok} count={count}")
+        out.append({"case": case["name"], "ok": ok, "partitions": parts, "expect": case["expect"],
+                    "count": count, "steps": steps})
+    return out
+
+
+# 5) dashboard
+def seed_dashboard(conn, today: date) -> list[int]:
+    start = today - timedelta(days=120)
+    with conn.cursor() as cur:
+        cur.execute("SELECT id FROM sources WHERE code = %s", (SOURCE_CODE,))
+        sid = cur.fetchone()[0]
+        cur.execute(SEED_RECOMMENDATIONS_SQL, {"start": start, "end": today, "sid": sid})
+        cur.execute(SEED_HOT_TOPICS_SQL, {"start": today - timedelta(days=7), "end": today, "sid": sid})
+        user_ids = []
+        for n in FAVORITE_COUNTS:
+            cur.execute(SEED_USERS_SQL, (f"check{n}@example.com", f"fav{n}"))
+            user_ids.append(cur.lastrowid)
+            cur.execute(SEED_FAVORITES_SQL, (cur.lastrowid, n))
+        cur.execute("SELECT id FROM stocks")
+        ids = [r[0] for r in cur.fetchall()]
+    conn.commit()
+
+    # importer가 적재 후 하는 것과 같게 (파티션 테이블에서 LATERAL / 결과 backfill이 도는지도 같이 확인)
+    done = latest_quotes.refresh_latest_quotes(conn, ["1H", "1D"], ids)
+    outcomes = backfill_outcomes.backfill_outcomes(conn)
+    print(f"seed: latest_quotes affected={done}, outcomes computed={outcomes['computed']} updated={outcomes['updated']}")
+    return user_ids
+
+
+def explain_dashboard(sa_conn, user_ids: list[int]) -> list[dict]:
+    async def load():
+        return run_plan(sa_conn, queries.registry_plan())
+
+    reg = Registry(load)
+    asyncio.run(reg.refresh())
+
+    out = []
+    for uid, n in zip(user_ids, FAVORITE_COUNTS):
+        t0 = time.perf_counter()
+        steps = []
+        payload = run_plan(sa_conn, queries.dashboard_plan(reg, uid, SOURCE_CODE, "1D"), steps)
+        elapsed = time.perf_counter() - t0
+        keys = {r["table"]: r["key"] for s in steps for r in s["explain"]}
+        ok = all(keys.get(t) == k for t, k in DASHBOARD_KEYS.items())
+        print(f"dashboard favorites={n}: count={payload['count']} keys={keys} ok={ok} "
+              f"({elapsed * 1000:.1f}ms incl. EXPLAIN)")
+        out.append({"user_id": uid, "favorites": n, "ok": ok, "count": payload["count"], "keys": keys, "steps": steps})
+    return out
+
+
+async def load_dashboard(base_url: str, user_ids: list[int], levels: list[int], requests_per_client: int) -> list[dict]:
+    results = []
+    for uid, n in zip(user_ids, FAVORITE_COUNTS):
+        path = f"/users/{uid}/dashboard"
+        await run_level(base_url, [path], min(10, levels[0]), 2)
+        for c in levels:
+            res = await run_level(base_url, [path], c, requests_per_client)
+            print(f"dashboard favorites={n:>4}  concurrency={c:>5}  p50={res['p50_ms']:>8.2f}ms  "
+                  f"p95={res['p95_ms']:>8.2f}ms  p99={res['p99_ms']:>8.2f}ms  errors={res['errors']}")
+            results.append({"favorites": n, "path": path, **res})
+    return results
+
+
+def main():
+    ap = argparse.ArgumentParser(description="finsight MySQL 8 schema / partition / plan check")
+    ap.add_argument("--db", default="finsight_check", help="매번 새로 만드는 스키마 이름")
+    ap.add_argument("--copy-from", help="이 스키마의 stocks / stock_price_candles를 복사해서 migrate")
+    ap.add_argument("--stocks", type=int, default=max(FAVORITE_COUNTS))
+    ap.add_argument("--months", type=int, default=14, help="합성 1H / 1D 캔들 개월 수")
+    ap.add_argument("--concurrency", default="5,50")
+    ap.add_argument("--requests-per-client", type=int, default=20)
+    ap.add_argument("--port", type=int, default=8766)
+    ap.add_argument("--skip-api", action="store_true")
+    ap.add_argument("--out", default="mysql_check.json")
+    args = ap.parse_args()
+
+    if args.db in (DB["database"], args.copy_from):
+        raise SystemExit(f"--db {args.db}: 매번 DROP하는 스키마라 DB_NAME / --copy-from과 다른 이름이어야 합니다.")
+
+    today = date.today()
+    server = pymysql.connect(**{**DB, "database": None})
+    try:
+        version = server_version(server)
+        if version < MIN_VERSION:
+            raise SystemExit(f"MySQL {'.'.join(map(str, version))}: LATERAL은 8.0.14 이상 필요")
+
+        report = {
+            "commit": git_commit(),
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "mysql_version": ".".join(map(str, version)),
+            "db": args.db,
+        }
+        report["schema"] = check_schema(server, args.db)
+
+        t0 = time.perf_counter()
+        seed_candles(server, args.stocks, args.months, today, args.copy_from)
+        print(f"seeded candles in {time.perf_counter() - t0:.2f}s")
+        report["migrate"] = check_migrate(server, today)
+        report["maintain"] = check_maintain(server, today)
+        # plan 쪽 연결의 스냅샷보다 먼저 적재
+        user_ids = seed_dashboard(server, today)
+
+        url = URL.create("mysql+pymysql", username=DB["user"], password=DB["password"], host=DB["host"],
+                         port=DB["port"], database=args.db, query={"charset": "utf8mb4"})
+        engine = create_engine(url)
+        try:
+            with engine.connect() as sa_conn:
+                report["candles_explain"] = explain_candles(sa_conn, today)
+                report["dashboard_explain"] = explain_dashboard(sa_conn, user_ids)
+        finally:
+            engine.dispose()
+    finally:
+        server.close()
+
+    if not args.skip_api:
+        levels = [int(x) for x in args.concurrency.split(",") if x.strip()]
+        log_path = os.path.join(tempfile.gettempdir(), "mysql_check_api.log")
+        proc = start_server(args.port, {"DB_URL": url.render_as_string(hide_password=False), "ASYNC_DB": "0"}, log_path)
+        try:
+            report["dashboard_load"] = asyncio.run(
+                load_dashboard(f"http://127.0.0.1:{args.port}", user_ids, levels, args.requests_per_client)
+            )
+        finally:
+            proc.terminate()
+            proc.wait()
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False, default=str)
+    print(f"results -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
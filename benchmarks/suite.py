@@ -0,0 +1,329 @@
+"""
+합성 데이터로 importer + API 전체 벤치마크 -> JSON
+
+1) benchmarks/synthetic.py로 데이터 생성
+2) importer를 하나씩 별도 프로세스로 실행 (rows/sec, 최대 RSS)
+3) uvicorn으로 main:app을 띄우고 엔드포인트별 동시 요청 (p50 / p95 / p99)
+4) 결과를 --out JSON에 저장 (커밋 해시 포함, 커밋끼리 비교용)
+
+DB
+  --db mysql  : DB_HOST / DB_NAME 등 importer와 같은 환경변수의 MySQL (빈 스키마에 finsight.sql 적용해 둘 것)
+  --db sqlite : importer는 pymysql 전용이라 건너뛰고, 생성 데이터를 SQLite 파일에 바로 넣어 API만 측정.
+                MySQL 전용 SQL(LATERAL, WEEKDAY 등)을 쓰는 엔드포인트는 제외됨
+
+예)
+    python -m benchmarks.suite --db mysql --stocks 500 --days 120 --out bench_mysql.json
+    python -m benchmarks.suite --db sqlite --concurrency 50,200 --out bench_sqlite.json
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import sqlite3
+import argparse
+import subprocess
+from datetime import datetime, timezone
+
+import httpx
+import numpy as np
+import pandas as pd
+
+from benchmarks import synthetic
+from benchmarks.load_test import run_level
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT_DIR = os.path.join(ROOT, "import_csv")
+
+THRESHOLD_USED = 0.35
+
+
+def git_commit() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# Importers
+def importer_steps(files: dict, rows: dict) -> list[dict]:
+    """실행 순서대로 (가격 -> stocks 생성이 먼저)"""
+    return [
+        {"name": "price", "script": "import_price_csv.py", "args": [files["prices"]], "rows": rows["prices"]},
+        {"name": "recommendation", "script": "import_recommendation_csv.py", "args": [],
+         "env": {"REC_CSV": files["recommendations"]}, "rows": rows["recommendations"]},
+        {"name": "hot_topic", "script": "import_hot_topic_csv.py", "args": [files["hot_topics"]],
+         "rows": rows["hot_topics"]},
+        {"name": "posts", "script": "import_posts.py", "args": [files["posts"]],
+         "env": {"BUILD_HOT_TOPICS": "0"}, "rows": rows["posts"]},
+        {"name": "build_hot_topics", "script": "build_hot_topics.py", "args": [], "rows": rows["posts"]},
+    ]
+
+
+def run_importer(step: dict, log_dir: str) -> dict:
+    """
+    별도 프로세스로 실행하고 wait4로 그 프로세스만의 rusage를 받음 (ru_maxrss: Linux KB)
+    """
+    env = {**os.environ, **step.get("env", {})}
+    log_path = os.path.join(log_dir, f"{step['name']}.log")
+    started = time.perf_counter()
+    with open(log_path, "w", encoding="utf-8") as log:
+        proc = subprocess.Popen(
+            [sys.executable, os.path.join(IMPORT_DIR, step["script"]), *step["args"]],
+            cwd=IMPORT_DIR, env=env, stdout=log, stderr=subprocess.STDOUT,
+        )
+        _, status, usage = os.wait4(proc.pid, 0)
+    elapsed = time.perf_counter() - started
+    proc.returncode = os.waitstatus_to_exitcode(status)
+
+    return {
+        "name": step["name"],
+        "ok": proc.returncode == 0,
+        "rows": step["rows"],
+        "elapsed_sec": round(elapsed, 3),
+        "rows_per_sec": round(step["rows"] / elapsed, 1) if elapsed > 0 else 0.0,
+        "peak_rss_mb": round(usage.ru_maxrss / 1024, 1),
+        "cpu_user_sec": round(usage.ru_utime, 3),
+        "cpu_sys_sec": round(usage.ru_stime, 3),
+        "log": log_path,
+    }
+
+
+# SQLite stand-in
+def seed_sqlite(path: str, frames: dict):
+    """생성 데이터를 API가 읽는 테이블 모양으로 SQLite에 바로 적재"""
+    if os.path.exists(path):
+        os.remove(path)
+    stocks = frames["stocks"]
+    sid_by_ticker = dict(zip(stocks["ticker"], stocks["id"]))
+
+    prices = frames["prices"]
+    candles = pd.DataFrame({
+        "stock_id": prices["Code"].map(sid_by_ticker),
+        "timeframe": "1H",
+        "candle_time": prices["Date"],
+        "open_price": prices["Open"], "high_price": prices["High"],
+        "low_price": prices["Low"], "close_price": prices["Close"],
+        "volume": prices["Volume"],
+    })
+
+    # 종목별 마지막 두 봉 -> latest_quotes
+    last2 = candles.groupby("stock_id").tail(2)
+    prev = last2.groupby("stock_id")["close_price"].first()
+    quotes = last2.groupby("stock_id").tail(1).set_index("stock_id")
+    quotes = pd.DataFrame({
+        "timeframe": "1H",
+        "stock_id": quotes.index,
+        "candle_time": quotes["candle_time"].to_numpy(),
+        "close_price": quotes["close_price"].to_numpy(),
+        "prev_close": prev.reindex(quotes.index).to_numpy(),
+        "change_pct": ((quotes["close_price"] - prev.reindex(quotes.index)) / prev.reindex(quotes.index) * 100)
+        .round(4).to_numpy(),
+        "volume": quotes["volume"].to_numpy(),
+    })
+
+    # 일봉 -> stock_daily_metrics (importer와 같은 계산)
+    if IMPORT_DIR not in sys.path:
+        sys.path.insert(0, IMPORT_DIR)
+    import build_daily_metrics
+    daily = candles.assign(d=pd.to_datetime(candles["candle_time"].str.slice(0, 10))) \
+        .groupby(["stock_id", "d"], as_index=False).agg(close_price=("close_price", "last"), volume=("volume", "sum"))
+    metrics = build_daily_metrics.compute_metrics(daily)
+    metrics = metrics.assign(metric_date=metrics["d"].dt.strftime("%Y-%m-%d")).drop(columns="d")
+
+    recs = frames["recommendations"]
+    ratio = recs["Positive_Ratio"]
+    is_rec = (ratio > THRESHOLD_USED).astype(int)
+    success = recs["Prediction_Success"].map({"success": 1.0, "fail": 0.0})
+    actual_up = success.where(is_rec == 1, 1 - success)
+    rec_rows = pd.DataFrame({
+        "stock_id": recs["Code"].map(sid_by_ticker),
+        "source_id": 1,
+        "signal_date": recs["Date"],
+        "positive_ratio": ratio,
+        "threshold_used": THRESHOLD_USED,
+        "is_recommended": is_rec,
+        "actual_is_up": actual_up.astype("Int64"),
+        "is_hit": success.where(is_rec == 1).astype("Int64"),
+    })
+    coverage = rec_rows.groupby("signal_date").size().rename("loaded_cnt").reset_index()
+    coverage = coverage.assign(source_id=1, total_stocks=len(stocks),
+                               is_complete=(coverage["loaded_cnt"] == len(stocks)).astype(int))
+
+    hot = frames["hot_topics"]
+    hot_rows = pd.DataFrame({
+        "source_id": 1,
+        "topic_date": hot["Date"],
+        "stock_id": hot["Code"].map(sid_by_ticker),
+        "mentions": hot["mentions"],
+        "mentions_7d_ma": hot["mentions_7d_ma"],
+        "daily_growth_pct": hot["daily_growth"] * 100.0,
+        "weekly_growth_pct": hot["weekly_growth"] * 100.0,
+        "popularity": hot["popularity"],
+    })
+
+    conn = sqlite3.connect(path)
+    try:
+        pd.DataFrame({"id": [1, 2, 3], "code": ["NAVER", "KAKAO", "SPLUS"]}).to_sql("sources", conn, index=False)
+        stocks.to_sql("stocks", conn, index=False)
+        candles.to_sql("stock_price_candles", conn, index=False)
+        quotes.to_sql("latest_quotes", conn, index=False)
+        metrics.to_sql("stock_daily_metrics", conn, index=False)
+        rec_rows.to_sql("stock_daily_recommendations", conn, index=False)
+        coverage.to_sql("recommendation_coverage", conn, index=False)
+        hot_rows.to_sql("hot_topics", conn, index=False)
+        pd.DataFrame({"name": ["stocks", "candles", "recommendations", "hot_topics"], "version": 1}) \
+            .to_sql("data_versions", conn, index=False)
+        fav_ids = stocks["id"].head(20)
+        pd.DataFrame({"id": np.arange(1, len(fav_ids) + 1), "user_id": 1, "stock_id": fav_ids}) \
+            .to_sql("user_favorites", conn, index=False)
+        conn.executescript("""
+            CREATE UNIQUE INDEX uq_candle_unique ON stock_price_candles (stock_id, timeframe, candle_time);
+            CREATE UNIQUE INDEX pk_latest_quotes ON latest_quotes (timeframe, stock_id);
+            CREATE INDEX idx_metrics_date_return ON stock_daily_metrics (metric_date, daily_return_pct);
+            CREATE INDEX idx_metrics_date_volume_ratio ON stock_daily_metrics (metric_date, volume_ratio);
+            CREATE INDEX idx_rec_stock_date ON stock_daily_recommendations (stock_id, signal_date);
+            CREATE INDEX idx_rec_source_date ON stock_daily_recommendations (source_id, signal_date);
+            CREATE INDEX idx_cov ON recommendation_coverage (source_id, is_complete, signal_date);
+            CREATE INDEX idx_hot ON hot_topics (source_id, topic_date, stock_id);
+        """)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+# API
+def endpoints(last_date: str) -> list[dict]:
+    """
+    mysql_only: SQLite stand-in에서는 측정하지 않음
+    (MySQL 전용 SQL이거나, SQLite가 DATETIME을 문자열로 돌려줘서 캔들 응답을 못 만드는 경우)
+    """
+    return [
+        {"name": "recommendations_latest", "path": "/recommendations/latest?limit=20"},
+        {"name": "recommendation_dates", "path": "/recommendations/dates"},
+        {"name": "stock_recommendations", "path": "/stocks/1/recommendations?limit=60"},
+        {"name": "hot_topics_latest", "path": "/hot-topics/latest?limit=20"},
+        {"name": "hot_topics_by_date", "path": f"/hot-topics?date={last_date}&limit=50"},
+        {"name": "threshold_sweep", "path": "/analytics/threshold-sweep?steps=101"},
+        {"name": "quotes_20", "path": "/quotes?timeframe=1H&" + "&".join(f"stock_ids={i}" for i in range(1, 21))},
+        {"name": "quotes_all", "path": "/quotes?timeframe=1H"},
+        {"name": "rankings_gainers", "path": "/rankings?metric=daily_return&limit=20"},
+        {"name": "rankings_volume", "path": "/rankings?metric=volume_ratio&limit=20"},
+        {"name": "candles_raw_1h", "path": "/stocks/1/candles?timeframe=1H&max_points=500", "mysql_only": True},
+        {"name": "candles_1d", "path": "/stocks/1/candles?timeframe=1D", "mysql_only": True},
+        {"name": "candles_1w", "path": "/stocks/1/candles?timeframe=1W", "mysql_only": True},
+        {"name": "dashboard", "path": "/users/1/dashboard", "mysql_only": True},
+    ]
+
+
+def start_server(port: int, env: dict, log_path: str) -> subprocess.Popen:
+    log = open(log_path, "w", encoding="utf-8")
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, env={**os.environ, **env}, stdout=log, stderr=subprocess.STDOUT,
+    )
+    base = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"API 서버가 종료됨 (log: {log_path})")
+        try:
+            if httpx.get(base + "/", timeout=1.0).status_code == 200:
+                return proc
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.3)
+    proc.terminate()
+    raise RuntimeError(f"API 서버가 30초 안에 뜨지 않음 (log: {log_path})")
+
+
+async def bench_endpoints(base_url: str, eps: list[dict], levels: list[int], requests_per_client: int) -> list[dict]:
+    results = []
+    for ep in eps:
+        # 워밍업 (커넥션 풀 / 캐시 / registry)
+        await run_level(base_url, [ep["path"]], min(10, levels[0]), 2)
+        for c in levels:
+            res = await run_level(base_url, [ep["path"]], c, requests_per_client)
+            print(f"{ep['name']:>24}  concurrency={c:>5}  p50={res['p50_ms']:>8.2f}ms  "
+                  f"p95={res['p95_ms']:>8.2f}ms  p99={res['p99_ms']:>8.2f}ms  errors={res['errors']}")
+            results.append({"endpoint": ep["name"], "path": ep["path"], **res})
+    return results
+
+
+def main():
+    ap = argparse.ArgumentParser(description="finsight synthetic benchmark suite")
+    ap.add_argument("--db", choices=["mysql", "sqlite"], default="mysql")
+    ap.add_argument("--data-dir", default="bench_data")
+    ap.add_argument("--stocks", type=int, default=200)
+    ap.add_argument("--days", type=int, default=60)
+    ap.add_argument("--hours", type=int, default=7)
+    ap.add_argument("--posts-per-day", type=float, default=20.0)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--concurrency", default="50,200")
+    ap.add_argument("--requests-per-client", type=int, default=10)
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--async-db", action="store_true", help="API를 ASYNC_DB=1로 실행")
+    ap.add_argument("--skip-importers", action="store_true")
+    ap.add_argument("--skip-api", action="store_true")
+    ap.add_argument("--label", default="")
+    ap.add_argument("--out", default="bench_results.json")
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    data = synthetic.generate(args.data_dir, args.stocks, args.days, args.hours, args.posts_per_day, seed=args.seed)
+    gen_sec = time.perf_counter() - t0
+    print(f"generated {sum(data['rows'].values()):,} rows in {gen_sec:.2f}s -> {args.data_dir}")
+
+    log_dir = os.path.join(args.data_dir, "logs")
+    os.makedirs(log_dir, exist_ok=True)
+    report = {
+        "label": args.label,
+        "commit": git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "db": args.db,
+        "async_db": args.async_db,
+        "scale": data["scale"],
+        "rows": data["rows"],
+        "generate_sec": round(gen_sec, 3),
+        "importers": [],
+        "api": [],
+        "notes": [],
+    }
+
+    server_env = {"ASYNC_DB": "1" if args.async_db else "0"}
+    if args.db == "sqlite":
+        db_path = os.path.abspath(os.path.join(args.data_dir, "finsight.sqlite"))
+        seed_sqlite(db_path, data["frames"])
+        server_env.update({"DB_URL": f"sqlite:///{db_path}", "ASYNC_DB_URL": f"sqlite+aiosqlite:///{db_path}"})
+        report["notes"].append("importers skipped: they write through pymysql (MySQL only)")
+    elif not args.skip_importers:
+        for step in importer_steps(data["files"], data["rows"]):
+            res = run_importer(step, log_dir)
+            print(f"{res['name']:>18}: ok={res['ok']} rows={res['rows']:,} {res['rows_per_sec']:,.0f} rows/sec "
+                  f"peak_rss={res['peak_rss_mb']}MB")
+            report["importers"].append(res)
+
+    if not args.skip_api:
+        eps = endpoints(data["frames"]["recommendations"]["Date"].iloc[-1])
+        if args.db == "sqlite":
+            skipped = [e["name"] for e in eps if e.get("mysql_only")]
+            eps = [e for e in eps if not e.get("mysql_only")]
+            report["notes"].append(f"MySQL-only endpoints not measured on sqlite: {', '.join(skipped)}")
+        levels = [int(x) for x in args.concurrency.split(",") if x.strip()]
+        server = start_server(args.port, server_env, os.path.join(log_dir, "api.log"))
+        try:
+            report["api"] = asyncio.run(
+                bench_endpoints(f"http://127.0.0.1:{args.port}", eps, levels, args.requests_per_client)
+            )
+        finally:
+            server.terminate()
+            server.wait()
+
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"results -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
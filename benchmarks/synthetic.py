@@ -0,0 +1,196 @@
+"""
+벤치마크용 합성 데이터 생성
+
+importer들이 읽는 형식 그대로 파일을 만든다.
+  prices.csv           -> import_csv/import_price_csv.py        (Date, Stock, Code, Open, High, Low, Close, Volume)
+  recommendations.csv  -> import_csv/import_recommendation_csv.py (Date, Code, Positive_Ratio, Prediction_Success)
+  hot_topics.csv       -> import_csv/import_hot_topic_csv.py     (Date, Code, mentions, daily_growth, ...)
+  posts.jsonl          -> import_csv/import_posts.py
+
+규모: 종목 수 x 거래일 수 x 하루 시간봉 수 (주말 제외)
+
+예) python -m benchmarks.synthetic --stocks 200 --days 60 --out-dir /tmp/finsight-bench
+"""
+import os
+import json
+import argparse
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_START = "2025-01-02"
+MARKET_OPEN_HOUR = 9
+
+
+def trading_days(start: str, days: int) -> pd.DatetimeIndex:
+    return pd.bdate_range(start, periods=days)
+
+
+def make_stocks(n: int) -> pd.DataFrame:
+    ids = np.arange(1, n + 1)
+    return pd.DataFrame({
+        "id": ids,
+        "ticker": [f"{i:06d}" for i in ids],
+        "name_ko": [f"종목{i}" for i in ids],
+        "name_en": [f"Stock {i}" for i in ids],
+    })
+
+
+def make_prices(stocks: pd.DataFrame, days: pd.DatetimeIndex, hours: int,
+                rng: np.random.Generator) -> pd.DataFrame:
+    """종목별 시간봉 랜덤워크 (종목 x 날짜 x 시간 순서)"""
+    n_stocks, n_bars = len(stocks), len(days) * hours
+    times = (days.values[:, None] + (np.arange(hours) + MARKET_OPEN_HOUR) * np.timedelta64(1, "h")).ravel()
+
+    start_price = rng.uniform(5_000, 200_000, size=(n_stocks, 1))
+    steps = rng.normal(0, 0.004, size=(n_stocks, n_bars))
+    close = np.round(start_price * np.exp(np.cumsum(steps, axis=1)), 0)
+    open_ = np.concatenate([start_price, close[:, :-1]], axis=1).round(0)
+    spread = np.abs(rng.normal(0, 0.002, size=close.shape)) * close
+    high = (np.maximum(open_, close) + spread).round(0)
+    low = (np.minimum(open_, close) - spread).round(0)
+    volume = rng.integers(1_000, 500_000, size=close.shape)
+
+    return pd.DataFrame({
+        "Date": np.tile(pd.DatetimeIndex(times).strftime("%Y-%m-%d %H:%M:%S"), n_stocks),
+        "Stock": np.repeat(stocks["name_ko"].to_numpy(), n_bars),
+        "Code": np.repeat(stocks["ticker"].to_numpy(), n_bars),
+        "Open": open_.ravel(),
+        "High": high.ravel(),
+        "Low": low.ravel(),
+        "Close": close.ravel(),
+        "Volume": volume.ravel(),
+    })
+
+
+def make_recommendations(stocks: pd.DataFrame, days: pd.DatetimeIndex,
+                         rng: np.random.Generator, threshold: float = 0.35) -> pd.DataFrame:
+    """마지막 날은 결과 미정 (Prediction_Success 빈 값)"""
+    n = len(stocks) * len(days)
+    ratio = rng.uniform(0, 1, n).round(4)
+    up = rng.uniform(0, 1, n) < (0.35 + 0.3 * ratio)
+    success = np.where((ratio > threshold) == up, "success", "fail").astype(object)
+    is_last = np.repeat(days == days[-1], len(stocks))
+    success[is_last] = ""
+    return pd.DataFrame({
+        "Date": np.repeat(days.strftime("%Y-%m-%d"), len(stocks)),
+        "Code": np.tile(stocks["ticker"].to_numpy(), len(days)),
+        "Positive_Ratio": ratio,
+        "Prediction_Success": success,
+    })
+
+
+def make_mentions(stocks: pd.DataFrame, days: pd.DatetimeIndex, posts_per_day: float,
+                  rng: np.random.Generator) -> np.ndarray:
+    """(날짜, 종목)별 글 수. 종목마다 관심도가 다름"""
+    weight = rng.lognormal(0, 1, len(stocks))
+    lam = posts_per_day * weight / weight.mean()
+    return rng.poisson(np.broadcast_to(lam, (len(days), len(stocks))))
+
+
+def make_hot_topics(stocks: pd.DataFrame, days: pd.DatetimeIndex, mentions: np.ndarray) -> pd.DataFrame:
+    """CSV 형식: growth는 비율 (importer가 %로 바꿈)"""
+    wide = pd.DataFrame(mentions, index=days, columns=stocks["ticker"]).astype(float)
+    ma = wide.rolling(7, min_periods=1).mean()
+    daily = (wide / wide.shift(1) - 1).replace([np.inf, -np.inf], np.nan).fillna(0)
+    weekly = (ma / ma.shift(5) - 1).replace([np.inf, -np.inf], np.nan).fillna(0)
+    popularity = wide * (1 + weekly.clip(lower=0))
+    n_days, n_stocks = wide.shape
+    return pd.DataFrame({
+        "Date": np.repeat(days.strftime("%Y-%m-%d"), n_stocks),
+        "Code": np.tile(stocks["ticker"].to_numpy(), n_days),
+        "mentions": wide.to_numpy().ravel().astype(int),
+        "mentions_7d_ma": ma.to_numpy().ravel().round(4),
+        "daily_growth": daily.to_numpy().ravel().round(4),
+        "weekly_growth": weekly.to_numpy().ravel().round(4),
+        "popularity": popularity.to_numpy().ravel().round(4),
+    })
+
+
+def write_posts(path: str, stocks: pd.DataFrame, days: pd.DatetimeIndex, mentions: np.ndarray,
+                rng: np.random.Generator) -> int:
+    """mentions 수만큼 글 생성 (JSONL). return: 줄 수"""
+    day_idx, stock_idx = np.nonzero(mentions)
+    counts = mentions[day_idx, stock_idx]
+    day_idx = np.repeat(day_idx, counts)
+    stock_idx = np.repeat(stock_idx, counts)
+    n = len(day_idx)
+
+    posted = days.values[day_idx] + rng.integers(0, 24 * 3600, n) * np.timedelta64(1, "s")
+    posted = pd.DatetimeIndex(posted).strftime("%Y-%m-%dT%H:%M:%S")
+    tickers = stocks["ticker"].to_numpy()[stock_idx]
+    likes = rng.integers(0, 200, n)
+    dislikes = rng.integers(0, 50, n)
+    views = rng.integers(10, 20_000, n)
+
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(n):
+            f.write(json.dumps({
+                "source": "NAVER",
+                "external_post_id": f"p{i}",
+                "code": tickers[i],
+                "title": f"{tickers[i]} 토론 {i}",
+                "like_count": int(likes[i]),
+                "dislike_count": int(dislikes[i]),
+                "view_count": int(views[i]),
+                "url": f"https://example.com/posts/{i}",
+                "posted_at": posted[i],
+            }, ensure_ascii=False))
+            f.write("\n")
+    return n
+
+
+def generate(out_dir: str, stocks: int, days: int, hours: int = 7, posts_per_day: float = 20.0,
+             start: str = DEFAULT_START, seed: int = 42) -> dict:
+    """
+    return: {"files": {이름: 경로}, "rows": {이름: 행 수}, "frames": {이름: DataFrame}, "scale": {...}}
+    frames는 SQLite stand-in 적재용 (posts 제외)
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    stock_df = make_stocks(stocks)
+    day_idx = trading_days(start, days)
+
+    prices = make_prices(stock_df, day_idx, hours, rng)
+    recs = make_recommendations(stock_df, day_idx, rng)
+    mentions = make_mentions(stock_df, day_idx, posts_per_day, rng)
+    hot = make_hot_topics(stock_df, day_idx, mentions)
+
+    files = {
+        "prices": os.path.join(out_dir, "prices.csv"),
+        "recommendations": os.path.join(out_dir, "recommendations.csv"),
+        "hot_topics": os.path.join(out_dir, "hot_topics.csv"),
+        "posts": os.path.join(out_dir, "posts.jsonl"),
+    }
+    prices.to_csv(files["prices"], index=False)
+    recs.to_csv(files["recommendations"], index=False)
+    hot.to_csv(files["hot_topics"], index=False)
+    n_posts = write_posts(files["posts"], stock_df, day_idx, mentions, rng)
+
+    return {
+        "files": files,
+        "rows": {"prices": len(prices), "recommendations": len(recs), "hot_topics": len(hot), "posts": n_posts},
+        "frames": {"stocks": stock_df, "prices": prices, "recommendations": recs, "hot_topics": hot},
+        "scale": {"stocks": stocks, "days": days, "hours": hours, "posts_per_day": posts_per_day,
+                  "start": start, "seed": seed},
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description="finsight 합성 데이터 생성")
+    ap.add_argument("--out-dir", default="bench_data")
+    ap.add_argument("--stocks", type=int, default=200)
+    ap.add_argument("--days", type=int, default=60, help="거래일 수 (주말 제외)")
+    ap.add_argument("--hours", type=int, default=7, help="하루 시간봉 수 (09시부터)")
+    ap.add_argument("--posts-per-day", type=float, default=20.0, help="종목당 하루 평균 글 수")
+    ap.add_argument("--start", default=DEFAULT_START)
+    ap.add_argument("--seed", type=int, default=42)
+    args = ap.parse_args()
+
+    res = generate(args.out_dir, args.stocks, args.days, args.hours, args.posts_per_day, args.start, args.seed)
+    for name, path in res["files"].items():
+        print(f"{name:>16}: {res['rows'][name]:>10,} rows -> {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+"latest" 계열 API 응답 캐시
+
+- 프로세스 내 LRU + TTL
+- 데이터 변경 감지는 data_versions 테이블의 version 카운터 (importer가 적재 후 +1)
+  -> TTL을 짧게 두지 않아도 importer가 돌면 바로 무효화됨
+- version 조회 자체도 VERSION_CHECK_SEC 간격으로만 DB에 감 (트래픽이 몰려도 MySQL은 거의 안 건드림)
+"""
+import os
+import time
+import asyncio
+import threading
+from collections import OrderedDict
+
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "256"))
+CACHE_TTL_SEC = float(os.getenv("CACHE_TTL_SEC", "3600"))
+VERSION_CHECK_SEC = float(os.getenv("VERSION_CHECK_SEC", "2"))
+
+
+class DataVersions:
+    """
+    data_versions 스냅샷 (VERSION_CHECK_SEC마다 한 번만 다시 읽음)
+    load: {name: version}을 돌려주는 코루틴 함수
+    """
+
+    def __init__(self, load, interval: float = VERSION_CHECK_SEC):
+        self.load = load
+        self.interval = interval
+        self._versions: dict[str, int] = {}
+        self._checked_at = float("-inf")
+        self._lock = asyncio.Lock()
+
+    async def refresh(self) -> dict[str, int]:
+        self._versions = await self.load()
+        self._checked_at = time.monotonic()
+        return self._versions
+
+    async def snapshot(self) -> dict[str, int]:
+        if time.monotonic() - self._checked_at < self.interval:
+            return self._versions
+        async with self._lock:
+            # 기다리는 동안 다른 요청이 갱신했으면 그대로 사용
+            if time.monotonic() - self._checked_at >= self.interval:
+                await self.refresh()
+        return self._versions
+
+    async def get(self, names: tuple[str, ...]) -> tuple[int, ...]:
+        snap = await self.snapshot()
+        return tuple(snap.get(n, 0) for n in names)
+
+
+class ResponseCache:
+    """
+    key -> (version, 저장 시각, value)
+    version이 다르거나 TTL이 지나면 miss, 가득 차면 가장 오래 안 쓴 항목부터 제거
+    """
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, ttl: float = CACHE_TTL_SEC):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, version):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                v, stored_at, value = entry
+                if v == version and now - stored_at < self.ttl:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return True, value
+                del self._data[key]
+            self.misses += 1
+            return False, None
+
+    def set(self, key, version, value):
+        with self._lock:
+            self._data[key] = (version, time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._data),
+                "max_entries": self.max_entries,
+                "ttl_sec": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            }
+
+
+async def cached(cache: ResponseCache, versions: DataVersions, key: tuple,
+                 depends_on: tuple[str, ...], compute):
+    """
+    depends_on 테이블들의 version이 그대로면 캐시값, 아니면 await compute() 결과를 저장 후 반환
+    (compute에서 HTTPException 등이 나면 캐시하지 않음)
+    """
+    version = await versions.get(depends_on)
+    hit, value = cache.get(key, version)
+    if hit:
+        return value
+    value = await compute()
+    cache.set(key, version, value)
+    return value
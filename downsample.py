@@ -0,0 +1,47 @@
+"""
+차트용 시계열 다운샘플링 (LTTB: Largest-Triangle-Three-Buckets)
+
+포인트 수를 줄이면서도 고점/저점 같은 눈에 띄는 모양은 최대한 남긴다.
+"""
+
+
+def lttb_indices(xs: list[float], ys: list[float], threshold: int) -> list[int]:
+    """
+    남길 포인트의 인덱스 리스트 (항상 첫/마지막 포인트 포함, 오름차순)
+    threshold >= len(xs) 이거나 3 미만이면 전부 남김
+    """
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+
+    picked = [0]
+    every = (n - 2) / (threshold - 2)
+    a = 0
+
+    for i in range(threshold - 2):
+        # 다음 버킷 평균점 (삼각형의 세 번째 꼭짓점)
+        nxt_start = int((i + 1) * every) + 1
+        nxt_end = min(int((i + 2) * every) + 1, n)
+        if nxt_start >= nxt_end:
+            nxt_start = nxt_end - 1
+        cnt = nxt_end - nxt_start
+        avg_x = sum(xs[nxt_start:nxt_end]) / cnt
+        avg_y = sum(ys[nxt_start:nxt_end]) / cnt
+
+        # 현재 버킷에서 삼각형 넓이가 가장 큰 점 선택
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        ax, ay = xs[a], ys[a]
+        best = start
+        best_area = -1.0
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > best_area:
+                best_area = area
+                best = j
+
+        picked.append(best)
+        a = best
+
+    picked.append(n - 1)
+    return picked
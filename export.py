@@ -0,0 +1,47 @@
+"""
+스트리밍 응답 인코딩 (NDJSON / CSV)
+
+db.stream()이 주는 batch(list[dict])를 받아 batch마다 문자열 한 덩어리로 내보낸다.
+"""
+import io
+import csv
+import json
+from decimal import Decimal
+from datetime import date, datetime
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def _json_default(v):
+    if isinstance(v, Decimal):
+        return float(v)
+    if isinstance(v, (date, datetime)):
+        return v.isoformat()
+    raise TypeError(f"not JSON serializable: {type(v).__name__}")
+
+
+async def ndjson_lines(batches):
+    async for rows in batches:
+        yield "".join(json.dumps(r, default=_json_default, ensure_ascii=False) + "\n" for r in rows)
+
+
+async def csv_lines(batches, columns: list[str]):
+    buf = io.StringIO()
+    w = csv.writer(buf)
+    w.writerow(columns)
+    yield buf.getvalue()
+
+    async for rows in batches:
+        buf.seek(0)
+        buf.truncate()
+        w.writerows([r[c] for c in columns] for r in rows)
+        yield buf.getvalue()
+
+
+def encode(batches, fmt: str, columns: list[str]):
+    if fmt == "csv":
+        return csv_lines(batches, columns)
+    return ndjson_lines(batches)
@@ -36,8 +36,9 @@ CREATE TABLE IF NOT EXISTS stocks (
 --  나중에 필요시 (market VARCHAR(20) NOT NULL COMMENT 'KOSPI, KOSDAQ, ETF 등'),(sector VARCHAR(100) NULL COMMENT '업종/섹터') 추가
 
 CREATE TABLE IF NOT EXISTS stock_price_candles (
-    id           BIGINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
-    stock_id     BIGINT UNSIGNED NOT NULL COMMENT 'FK → stocks.id',
+    id           BIGINT UNSIGNED AUTO_INCREMENT,
+    -- 파티션 테이블은 FK를 못 가짐 (stock_id는 importer가 stocks에서 찾아서 넣음)
+    stock_id     BIGINT UNSIGNED NOT NULL COMMENT 'stocks.id',
 
     -- 캔들 간격 (1H, 1D, 3D, 1W 등)
     timeframe    VARCHAR(10) NOT NULL COMMENT '캔들 간격',
@@ -55,14 +56,54 @@ CREATE TABLE IF NOT EXISTS stock_price_candles (
 
     created_at   DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
 
-    CONSTRAINT fk_candle_stock
-        FOREIGN KEY (stock_id) REFERENCES stocks(id)
-        ON DELETE CASCADE,
-        
+    -- PK / unique key에는 파티션 컬럼(timeframe, candle_time)이 들어가야 함
+    PRIMARY KEY (id, timeframe, candle_time),
+
+    -- (stock_id, timeframe, candle_time) 범위 조회도 이 인덱스로 처리
     CONSTRAINT uq_candle_unique
-        UNIQUE (stock_id, timeframe, candle_time),
-        
-    INDEX idx_candle_stock_time (stock_id, timeframe, candle_time)
+        UNIQUE (stock_id, timeframe, candle_time)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+-- 1H는 월별 파티션 (보관 기간이 지나면 import_csv/maintain_candle_partitions.py가 압축 보관 후 DROP)
+-- 1H보다 작은 문자열(1D 등) / 큰 문자열(1M, 1W)은 각각 파티션 하나
+-- 월별 파티션은 maintain_candle_partitions.py가 p_1h_max를 나눠서 미리 만듦
+PARTITION BY RANGE COLUMNS (timeframe, candle_time) (
+    PARTITION p_lt_1h  VALUES LESS THAN ('1H', '1000-01-01 00:00:00'),
+    PARTITION p_1h_max VALUES LESS THAN ('1H', MAXVALUE),
+    PARTITION p_gt_1h  VALUES LESS THAN (MAXVALUE, MAXVALUE)
+);
+
+-- 종목별 최신 시세 스냅샷 (import_price_csv.py / latest_quotes.py가 갱신, /quotes가 PK로 조회)
+CREATE TABLE IF NOT EXISTS latest_quotes (
+    timeframe    VARCHAR(10) NOT NULL COMMENT '캔들 간격',
+    stock_id     BIGINT UNSIGNED NOT NULL COMMENT 'stocks.id',
+    candle_time  DATETIME NOT NULL COMMENT '최신 캔들 기준 시각',
+    close_price  DECIMAL(15, 2) NOT NULL COMMENT '최신 종가',
+    prev_close   DECIMAL(15, 2) NULL COMMENT '직전 캔들 종가',
+    change_pct   DECIMAL(10, 4) NULL COMMENT '직전 대비 %',
+    volume       BIGINT UNSIGNED NOT NULL COMMENT '최신 캔들 거래량',
+    updated_at   DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+                 ON UPDATE CURRENT_TIMESTAMP,
+
+    -- timeframe 하나의 전체 종목이 연속 구간 -> 전 종목 조회도 PK 범위 스캔 한 번
+    PRIMARY KEY (timeframe, stock_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- 종목 일간 지표 (import_csv/build_daily_metrics.py가 일봉으로 계산, /rankings가 조회)
+CREATE TABLE IF NOT EXISTS stock_daily_metrics (
+    metric_date       DATE NOT NULL COMMENT '거래일',
+    stock_id          BIGINT UNSIGNED NOT NULL COMMENT 'stocks.id',
+    close_price       DECIMAL(15, 2) NOT NULL COMMENT '종가',
+    daily_return_pct  DECIMAL(10, 4) NULL COMMENT '직전 거래일 대비 %',
+    volatility_pct    DECIMAL(10, 4) NULL COMMENT 'N거래일 일간 수익률 표준편차',
+    volume            BIGINT UNSIGNED NOT NULL COMMENT '거래량',
+    volume_ratio      DECIMAL(12, 4) NULL COMMENT '거래량 / 직전 20거래일 평균',
+
+    PRIMARY KEY (metric_date, stock_id),
+
+    -- 날짜 하나의 지표 순서 그대로 -> Top N은 인덱스 범위를 앞/뒤에서 LIMIT만큼 읽음
+    INDEX idx_metrics_date_return (metric_date, daily_return_pct),
+    INDEX idx_metrics_date_volatility (metric_date, volatility_pct),
+    INDEX idx_metrics_date_volume_ratio (metric_date, volume_ratio)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
 
 CREATE TABLE IF NOT EXISTS user_favorites (
@@ -146,5 +187,93 @@ CREATE TABLE IF NOT EXISTS stock_daily_recommendations (
 
     INDEX idx_rec_stock_date (stock_id, signal_date),
     INDEX idx_rec_source_date (source_id, signal_date),
-    INDEX idx_rec_date (signal_date)
-) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
\ No newline at end of file
+    INDEX idx_rec_date (signal_date),
+    -- 결과(actual_is_up) 미정 행 찾기 (backfill_outcomes.py, 기존 테이블은 REC_PENDING_INDEX_MIGRATE=1로 추가)
+    INDEX idx_rec_pending (actual_is_up, signal_date)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- 종목별 일간 언급량 지표 (import_hot_topic_csv.py 또는 build_hot_topics.py가 채움)
+CREATE TABLE IF NOT EXISTS hot_topics (
+    id                 BIGINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+    source_id          BIGINT UNSIGNED NOT NULL COMMENT 'FK → sources.id',
+    topic_date         DATE NOT NULL COMMENT '집계 날짜',
+    stock_id           BIGINT UNSIGNED NOT NULL COMMENT 'FK → stocks.id',
+
+    mentions           INT UNSIGNED NOT NULL DEFAULT 0 COMMENT '당일 언급(게시글) 수',
+    mentions_7d_ma     DOUBLE NOT NULL DEFAULT 0 COMMENT '최근 7일 언급 수 이동평균',
+    daily_growth_pct   DOUBLE NULL COMMENT '전일 대비 언급 증가율(%)',
+    weekly_growth_pct  DOUBLE NULL COMMENT '7일 전 이동평균 대비 증가율(%)',
+    popularity         DOUBLE NOT NULL DEFAULT 0 COMMENT '정렬용 인기 점수',
+
+    updated_at         DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+                       ON UPDATE CURRENT_TIMESTAMP,
+
+    CONSTRAINT fk_hot_source
+        FOREIGN KEY (source_id) REFERENCES sources(id)
+        ON DELETE CASCADE,
+    CONSTRAINT fk_hot_stock
+        FOREIGN KEY (stock_id) REFERENCES stocks(id)
+        ON DELETE CASCADE,
+
+    CONSTRAINT uq_hot_source_date_stock
+        UNIQUE (source_id, topic_date, stock_id),
+
+    INDEX idx_hot_source_date_pop (source_id, topic_date, popularity)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- CSV importer 증분/재개용 체크포인트 (INCREMENTAL=1)
+CREATE TABLE IF NOT EXISTS import_checkpoints (
+    importer      VARCHAR(50) NOT NULL COMMENT 'price_1H, recommendation 등',
+    source_key    VARCHAR(255) NOT NULL COMMENT '입력 파일 이름',
+    content_hash  CHAR(64) NOT NULL COMMENT '마지막 실행의 파일 내용 sha256',
+    rows_done     BIGINT UNSIGNED NOT NULL DEFAULT 0 COMMENT 'commit까지 끝난 CSV 데이터 행 수',
+    high_water    DATETIME NULL COMMENT '모든 종목이 적재된 마지막 candle_time / signal_date',
+    status        ENUM('RUNNING', 'DONE') NOT NULL COMMENT '진행 상태',
+    updated_at    DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+                  ON UPDATE CURRENT_TIMESTAMP,
+
+    PRIMARY KEY (importer, source_key)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- 날짜별 추천 적재 현황 (coverage.py: import_recommendation_csv.py가 적재한 날짜만 갱신, stocks가 바뀌면 전체 종목 수만 다시 맞춤)
+CREATE TABLE IF NOT EXISTS recommendation_coverage (
+    source_id     BIGINT UNSIGNED NOT NULL COMMENT 'FK → sources.id',
+    signal_date   DATE NOT NULL COMMENT '추천 기준 날짜',
+    loaded_cnt    INT UNSIGNED NOT NULL COMMENT '적재된 종목 수',
+    total_stocks  INT UNSIGNED NOT NULL COMMENT '전체 종목 수 (stocks가 바뀌면 price importer가 다시 맞춤)',
+    is_complete   TINYINT NOT NULL COMMENT 'loaded_cnt = total_stocks',
+    updated_at    DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+                  ON UPDATE CURRENT_TIMESTAMP,
+
+    PRIMARY KEY (source_id, signal_date),
+
+    CONSTRAINT fk_cov_source
+        FOREIGN KEY (source_id) REFERENCES sources(id)
+        ON DELETE CASCADE,
+
+    INDEX idx_cov_complete (source_id, is_complete, signal_date)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- 데이터 버전 카운터: importer가 적재를 끝내면 +1 (API 응답 캐시 무효화용)
+CREATE TABLE IF NOT EXISTS data_versions (
+    name        VARCHAR(50) NOT NULL PRIMARY KEY COMMENT 'stocks, candles, recommendations, hot_topics 등',
+    version     BIGINT UNSIGNED NOT NULL DEFAULT 0 COMMENT '변경될 때마다 +1',
+    updated_at  DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+                ON UPDATE CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+INSERT IGNORE INTO data_versions (name, version)
+VALUES
+  ('stocks', 0),
+  ('candles', 0),
+  ('recommendations', 0),
+  ('hot_topics', 0),
+  ('daily_metrics', 0);
+
+-- 원본 테이블 id 기준 집계 진행 위치 (build_hot_topics.py: external_posts.id)
+CREATE TABLE IF NOT EXISTS aggregate_watermarks (
+    name        VARCHAR(50) NOT NULL PRIMARY KEY COMMENT 'hot_topics 등',
+    last_id     BIGINT UNSIGNED NOT NULL DEFAULT 0 COMMENT '마지막으로 반영한 원본 행 id',
+    updated_at  DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+                ON UPDATE CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
@@ -0,0 +1,136 @@
+"""
+추천 결과 backfill: 저장된 일봉으로 actual_is_up / is_hit 계산
+
+- 대상: actual_is_up이 NULL인 행 (idx_rec_pending) + OUTCOME_RECHECK_SINCE 이후 행(옵션)
+- 기준: signal_date 당일(또는 그 이전 마지막 거래일) 종가 vs 다음 거래일 종가
+- 종목/날짜마다 (stock_id, timeframe, candle_time) 인덱스로 두 번만 찾음 -> 임시 테이블
+- 값이 실제로 바뀌는 행만 UPDATE
+- import_price_csv.py가 적재 후 자동으로 호출 (단독 실행도 가능)
+
+idx_rec_pending은 finsight.sql의 CREATE TABLE IF NOT EXISTS에만 있어서 기존 DB에는 없을 수 있음
+  -> 없으면 경고 (REC_PENDING_INDEX_MIGRATE=1이면 온라인 ALTER로 추가)
+"""
+import os
+import time
+
+from importer_core import connect, bump_data_version
+
+# 결과 판단에 쓸 캔들 단위 (1H로 적재해도 candle_rollup이 1D를 만들어 둠)
+OUTCOME_TIMEFRAME = os.getenv("OUTCOME_TIMEFRAME", "1D")
+
+# YYYY-MM-DD: 이 날짜 이후는 이미 채워진 행도 다시 계산 (CSV 값 보정용, 빈 값이면 미정 행만)
+OUTCOME_RECHECK_SINCE = os.getenv("OUTCOME_RECHECK_SINCE", "")
+
+# 1이면 idx_rec_pending이 없을 때 추가 (기존 테이블 migrate)
+REC_PENDING_INDEX_MIGRATE = os.getenv("REC_PENDING_INDEX_MIGRATE", "0") == "1"
+
+PENDING_INDEX = "idx_rec_pending"
+
+INDEX_EXISTS_SQL = """
+SELECT COUNT(*) FROM information_schema.STATISTICS
+WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'stock_daily_recommendations' AND INDEX_NAME = %s
+"""
+
+# 보조 인덱스 추가는 InnoDB online DDL (적재 / 조회를 막지 않음)
+ADD_PENDING_INDEX_SQL = f"""
+ALTER TABLE stock_daily_recommendations
+  ADD INDEX {PENDING_INDEX} (actual_is_up, signal_date),
+  ALGORITHM=INPLACE, LOCK=NONE
+"""
+
+CREATE_OUTCOMES_SQL = """
+CREATE TEMPORARY TABLE IF NOT EXISTS tmp_outcomes (
+  id            BIGINT UNSIGNED NOT NULL PRIMARY KEY,
+  actual_is_up  TINYINT NOT NULL
+) ENGINE=InnoDB
+"""
+
+# 다음 거래일 종가가 아직 없으면 (NULL) 그대로 미정으로 둠
+COMPUTE_OUTCOMES_SQL = """
+INSERT INTO tmp_outcomes (id, actual_is_up)
+SELECT id, next_close > base_close
+FROM (
+  SELECT r.id,
+    (SELECT c.close_price FROM stock_price_candles c
+      WHERE c.stock_id = r.stock_id AND c.timeframe = %(tf)s
+        AND c.candle_time < r.signal_date + INTERVAL 1 DAY
+      ORDER BY c.candle_time DESC LIMIT 1) AS base_close,
+    (SELECT c.close_price FROM stock_price_candles c
+      WHERE c.stock_id = r.stock_id AND c.timeframe = %(tf)s
+        AND c.candle_time >= r.signal_date + INTERVAL 1 DAY
+      ORDER BY c.candle_time ASC LIMIT 1) AS next_close
+  FROM stock_daily_recommendations r
+  WHERE {target}
+) x
+WHERE base_close IS NOT NULL AND next_close IS NOT NULL
+"""
+
+PENDING_TARGET = "r.actual_is_up IS NULL"
+RECHECK_TARGET = "(r.actual_is_up IS NULL OR r.signal_date >= %(since)s)"
+
+# is_hit은 추천한 경우만 (import 때 규칙과 동일)
+APPLY_OUTCOMES_SQL = """
+UPDATE stock_daily_recommendations r
+JOIN tmp_outcomes o ON o.id = r.id
+SET r.actual_is_up = o.actual_is_up,
+    r.is_hit = IF(r.is_recommended = 1, o.actual_is_up, NULL)
+WHERE NOT (r.actual_is_up <=> o.actual_is_up)
+   OR NOT (r.is_hit <=> IF(r.is_recommended = 1, o.actual_is_up, NULL))
+"""
+
+
+def ensure_pending_index(conn) -> bool:
+    """
+    idx_rec_pending 확인. 없으면 REC_PENDING_INDEX_MIGRATE=1일 때만 추가, 아니면 경고만
+    return: 인덱스가 있는지 (추가했으면 True)
+    """
+    with conn.cursor() as cur:
+        cur.execute(INDEX_EXISTS_SQL, (PENDING_INDEX,))
+        if cur.fetchone()[0]:
+            return True
+        if not REC_PENDING_INDEX_MIGRATE:
+            print(f"[WARN] stock_daily_recommendations has no {PENDING_INDEX}: pending rows are found by full scan. "
+                  f"Run with REC_PENDING_INDEX_MIGRATE=1 to add it.")
+            return False
+        t0 = time.perf_counter()
+        cur.execute(ADD_PENDING_INDEX_SQL)
+    print(f"[MIGRATE] added {PENDING_INDEX} in {time.perf_counter() - t0:.2f}s")
+    return True
+
+
+def backfill_outcomes(conn, recheck_since: str = OUTCOME_RECHECK_SINCE) -> dict:
+    """
+    return: {"computed": 결과가 나온 행 수, "updated": 실제로 바뀐 행 수, "elapsed": 초}
+    """
+    ensure_pending_index(conn)
+    started = time.perf_counter()
+    params = {"tf": OUTCOME_TIMEFRAME, "since": recheck_since}
+    target = RECHECK_TARGET if recheck_since else PENDING_TARGET
+
+    with conn.cursor() as cur:
+        cur.execute(CREATE_OUTCOMES_SQL)
+        cur.execute("TRUNCATE TABLE tmp_outcomes")
+        cur.execute(COMPUTE_OUTCOMES_SQL.format(target=target), params)
+        computed = cur.rowcount
+        cur.execute(APPLY_OUTCOMES_SQL)
+        updated = cur.rowcount
+        cur.execute("DROP TEMPORARY TABLE IF EXISTS tmp_outcomes")
+    conn.commit()
+
+    return {"computed": computed, "updated": updated, "elapsed": time.perf_counter() - started}
+
+
+def main():
+    conn = connect()
+    try:
+        res = backfill_outcomes(conn)
+        if res["updated"]:
+            bump_data_version(conn, "recommendations")
+    finally:
+        conn.close()
+
+    print(f"Done. computed={res['computed']}, updated={res['updated']}, elapsed={res['elapsed']:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+종목 일간 지표 집계: 일봉(DAILY_METRICS_TIMEFRAME) -> stock_daily_metrics (/rankings용)
+
+- since 이후 날짜만 다시 계산 (앞쪽은 rolling에 필요한 만큼만 더 읽음)
+- 종목 전체를 열로 둔 날짜 x 종목 행렬에서 pct_change / rolling 한 번씩 (종목별 루프 없음)
+- import_price_csv.py가 일봉을 쓴 뒤 자동으로 호출 (단독 실행도 가능)
+
+지표
+  daily_return_pct : 직전 거래일 종가 대비 %  (종목이 쉰 날은 건너뛰고 그 전 종가와 비교)
+  volatility_pct   : 최근 VOLATILITY_DAYS 거래일 daily_return_pct의 표준편차
+  volume_ratio     : 당일 거래량 / 직전 VOLUME_AVG_DAYS 거래일 평균 거래량 (당일 제외)
+"""
+import os
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from importer_core import connect, flush_rows, to_params, bump_data_version, BATCH_SIZE
+
+DAILY_METRICS_TIMEFRAME = os.getenv("DAILY_METRICS_TIMEFRAME", "1D")
+VOLATILITY_DAYS = int(os.getenv("VOLATILITY_DAYS", "20"))
+VOLUME_AVG_DAYS = int(os.getenv("VOLUME_AVG_DAYS", "20"))
+
+# YYYY-MM-DD: 단독 실행 때 이 날짜부터 다시 계산 (빈 값이면 마지막 집계일부터)
+DAILY_METRICS_SINCE = os.getenv("DAILY_METRICS_SINCE", "")
+
+# rolling에 필요한 거래일 수 -> 휴장일 여유를 두고 달력 일수로 환산
+LOOKBACK_TRADING_DAYS = max(VOLATILITY_DAYS, VOLUME_AVG_DAYS) + 1
+LOOKBACK_CALENDAR_DAYS = LOOKBACK_TRADING_DAYS * 7 // 5 + 15
+
+STOCKS_PER_QUERY = 500
+
+# (stock_id, timeframe, candle_time) 범위 스캔
+DAILY_CANDLES_SQL = """
+SELECT stock_id, DATE(candle_time) AS d, close_price, volume
+FROM stock_price_candles
+WHERE stock_id IN %s
+  AND timeframe = %s
+  AND candle_time >= %s
+"""
+
+PARAM_COLS = [
+    "Date", "stock_id", "close_price",
+    "daily_return_pct", "volatility_pct", "volume", "volume_ratio",
+]
+
+UPSERT_SQL = """
+INSERT INTO stock_daily_metrics
+  (metric_date, stock_id, close_price,
+   daily_return_pct, volatility_pct, volume, volume_ratio)
+VALUES
+  (%s, %s, %s, %s, %s, %s, %s)
+ON DUPLICATE KEY UPDATE
+  close_price = VALUES(close_price),
+  daily_return_pct = VALUES(daily_return_pct),
+  volatility_pct = VALUES(volatility_pct),
+  volume = VALUES(volume),
+  volume_ratio = VALUES(volume_ratio)
+"""
+
+
+def load_daily_candles(cur, stock_ids: list[int], start: date) -> pd.DataFrame:
+    parts = []
+    for s in range(0, len(stock_ids), STOCKS_PER_QUERY):
+        cur.execute(DAILY_CANDLES_SQL, (
+            tuple(stock_ids[s:s + STOCKS_PER_QUERY]), DAILY_METRICS_TIMEFRAME, start.strftime("%Y-%m-%d"),
+        ))
+        parts.append(pd.DataFrame(cur.fetchall(), columns=["stock_id", "d", "close_price", "volume"]))
+    candles = pd.concat(parts, ignore_index=True)
+    candles["d"] = pd.to_datetime(candles["d"])
+    candles["close_price"] = candles["close_price"].astype("float64")
+    candles["volume"] = candles["volume"].astype("float64")
+    return candles
+
+
+def compute_metrics(candles: pd.DataFrame) -> pd.DataFrame:
+    """
+    candles(stock_id, d, close_price, volume) -> 날짜 x 종목 행렬로 지표 계산
+    return: 캔들이 있는 (d, stock_id)만
+    """
+    close = candles.pivot_table(index="d", columns="stock_id", values="close_price", aggfunc="last").sort_index()
+    volume = candles.pivot_table(index="d", columns="stock_id", values="volume", aggfunc="last") \
+        .reindex(index=close.index, columns=close.columns)
+    has = close.notna()
+
+    # 종목이 쉰 날은 NaN -> 직전에 있던 종가와 비교
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ret = (close / close.ffill().shift(1) - 1.0) * 100.0
+    ret = ret.where(has).replace([np.inf, -np.inf], np.nan)
+    vol = ret.rolling(VOLATILITY_DAYS, min_periods=max(2, VOLATILITY_DAYS // 2)).std()
+
+    avg_volume = volume.shift(1).rolling(VOLUME_AVG_DAYS, min_periods=max(1, VOLUME_AVG_DAYS // 2)).mean()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = volume / avg_volume
+    ratio = ratio.replace([np.inf, -np.inf], np.nan)
+
+    # 날짜 x 종목 행렬 -> 긴 형태 (행 우선으로 펼침)
+    n_days, n_stocks = close.shape
+    out = pd.DataFrame({
+        "d": np.repeat(close.index.to_numpy(), n_stocks),
+        "stock_id": np.tile(close.columns.to_numpy(), n_days),
+        "close_price": close.to_numpy().ravel(),
+        "daily_return_pct": ret.to_numpy().ravel().round(4),
+        "volatility_pct": vol.where(has).to_numpy().ravel().round(4),
+        "volume": volume.to_numpy().ravel(),
+        "volume_ratio": ratio.where(has).to_numpy().ravel().round(4),
+    })
+    return out[has.to_numpy().ravel()]
+
+
+def build_daily_metrics(conn, since: date | None = None) -> dict:
+    """
+    since(포함) 이후 날짜의 지표 upsert. since가 None이면 전체
+    return: {"rows": upsert 행 수, "since": since, "elapsed": 초}
+    """
+    started = time.perf_counter()
+    with conn.cursor() as cur:
+        cur.execute("SELECT id FROM stocks")
+        stock_ids = [int(r[0]) for r in cur.fetchall()]
+        if not stock_ids:
+            return {"rows": 0, "since": since, "elapsed": time.perf_counter() - started}
+
+        start = since - timedelta(days=LOOKBACK_CALENDAR_DAYS) if since else date(1970, 1, 1)
+        candles = load_daily_candles(cur, stock_ids, start)
+        if candles.empty:
+            return {"rows": 0, "since": since, "elapsed": time.perf_counter() - started}
+
+        out = compute_metrics(candles)
+        if since:
+            out = out[out["d"] >= pd.Timestamp(since)]
+        out = out.assign(
+            Date=lambda x: x["d"].dt.strftime("%Y-%m-%d"),
+            stock_id=lambda x: x["stock_id"].astype("int64"),
+            volume=lambda x: x["volume"].fillna(0).astype("int64"),
+        )
+
+        params = to_params(out, PARAM_COLS)
+        rows = 0
+        step = max(1, BATCH_SIZE)
+        for s in range(0, len(params), step):
+            ok, _ = flush_rows(cur, UPSERT_SQL, params[s:s + step])
+            rows += ok
+    conn.commit()
+    return {"rows": rows, "since": since, "elapsed": time.perf_counter() - started}
+
+
+def last_metric_date(conn) -> date | None:
+    with conn.cursor() as cur:
+        cur.execute("SELECT MAX(metric_date) FROM stock_daily_metrics")
+        return cur.fetchone()[0]
+
+
+def main():
+    conn = connect()
+    try:
+        since = date.fromisoformat(DAILY_METRICS_SINCE) if DAILY_METRICS_SINCE else last_metric_date(conn)
+        res = build_daily_metrics(conn, since)
+        if res["rows"]:
+            bump_data_version(conn, "daily_metrics")
+    finally:
+        conn.close()
+
+    print(f"Done. upserted={res['rows']}, since={res['since'] or 'all'}, elapsed={res['elapsed']:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+hot_topics 집계: external_posts -> (source, stock, 날짜)별 언급 지표
+
+- 증분: aggregate_watermarks('hot_topics').last_id 이후 들어온 글이 건드린 날짜만 다시 계산
+  (하루가 바뀌면 그날부터 13일 뒤까지의 7일 이동평균 / 주간 증가율이 바뀜)
+- 일별 언급 수는 SQL GROUP BY, 이동평균 / 증가율은 종목 전체를 열로 둔 pandas rolling 한 번
+- HOT_TOPIC_REBUILD=1이면 처음부터 전부 다시 계산
+- watermark는 집계 시점의 MAX(id)라서 그보다 작은 id가 나중에 commit되면 빠짐
+  -> external_posts에 쓰는 import_posts.py와 집계는 이름 있는 lock(posts_lock)으로 한 번에 하나만
+     (다른 곳에서 external_posts에 쓸 때도 같은 lock을 잡아야 함)
+
+지표 (CSV importer와 같은 단위)
+  mentions          : 당일 글 수
+  mentions_7d_ma    : 최근 7일 평균
+  daily_growth_pct  : 전일 대비 %  (전일 0이면 NULL)
+  weekly_growth_pct : 7일 전 이동평균 대비 %  (0이면 NULL)
+  popularity        : mentions * (1 + max(weekly_growth_pct, 0) / 100)  (많이 + 급증한 종목 우선)
+"""
+import os
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from importer_core import connect, flush_rows, to_params, bump_data_version, BATCH_SIZE
+from import_hot_topic_csv import UPSERT_SQL, PARAM_COLS
+
+HOT_TOPIC_REBUILD = os.getenv("HOT_TOPIC_REBUILD", "0") == "1"
+
+WATERMARK_NAME = "hot_topics"
+
+# external_posts 적재 / hot_topics 집계 단일 실행용 MySQL named lock (같은 DB 서버 기준)
+POSTS_LOCK_NAME = "finsight.external_posts"
+POSTS_LOCK_TIMEOUT = int(os.getenv("POSTS_LOCK_TIMEOUT", "600"))
+
+# 이동평균 / 주간 증가율이 보는 과거 일수 (7일 평균 + 7일 전 7일 평균)
+MA_DAYS = 7
+LOOKBACK_DAYS = MA_DAYS * 2 - 1
+
+STOCKS_PER_QUERY = 500
+
+TOUCHED_DAYS_SQL = """
+SELECT source_id, stock_id, DATE(posted_at) AS d
+FROM external_posts
+WHERE id > %s AND id <= %s
+GROUP BY source_id, stock_id, DATE(posted_at)
+"""
+
+# (stock_id, posted_at) 인덱스 범위 스캔
+DAILY_MENTIONS_SQL = """
+SELECT stock_id, DATE(posted_at) AS d, COUNT(*) AS n
+FROM external_posts
+WHERE source_id = %s
+  AND stock_id IN %s
+  AND posted_at >= %s
+  AND posted_at < %s
+GROUP BY stock_id, DATE(posted_at)
+"""
+
+
+@contextmanager
+def posts_lock(conn):
+    """
+    external_posts 적재 + hot_topics 집계를 한 번에 하나만 (GET_LOCK은 연결 단위, 같은 연결이면 중첩 가능)
+    다른 실행이 POSTS_LOCK_TIMEOUT초 안에 안 끝나면 RuntimeError
+    """
+    with conn.cursor() as cur:
+        cur.execute("SELECT GET_LOCK(%s, %s)", (POSTS_LOCK_NAME, POSTS_LOCK_TIMEOUT))
+        if cur.fetchone()[0] != 1:
+            raise RuntimeError(f"다른 import_posts / build_hot_topics 실행이 {POSTS_LOCK_TIMEOUT}초 안에 끝나지 않았습니다.")
+    try:
+        yield
+    finally:
+        with conn.cursor() as cur:
+            cur.execute("SELECT RELEASE_LOCK(%s)", (POSTS_LOCK_NAME,))
+
+
+def load_watermark(cur) -> int:
+    cur.execute("SELECT last_id FROM aggregate_watermarks WHERE name=%s", (WATERMARK_NAME,))
+    row = cur.fetchone()
+    return int(row[0]) if row else 0
+
+
+def save_watermark(cur, last_id: int):
+    cur.execute(
+        """
+        INSERT INTO aggregate_watermarks (name, last_id) VALUES (%s, %s)
+        ON DUPLICATE KEY UPDATE last_id = VALUES(last_id)
+        """,
+        (WATERMARK_NAME, last_id),
+    )
+
+
+def touched_ranges(cur, after_id: int, upto_id: int) -> pd.DataFrame:
+    """
+    새 글이 건드린 (source, stock)별 다시 계산할 날짜 구간 [out_from, out_to]
+    """
+    cur.execute(TOUCHED_DAYS_SQL, (after_id, upto_id))
+    touched = pd.DataFrame(cur.fetchall(), columns=["source_id", "stock_id", "d"])
+    if touched.empty:
+        return touched
+    touched["d"] = pd.to_datetime(touched["d"])
+    ranges = touched.groupby(["source_id", "stock_id"])["d"].agg(out_from="min", out_to="max").reset_index()
+    ranges["out_to"] += pd.Timedelta(days=LOOKBACK_DAYS)
+    return ranges
+
+
+def daily_mentions(cur, source_id: int, stock_ids: list[int], start, end) -> pd.DataFrame:
+    """[start, end] 날짜의 종목별 일간 글 수"""
+    parts = []
+    for s in range(0, len(stock_ids), STOCKS_PER_QUERY):
+        cur.execute(DAILY_MENTIONS_SQL, (
+            source_id, tuple(stock_ids[s:s + STOCKS_PER_QUERY]),
+            start.strftime("%Y-%m-%d"), (end + pd.Timedelta(days=1)).strftime("%Y-%m-%d"),
+        ))
+        parts.append(pd.DataFrame(cur.fetchall(), columns=["stock_id", "d", "n"]))
+    counts = pd.concat(parts, ignore_index=True)
+    counts["d"] = pd.to_datetime(counts["d"])
+    counts["n"] = counts["n"].astype("int64")
+    return counts
+
+
+def compute_metrics(counts: pd.DataFrame, start, end) -> pd.DataFrame:
+    """
+    counts(stock_id, d, n) -> 날짜 x 종목 행렬에서 rolling 한 번으로 지표 계산
+    return: (stock_id, d, mentions, mentions_7d_ma, daily_growth_pct, weekly_growth_pct, popularity)
+    """
+    days = pd.date_range(start, end, freq="D")
+    wide = (
+        counts.pivot_table(index="d", columns="stock_id", values="n", aggfunc="sum", fill_value=0)
+        .reindex(days, fill_value=0)
+        .astype("float64")
+    )
+    ma = wide.rolling(MA_DAYS, min_periods=1).mean()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        daily = (wide / wide.shift(1) - 1.0) * 100.0
+        weekly = (ma / ma.shift(MA_DAYS) - 1.0) * 100.0
+    daily = daily.replace([np.inf, -np.inf], np.nan)
+    weekly = weekly.replace([np.inf, -np.inf], np.nan)
+    popularity = wide * (1.0 + weekly.clip(lower=0).fillna(0) / 100.0)
+
+    # 날짜 x 종목 행렬 -> 긴 형태 (행 우선으로 펼침)
+    n_days, n_stocks = wide.shape
+    return pd.DataFrame({
+        "d": np.repeat(wide.index.to_numpy(), n_stocks),
+        "stock_id": np.tile(wide.columns.to_numpy(), n_days),
+        "mentions": wide.to_numpy().ravel(),
+        "mentions_7d_ma": ma.to_numpy().ravel().round(4),
+        "daily_growth_pct": daily.to_numpy().ravel().round(4),
+        "weekly_growth_pct": weekly.to_numpy().ravel().round(4),
+        "popularity": popularity.to_numpy().ravel().round(4),
+    })
+
+
+def build_source(cur, source_id: int, ranges: pd.DataFrame) -> int:
+    """source 하나: 건드린 종목들의 구간만 다시 계산해서 upsert. return: upsert 행 수"""
+    start = ranges["out_from"].min() - pd.Timedelta(days=LOOKBACK_DAYS)
+    end = ranges["out_to"].max()
+    counts = daily_mentions(cur, source_id, ranges["stock_id"].astype(int).tolist(), start, end)
+    if counts.empty:
+        return 0
+
+    out = compute_metrics(counts, start, end).merge(ranges, on="stock_id")
+    keep = (out["d"] >= out["out_from"]) & (out["d"] <= out["out_to"]) & (out["mentions"] > 0)
+    out = out[keep].assign(
+        source_id=source_id,
+        Date=lambda x: x["d"].dt.strftime("%Y-%m-%d"),
+        mentions=lambda x: x["mentions"].astype("int64"),
+    )
+
+    params = to_params(out, PARAM_COLS)
+    done = 0
+    for s in range(0, len(params), max(1, BATCH_SIZE)):
+        ok, _ = flush_rows(cur, UPSERT_SQL, params[s:s + max(1, BATCH_SIZE)])
+        done += ok
+    return done
+
+
+def build_hot_topics(conn, rebuild: bool = HOT_TOPIC_REBUILD) -> dict:
+    started = time.perf_counter()
+    # watermark commit까지 lock 안에서 (다음 실행이 옛 watermark를 읽지 않게)
+    with posts_lock(conn):
+        with conn.cursor() as cur:
+            after_id = 0 if rebuild else load_watermark(cur)
+            cur.execute("SELECT COALESCE(MAX(id), 0) FROM external_posts")
+            upto_id = int(cur.fetchone()[0])
+            if upto_id <= after_id:
+                return {"rows": 0, "last_id": after_id, "elapsed": time.perf_counter() - started}
+
+            ranges = touched_ranges(cur, after_id, upto_id)
+            rows = 0
+            for source_id, g in ranges.groupby("source_id"):
+                rows += build_source(cur, int(source_id), g[["stock_id", "out_from", "out_to"]])
+
+            save_watermark(cur, upto_id)
+        conn.commit()
+    return {"rows": rows, "last_id": upto_id, "elapsed": time.perf_counter() - started}
+
+
+def main():
+    conn = connect()
+    try:
+        res = build_hot_topics(conn)
+        if res["rows"]:
+            bump_data_version(conn, "hot_topics")
+    finally:
+        conn.close()
+
+    print(f"Done. upserted={res['rows']}, last_post_id={res['last_id']}, elapsed={res['elapsed']:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
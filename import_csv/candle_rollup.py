@@ -0,0 +1,104 @@
+"""
+캔들 롤업: import가 건드린 (종목, 기간) 버킷만 1D / 1W로 다시 집계해서
+stock_price_candles에 해당 timeframe 값으로 upsert
+
+흐름
+  1) create_touched_table()  : 세션 임시 테이블 tmp_rollup_touched (stock_id, d)
+  2) add_touched() / staging은 SQL로 직접 채움
+  3) run_rollups()           : 롤업 단위별 INSERT ... SELECT 한 번
+"""
+import os
+
+from importer_core import flush_rows
+
+# 만들 롤업 단위 (원본 TIMEFRAME보다 큰 단위만 실행)
+ROLLUP_TIMEFRAMES = [t.strip() for t in os.getenv("ROLLUP_TIMEFRAMES", "1D,1W").split(",") if t.strip()]
+
+TIMEFRAME_ORDER = ["1H", "1D", "1W", "1M"]
+
+# 버킷 시작 시각 / 길이 (main 쪽 queries.CANDLE_BUCKETS와 같은 규칙: 1W는 월요일 시작)
+ROLLUP_BUCKETS = {
+    "1D": ("TIMESTAMP(d)", "INTERVAL 1 DAY"),
+    "1W": ("TIMESTAMP(d - INTERVAL WEEKDAY(d) DAY)", "INTERVAL 7 DAY"),
+}
+
+CREATE_TOUCHED_SQL = """
+CREATE TEMPORARY TABLE IF NOT EXISTS tmp_rollup_touched (
+  stock_id  BIGINT UNSIGNED NOT NULL,
+  d         DATE NOT NULL,
+  PRIMARY KEY (stock_id, d)
+) ENGINE=InnoDB
+"""
+
+ADD_TOUCHED_SQL = """
+INSERT IGNORE INTO tmp_rollup_touched (stock_id, d) VALUES (%s, %s)
+"""
+
+ROLLUP_SQL = """
+INSERT INTO stock_price_candles
+  (stock_id, timeframe, candle_time,
+   open_price, high_price, low_price, close_price, volume)
+SELECT
+  stock_id, %s, bucket_start,
+  MAX(first_open), MAX(high_price), MIN(low_price), MAX(last_close), SUM(volume)
+FROM (
+  SELECT b.stock_id, b.bucket_start,
+         c.high_price, c.low_price, c.volume,
+         FIRST_VALUE(c.open_price) OVER w AS first_open,
+         LAST_VALUE(c.close_price) OVER w AS last_close
+  FROM (
+    SELECT DISTINCT stock_id, {bucket} AS bucket_start
+    FROM tmp_rollup_touched
+  ) b
+  JOIN stock_price_candles c
+    ON c.stock_id = b.stock_id
+   AND c.timeframe = %s
+   AND c.candle_time >= b.bucket_start
+   AND c.candle_time < b.bucket_start + {length}
+  WINDOW w AS (
+    PARTITION BY b.stock_id, b.bucket_start ORDER BY c.candle_time
+    ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING
+  )
+) x
+GROUP BY stock_id, bucket_start
+ON DUPLICATE KEY UPDATE
+  open_price  = VALUES(open_price),
+  high_price  = VALUES(high_price),
+  low_price   = VALUES(low_price),
+  close_price = VALUES(close_price),
+  volume      = VALUES(volume)
+"""
+
+
+def targets_for(source_tf: str) -> list[str]:
+    if source_tf not in TIMEFRAME_ORDER:
+        return []
+    src = TIMEFRAME_ORDER.index(source_tf)
+    return [t for t in ROLLUP_TIMEFRAMES
+            if t in ROLLUP_BUCKETS and TIMEFRAME_ORDER.index(t) > src]
+
+
+def create_touched_table(cur):
+    cur.execute(CREATE_TOUCHED_SQL)
+    cur.execute("TRUNCATE TABLE tmp_rollup_touched")
+
+
+def add_touched(cur, pairs: list[tuple], batch_size: int = 5000):
+    """pairs: [(stock_id, 'YYYY-MM-DD'), ...]"""
+    for s in range(0, len(pairs), batch_size):
+        flush_rows(cur, ADD_TOUCHED_SQL, pairs[s:s + batch_size])
+
+
+def run_rollups(conn, source_tf: str) -> dict[str, int]:
+    """
+    tmp_rollup_touched에 담긴 버킷만 롤업. return: {timeframe: 영향 받은 행 수}
+    """
+    done: dict[str, int] = {}
+    with conn.cursor() as cur:
+        for tf in targets_for(source_tf):
+            bucket, length = ROLLUP_BUCKETS[tf]
+            cur.execute(ROLLUP_SQL.format(bucket=bucket, length=length), (tf, source_tf))
+            done[tf] = cur.rowcount
+        cur.execute("DROP TEMPORARY TABLE IF EXISTS tmp_rollup_touched")
+    conn.commit()
+    return done
@@ -0,0 +1,82 @@
+"""
+recommendation_coverage 갱신: 날짜별 추천 적재 수 / 전체 종목 수 / 완전 여부
+
+- refresh_coverage: import_recommendation_csv.py가 적재한 날짜만 (idx_rec_source_date 범위 스캔)
+- sync_coverage_totals: stocks가 바뀐 뒤 기존 날짜의 전체 종목 수 / 완전 여부만 다시 맞춤
+  (import_price_csv.py / import_recommendation_csv.py가 stocks version을 올리기 전에 호출)
+
+단독 실행하면 sync_coverage_totals만
+"""
+from importer_core import connect, bump_data_version
+
+COVERAGE_DATES_PER_QUERY = 500
+
+REFRESH_COVERAGE_SQL = """
+INSERT INTO recommendation_coverage
+  (source_id, signal_date, loaded_cnt, total_stocks, is_complete)
+SELECT g.source_id, g.signal_date, g.loaded_cnt, t.total_stocks,
+       g.loaded_cnt = t.total_stocks
+FROM (
+  SELECT source_id, signal_date, COUNT(*) AS loaded_cnt
+  FROM stock_daily_recommendations
+  WHERE source_id = %s {date_filter}
+  GROUP BY source_id, signal_date
+) g
+CROSS JOIN (SELECT COUNT(*) AS total_stocks FROM stocks) t
+ON DUPLICATE KEY UPDATE
+  loaded_cnt   = VALUES(loaded_cnt),
+  total_stocks = VALUES(total_stocks),
+  is_complete  = VALUES(is_complete)
+"""
+
+# total_stocks는 갱신 시점 스냅샷 -> 어긋난 날짜만 바꿈
+SYNC_COVERAGE_TOTALS_SQL = """
+UPDATE recommendation_coverage c
+CROSS JOIN (SELECT COUNT(*) AS total_stocks FROM stocks) t
+SET c.total_stocks = t.total_stocks,
+    c.is_complete  = (c.loaded_cnt = t.total_stocks)
+WHERE c.total_stocks <> t.total_stocks
+"""
+
+
+def refresh_coverage(conn, source_id: int, dates: set[str] | None):
+    """
+    recommendation_coverage 갱신. dates=None이면 전체 날짜 재계산
+    """
+    with conn.cursor() as cur:
+        if dates is None:
+            cur.execute(REFRESH_COVERAGE_SQL.format(date_filter=""), (source_id,))
+        else:
+            ds = sorted(dates)
+            for s in range(0, len(ds), COVERAGE_DATES_PER_QUERY):
+                cur.execute(
+                    REFRESH_COVERAGE_SQL.format(date_filter="AND signal_date IN %s"),
+                    (source_id, tuple(ds[s:s + COVERAGE_DATES_PER_QUERY])),
+                )
+    conn.commit()
+
+
+def sync_coverage_totals(conn) -> int:
+    """
+    stocks를 바꾸는 importer가 stocks version을 올리기 전에 호출 (is_complete / missing_cnt 어긋남 방지)
+    return: 바뀐 날짜 수
+    """
+    with conn.cursor() as cur:
+        changed = cur.execute(SYNC_COVERAGE_TOTALS_SQL)
+    conn.commit()
+    return changed
+
+
+def main():
+    conn = connect()
+    try:
+        changed = sync_coverage_totals(conn)
+        if changed:
+            bump_data_version(conn, "recommendations")
+    finally:
+        conn.close()
+    print(f"Done. synced_dates={changed}")
+
+
+if __name__ == "__main__":
+    main()
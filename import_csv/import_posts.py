@@ -0,0 +1,160 @@
+"""
+external_posts 적재 (크롤러가 떨군 JSONL / CSV 배치 파일)
+
+- 파일 여러 개: python import_posts.py a.jsonl b.csv ...
+- ticker -> stock_id, source code -> source_id는 시작 때 한 번 읽은 map으로 찾음
+- 같은 배치 안의 중복 글 (source, external_post_id)은 DB에 보내기 전에 마지막 값만 남김
+- multi-row upsert: 이미 있는 글은 like / dislike / view 수만 갱신
+- 적재 후 hot_topics 증분 집계 (BUILD_HOT_TOPICS=1, build_hot_topics.py)
+- 적재 + 집계는 build_hot_topics.posts_lock 안에서 (동시에 도는 적재가 집계 watermark 아래 id를 늦게 commit하지 않게)
+"""
+import os
+import sys
+import time
+
+import pandas as pd
+
+import build_hot_topics
+from importer_core import (
+    connect, run_import, print_throughput, load_source_map, load_stock_map, to_params, require_columns,
+    col_ticker, col_text, col_datetime_str, col_int, bump_data_version, JSONL_SUFFIXES,
+)
+
+POSTS_PATH = os.getenv("POSTS_PATH", "external_posts.jsonl")
+
+# 파일에 source 컬럼이 없을 때 쓸 source code / market_type
+POSTS_SOURCE = os.getenv("POSTS_SOURCE", "NAVER")
+MARKET_TYPE = os.getenv("MARKET_TYPE", "DOMESTIC")
+
+# 글은 행이 짧아서 한 번에 더 많이 보냄 (pymysql이 max_stmt_length 단위로 나눠 보냄)
+POSTS_BATCH_SIZE = int(os.getenv("POSTS_BATCH_SIZE", "5000"))
+
+BUILD_HOT_TOPICS = os.getenv("BUILD_HOT_TOPICS", "1") == "1"
+
+# 입력 컬럼 (JSONL은 키 이름)
+COL_SOURCE = "source"
+COL_POST_ID = "external_post_id"
+COL_CODE = "code"
+COL_MARKET = "market_type"
+COL_TITLE = "title"
+COL_LIKE = "like_count"
+COL_DISLIKE = "dislike_count"
+COL_VIEW = "view_count"
+COL_URL = "url"
+COL_POSTED_AT = "posted_at"
+
+USECOLS = [
+    COL_SOURCE, COL_POST_ID, COL_CODE, COL_MARKET, COL_TITLE,
+    COL_LIKE, COL_DISLIKE, COL_VIEW, COL_URL, COL_POSTED_AT,
+]
+OPTIONAL_COLS = {COL_SOURCE, COL_MARKET}
+
+MARKET_TYPES = {"DOMESTIC", "OVERSEAS"}
+
+# VARCHAR 길이 (finsight.sql)
+POST_ID_MAX = 100
+TITLE_MAX = 255
+URL_MAX = 500
+
+PARAM_COLS = [
+    "source_id", "post_id", "stock_id", "market_type", "title",
+    "like_count", "dislike_count", "view_count", "url", "posted_at",
+]
+
+UPSERT_SQL = """
+INSERT INTO external_posts
+  (source_id, external_post_id, stock_id, market_type, title,
+   like_count, dislike_count, view_count, url, posted_at)
+VALUES
+  (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+ON DUPLICATE KEY UPDATE
+  like_count    = VALUES(like_count),
+  dislike_count = VALUES(dislike_count),
+  view_count    = VALUES(view_count)
+"""
+
+
+def make_prepare(source_map: dict[str, int], stock_map: dict[str, int]):
+    """run_import에 넘길 chunk -> UPSERT_SQL 파라미터 변환 함수"""
+    def prepare(cur, df: pd.DataFrame):
+        # CSV에 없는 선택 컬럼 / JSONL에서 빠진 키는 빈 값
+        df = df.reindex(columns=USECOLS)
+
+        source = col_text(df[COL_SOURCE]).replace("", POSTS_SOURCE)
+        market = col_text(df[COL_MARKET]).str.upper()
+        out = pd.DataFrame({
+            "source_id": source.map(source_map),
+            "post_id": col_text(df[COL_POST_ID]).str.slice(0, POST_ID_MAX),
+            "stock_id": col_ticker(df[COL_CODE]).map(stock_map),
+            "market_type": market.where(market.isin(MARKET_TYPES), MARKET_TYPE),
+            "title": col_text(df[COL_TITLE]).str.slice(0, TITLE_MAX),
+            "like_count": col_int(df[COL_LIKE]).clip(lower=0),
+            "dislike_count": col_int(df[COL_DISLIKE]).clip(lower=0),
+            "view_count": col_int(df[COL_VIEW]).clip(lower=0),
+            "url": col_text(df[COL_URL]).str.slice(0, URL_MAX),
+            "posted_at": col_datetime_str(df[COL_POSTED_AT]),
+        })
+
+        bad_row = (out["post_id"] == "") | out["posted_at"].isna() | out["source_id"].isna()
+        out = out[~bad_row]
+        bad_stock = out["stock_id"].isna()
+        out = out[~bad_stock]
+
+        # 같은 글이 배치에 여러 번 -> 마지막(가장 최근 수치)만
+        dup = out.duplicated(["source_id", "post_id"], keep="last")
+        out = out[~dup].astype({"source_id": "int64", "stock_id": "int64"})
+
+        skips = {"row": int(bad_row.sum()), "stock": int(bad_stock.sum()), "duplicate": int(dup.sum())}
+        return to_params(out, PARAM_COLS), skips
+    return prepare
+
+
+def main():
+    paths = sys.argv[1:] or [POSTS_PATH]
+    started = time.perf_counter()
+
+    conn = connect()
+    try:
+        with conn.cursor() as cur:
+            source_map = load_source_map(cur)
+            stock_map = load_stock_map(cur)
+        if POSTS_SOURCE not in source_map:
+            raise RuntimeError(f"sources 테이블에 code='{POSTS_SOURCE}'가 없습니다.")
+
+        prepare = make_prepare(source_map, stock_map)
+        with build_hot_topics.posts_lock(conn):
+            total = {"rows": 0, "skipped": 0}
+            for path in paths:
+                if not path.lower().endswith(JSONL_SUFFIXES):
+                    require_columns(path, [c for c in USECOLS if c not in OPTIONAL_COLS])
+                stats = run_import(
+                    conn, path,
+                    label="posts",
+                    sql=UPSERT_SQL,
+                    prepare=prepare,
+                    usecols=lambda c: c in USECOLS,
+                    batch_size=POSTS_BATCH_SIZE,
+                )
+                print(
+                    f"{os.path.basename(path)}: upserted={stats['rows']}, "
+                    f"skipped_stock={stats.get('skip_stock', 0)}, skipped_row={stats.get('skip_row', 0)}, "
+                    f"duplicate={stats.get('skip_duplicate', 0)}, error={stats.get('skip_error', 0)}"
+                )
+                total["rows"] += stats["rows"]
+                total["skipped"] += stats["skipped"]
+
+            total["elapsed"] = time.perf_counter() - started
+            print(f"Done. posts upserted={total['rows']}, skipped={total['skipped']}")
+            print_throughput(total, POSTS_BATCH_SIZE)
+
+            if BUILD_HOT_TOPICS and total["rows"]:
+                res = build_hot_topics.build_hot_topics(conn)
+                if res["rows"]:
+                    bump_data_version(conn, "hot_topics")
+                print(f"hot_topics: upserted={res['rows']}, elapsed={res['elapsed']:.2f}s")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,23 @@
 import os
-import csv
-from decimal import Decimal, InvalidOperation
+import sys
+import time
+import tempfile
 import pymysql
-
-# DB 설정 (원하면 env로 교체 가능)
-DB = {
-    "host": os.getenv("DB_HOST", "localhost"),
-    "port": int(os.getenv("DB_PORT", "3306")),
-    "user": os.getenv("DB_USER", "root"),
-    "password": os.getenv("DB_PASS", "1047"),
-    "database": os.getenv("DB_NAME", "finsight"),
-    "charset": "utf8mb4",
-    "autocommit": False,
-}
+import pandas as pd
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+
+import candle_rollup
+import latest_quotes
+import backfill_outcomes
+import build_daily_metrics
+import coverage
+from importer_core import (
+    connect, run_import, iter_chunks, print_throughput, flush_rows, to_params, load_stocks,
+    col_ticker, col_text, col_datetime_str, col_money, col_int,
+    open_checkpoint, finish_checkpoint, track_high_water, after_high_water, bump_data_version,
+    is_columnar, columnar_frame_schema, BATCH_SIZE, INCREMENTAL,
+)
 
 CSV_PATH = os.getenv("PRICE_CSV", "stock_price_data_top80.csv")
 
@@ -29,135 +34,571 @@ COL_LOW = "Low"
 COL_CLOSE = "Close"
 COL_VOLUME = "Volume"
 
-# N건마다 commit (대용량일 때 속도 개선)
-COMMIT_EVERY = int(os.getenv("COMMIT_EVERY", "5000"))
-
-
-def normalize_ts(ts: str) -> str:
+USECOLS = [COL_DATE, COL_NAME, COL_CODE, COL_OPEN, COL_HIGH, COL_LOW, COL_CLOSE, COL_VOLUME]
+
+# 적재 방식
+#  - batch   : chunk 단위로 UPSERT_CANDLE_SQL multi-row upsert (기본값)
+#  - staging : 임시 테이블에 bulk 적재 후 INSERT ... SELECT 한 번으로 merge
+LOAD_MODE = os.getenv("LOAD_MODE", "batch").lower()
+
+# LOAD DATA LOCAL INFILE이 막혀 있을 때 임시 테이블에 한 번에 넣는 행 수
+STAGING_INSERT_ROWS = int(os.getenv("STAGING_INSERT_ROWS", "20000"))
+
+# 병렬 import 프로세스 수 (1이면 단일 연결로 순차 처리)
+WORKERS = int(os.getenv("WORKERS", "1"))
+
+# 1이면 적재 후 새 일봉으로 추천 결과(actual_is_up / is_hit) backfill
+BACKFILL_OUTCOMES = os.getenv("BACKFILL_OUTCOMES", "1") == "1"
+
+# 1이면 적재한 종목의 latest_quotes 스냅샷 갱신 (원본 + 롤업 timeframe)
+UPDATE_LATEST_QUOTES = os.getenv("UPDATE_LATEST_QUOTES", "1") == "1"
+
+# 1이면 적재 후 적재한 가장 이른 날짜부터 stock_daily_metrics 다시 계산 (/rankings)
+BUILD_DAILY_METRICS = os.getenv("BUILD_DAILY_METRICS", "1") == "1"
+
+STAGE_COLS = ["ticker", "name_ko", "candle_time", "o", "h", "l", "c", "vol"]
+CANDLE_COLS = ["stock_id", "timeframe", "candle_time", "o", "h", "l", "c", "vol"]
+
+
+UPSERT_STOCK_SQL = """
+INSERT INTO stocks (ticker, name_ko, name_en)
+VALUES (%s, %s, NULL)
+ON DUPLICATE KEY UPDATE
+  name_ko = VALUES(name_ko)
+"""
+
+GET_STOCK_ID_SQL = """
+SELECT id FROM stocks WHERE ticker = %s
+"""
+
+UPSERT_CANDLE_SQL = """
+INSERT INTO stock_price_candles
+  (stock_id, timeframe, candle_time,
+   open_price, high_price, low_price, close_price, volume)
+VALUES
+  (%s, %s, %s, %s, %s, %s, %s, %s)
+ON DUPLICATE KEY UPDATE
+  open_price  = VALUES(open_price),
+  high_price  = VALUES(high_price),
+  low_price   = VALUES(low_price),
+  close_price = VALUES(close_price),
+  volume      = VALUES(volume)
+"""
+
+# staging 모드용 임시 테이블 (세션 종료 시 자동 삭제)
+CREATE_STAGING_SQL = """
+CREATE TEMPORARY TABLE tmp_price_candles (
+  ticker       VARCHAR(16) NOT NULL,
+  name_ko      VARCHAR(100) NOT NULL,
+  candle_time  DATETIME NOT NULL,
+  open_price   DECIMAL(15, 2) NOT NULL,
+  high_price   DECIMAL(15, 2) NOT NULL,
+  low_price    DECIMAL(15, 2) NOT NULL,
+  close_price  DECIMAL(15, 2) NOT NULL,
+  volume       BIGINT UNSIGNED NOT NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+"""
+
+LOAD_STAGING_SQL = """
+LOAD DATA LOCAL INFILE %s
+INTO TABLE tmp_price_candles
+CHARACTER SET utf8mb4
+FIELDS TERMINATED BY '\\t'
+LINES TERMINATED BY '\\n'
+(ticker, name_ko, candle_time,
+ open_price, high_price, low_price, close_price, volume)
+"""
+
+INSERT_STAGING_SQL = """
+INSERT INTO tmp_price_candles
+  (ticker, name_ko, candle_time,
+   open_price, high_price, low_price, close_price, volume)
+VALUES
+  (%s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
+# 종목은 ticker 단위로 한 번만 upsert
+MERGE_STOCKS_SQL = """
+INSERT INTO stocks (ticker, name_ko, name_en)
+SELECT t.ticker, t.name_ko, NULL
+FROM (
+  SELECT ticker, MAX(name_ko) AS name_ko
+  FROM tmp_price_candles
+  GROUP BY ticker
+) t
+ON DUPLICATE KEY UPDATE
+  name_ko = VALUES(name_ko)
+"""
+
+# 종목별 적재한 가장 이른 날짜 (latest_quotes / 일간 지표 대상)
+STAGED_STOCK_DAYS_SQL = """
+SELECT s.id, DATE_FORMAT(MIN(t.candle_time), '%Y-%m-%d')
+FROM tmp_price_candles t
+JOIN stocks s ON s.ticker = t.ticker
+GROUP BY s.id
+"""
+
+# stocks id를 join 한 번으로 해결해서 캔들 전체를 한 문장으로 merge
+MERGE_CANDLES_SQL = """
+INSERT INTO stock_price_candles
+  (stock_id, timeframe, candle_time,
+   open_price, high_price, low_price, close_price, volume)
+SELECT
+  s.id, %s, t.candle_time,
+  t.open_price, t.high_price, t.low_price, t.close_price, t.volume
+FROM tmp_price_candles t
+JOIN stocks s ON s.ticker = t.ticker
+ON DUPLICATE KEY UPDATE
+  open_price  = VALUES(open_price),
+  high_price  = VALUES(high_price),
+  low_price   = VALUES(low_price),
+  close_price = VALUES(close_price),
+  volume      = VALUES(volume)
+"""
+
+# staging 모드 롤업 대상: 적재한 (stock_id, 날짜)를 SQL로 바로 채움
+COLLECT_TOUCHED_SQL = """
+INSERT IGNORE INTO tmp_rollup_touched (stock_id, d)
+SELECT DISTINCT s.id, DATE(t.candle_time)
+FROM tmp_price_candles t
+JOIN stocks s ON s.ticker = t.ticker
+"""
+
+
+def normalize_chunk(df: pd.DataFrame) -> tuple[pd.DataFrame, int]:
+    """
+    CSV / Parquet chunk -> STAGE_COLS 컬럼 DataFrame (벡터화 변환)
+    종목코드/시각이 비어 있는 행은 skip
+    return: (정규화된 DataFrame, skip 행 수)
+    """
+    out = pd.DataFrame({
+        "ticker": col_ticker(df[COL_CODE]),
+        "name_ko": col_text(df[COL_NAME]),
+        "candle_time": col_datetime_str(df[COL_DATE]),
+        "o": col_money(df[COL_OPEN]),
+        "h": col_money(df[COL_HIGH]),
+        "l": col_money(df[COL_LOW]),
+        "c": col_money(df[COL_CLOSE]),
+        "vol": col_int(df[COL_VOLUME]),
+    })
+    valid = out["ticker"].notna() & out["candle_time"].notna()
+    return out[valid], int((~valid).sum())
+
+
+def resolve_stock_ids(cur, df: pd.DataFrame, stock_id_cache: dict[str, int],
+                      stock_names: dict[str, str | None]):
+    """
+    처음 보는 ticker / 이름이 바뀐 ticker만 stocks upsert + id 조회 (없으면 DB 왕복 없음)
+    stock_id_cache / stock_names는 실행 시작 때 load_stocks()로 채워 둠
     """
-    MySQL DATETIME에 넣기 위한 정규화.
-    예: '2025-12-05 10:00:00+00:00' -> '2025-12-05 10:00:00'
+    last = df[["ticker", "name_ko"]].drop_duplicates("ticker", keep="last")
+    known = last["ticker"].map(stock_names)
+    stale = ~last["ticker"].isin(stock_id_cache.keys()) | (
+        last["name_ko"].notna() & (known != last["name_ko"])
+    )
+    new = last[stale]
+    if new.empty:
+        return
+    flush_rows(cur, UPSERT_STOCK_SQL, to_params(new, ["ticker", "name_ko"]))
+    cur.execute("SELECT id, ticker, name_ko FROM stocks WHERE ticker IN %s", (tuple(new["ticker"]),))
+    for i, t, n in cur.fetchall():
+        stock_id_cache[str(t)] = int(i)
+        stock_names[str(t)] = n
+
+
+def add_touched_days(touched: set | None, out: pd.DataFrame):
+    """롤업 대상 (stock_id, 날짜) 누적"""
+    if touched is None or out.empty:
+        return
+    days = pd.DataFrame({"s": out["stock_id"], "d": out["candle_time"].str.slice(0, 10)}).drop_duplicates()
+    touched.update(zip(days["s"].tolist(), days["d"]))
+
+
+def make_candle_prepare(stock_id_cache: dict[str, int], stock_names: dict[str, str | None],
+                        checkpoint: dict | None = None, touched: set | None = None):
     """
-    s = str(ts).strip()
-    s = s.replace("T", " ")
-    s = s.replace("+00:00", "")
-    # 만약 끝에 'Z'가 붙는 형식이면 제거
-    if s.endswith("Z"):
-        s = s[:-1]
-    return s
+    run_import에 넘길 chunk -> UPSERT_CANDLE_SQL 파라미터 변환 함수
+    touched: 적재한 (stock_id, 날짜)를 모아둠 (롤업용)
+    """
+    def prepare(cur, df: pd.DataFrame):
+        out, bad = normalize_chunk(df)
+
+        # 증분 모드: 이전 high_water 이전 캔들은 이미 적재됨
+        track_high_water(checkpoint, out["ticker"], out["candle_time"])
+        fresh = after_high_water(checkpoint, out["candle_time"], "%Y-%m-%d %H:%M:%S")
+        out = out[fresh]
+
+        resolve_stock_ids(cur, out, stock_id_cache, stock_names)
 
+        out = out.assign(stock_id=out["ticker"].map(stock_id_cache), timeframe=TIMEFRAME)
+        matched = out["stock_id"].notna()
+        out = out[matched].astype({"stock_id": "int64"})
+        add_touched_days(touched, out)
+        skips = {"row": bad, "stock": int((~matched).sum()), "unchanged": int((~fresh).sum())}
+        return to_params(out, CANDLE_COLS), skips
+    return prepare
 
-def zfill6(code: str) -> str:
-    return str(code).strip().zfill(6)
+
+def collect_resumed_prefix(conn, path: str, rows: int, stock_id_cache: dict[str, int],
+                           stock_names: dict[str, str | None], touched: set):
+    """
+    재개한 실행: 중단 전에 commit된 앞부분 행도 롤업 대상에 넣어야 하므로 날짜만 다시 읽음
+    """
+    with conn.cursor() as cur:
+        for df in iter_chunks(path, usecols=USECOLS, max_rows=rows):
+            out, _ = normalize_chunk(df)
+            resolve_stock_ids(cur, out, stock_id_cache, stock_names)
+            out = out.assign(stock_id=out["ticker"].map(stock_id_cache)).dropna(subset=["stock_id"])
+            add_touched_days(touched, out.astype({"stock_id": "int64"}))
 
 
-def to_int_volume(v) -> int:
+def import_batched(conn, path: str, checkpoint: dict | None = None,
+                   touched: set | None = None) -> tuple[int, int]:
+    """
+    chunk 단위 정규화 + 배치 upsert (기본 경로)
+    return: (처리 행 수, skip 행 수)
+    """
+    with conn.cursor() as cur:
+        stock_id_cache, stock_names = load_stocks(cur)
+    if checkpoint and checkpoint["resume_rows"] and touched is not None:
+        collect_resumed_prefix(conn, path, checkpoint["resume_rows"], stock_id_cache, stock_names, touched)
+
+    stats = run_import(
+        conn, path,
+        label="price",
+        sql=UPSERT_CANDLE_SQL,
+        prepare=make_candle_prepare(stock_id_cache, stock_names, checkpoint, touched),
+        usecols=USECOLS,
+        checkpoint=checkpoint,
+    )
+    if stats["unchanged"]:
+        print(f"{os.path.basename(path)}: {stats['unchanged']} rows before high-water skipped")
+    return stats["rows"], stats["skipped"]
+
+
+def to_tsv_field(s: pd.Series) -> pd.Series:
+    # LOAD DATA 기본 escape 규칙(백슬래시)에 맞추고 구분자/개행은 공백으로
+    return (
+        s.astype(str)
+        .str.replace("\\", "\\\\", regex=False)
+        .str.replace(r"[\t\r\n]", " ", regex=True)
+    )
+
+
+def stage_with_load_data(cur, path: str) -> tuple[int, int]:
+    """
+    정규화한 chunk를 임시 TSV 파일로 이어 쓴 뒤 LOAD DATA LOCAL INFILE 한 번으로 적재.
+    파일은 chunk 단위로 쓰기 때문에 메모리는 CSV 크기와 무관.
+    """
+    staged = 0
+    skipped = 0
+    fd, tsv_path = tempfile.mkstemp(prefix="price_stage_", suffix=".tsv")
     try:
-        return int(float(v))
-    except Exception:
-        return 0
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as out:
+            for df in iter_chunks(path, usecols=USECOLS):
+                norm, bad = normalize_chunk(df)
+                skipped += bad
+                if norm.empty:
+                    continue
+                line = to_tsv_field(norm[STAGE_COLS[0]])
+                for col in STAGE_COLS[1:]:
+                    line = line + "\t" + to_tsv_field(norm[col])
+                out.write("\n".join(line))
+                out.write("\n")
+                staged += len(norm)
+
+        cur.execute(LOAD_STAGING_SQL, (tsv_path,))
+    finally:
+        os.remove(tsv_path)
+    return staged, skipped
 
 
-def to_decimal_2(v) -> Decimal:
+def stage_with_inserts(cur, path: str) -> tuple[int, int]:
+    """
+    LOAD DATA LOCAL INFILE이 허용되지 않는 서버용: 큰 multi-row INSERT로 임시 테이블 적재
+    """
+    staged = 0
+    skipped = 0
+    for df in iter_chunks(path, usecols=USECOLS):
+        norm, bad = normalize_chunk(df)
+        skipped += bad
+        params = to_params(norm, STAGE_COLS)
+        for s in range(0, len(params), STAGING_INSERT_ROWS):
+            cur.executemany(INSERT_STAGING_SQL, params[s:s + STAGING_INSERT_ROWS])
+        staged += len(params)
+    return staged, skipped
+
+
+def import_staging(conn, path: str, rollup: bool = False,
+                   touched_stocks: dict | None = None) -> tuple[int, int]:
+    """
+    임시 테이블 bulk 적재 -> stocks merge -> candles merge (set-based)
+    rollup=True면 적재한 (stock_id, 날짜)를 tmp_rollup_touched에 SQL로 바로 채움
+    touched_stocks: {stock_id: 적재한 가장 이른 날짜}를 채움 (latest_quotes / 일간 지표용)
+    return: (처리 행 수, skip 행 수)
+    """
+    with conn.cursor() as cur:
+        cur.execute(CREATE_STAGING_SQL)
+        try:
+            try:
+                staged, skipped = stage_with_load_data(cur, path)
+            except pymysql.err.MySQLError as e:
+                # local_infile 비활성 등 -> INSERT 방식으로 다시 적재
+                print(f"LOAD DATA LOCAL INFILE unavailable ({e}); falling back to multi-row INSERT staging")
+                cur.execute("TRUNCATE TABLE tmp_price_candles")
+                staged, skipped = stage_with_inserts(cur, path)
+
+            cur.execute(MERGE_STOCKS_SQL)
+
+            # stocks에 매칭되지 않은 행은 skip으로 집계
+            cur.execute(
+                "SELECT COUNT(*) FROM tmp_price_candles t "
+                "LEFT JOIN stocks s ON s.ticker = t.ticker WHERE s.id IS NULL"
+            )
+            unmatched = int(cur.fetchone()[0])
+
+            cur.execute(MERGE_CANDLES_SQL, (TIMEFRAME,))
+            if rollup:
+                cur.execute(COLLECT_TOUCHED_SQL)
+            if touched_stocks is not None:
+                cur.execute(STAGED_STOCK_DAYS_SQL)
+                touched_stocks.update((int(i), d) for i, d in cur.fetchall())
+            conn.commit()
+        finally:
+            cur.execute("DROP TEMPORARY TABLE IF EXISTS tmp_price_candles")
+
+    return staged - unmatched, skipped + unmatched
+
+
+def checkpoint_name() -> str:
+    return f"price_{TIMEFRAME}"
+
+
+def import_file(path: str, use_checkpoint: bool = True) -> dict:
     """
-    DECIMAL(15,2)에 맞춰 안전 변환.
-    빈 값/이상치면 0.00
+    파일 하나를 연결 하나로 import (단일 실행 / 병렬 worker 공용)
+    INCREMENTAL=1이면 batch 모드는 행 단위(high_water + 재개), staging 모드는 파일 단위로만 변경 감지
+    적재가 끝나면 건드린 버킷만 1D / 1W 롤업 (ROLLUP_TIMEFRAMES), 건드린 종목만 latest_quotes 갱신
+    return의 first_day: 적재한 가장 이른 날짜 (일간 지표 재계산 시작점, 없으면 None)
     """
+    staging = LOAD_MODE == "staging"
+    rollup = bool(candle_rollup.targets_for(TIMEFRAME))
+    # LOAD DATA LOCAL INFILE은 클라이언트 쪽에서도 허용해야 함
+    conn = connect(local_infile=staging)
+    started = time.perf_counter()
     try:
-        if v is None:
-            return Decimal("0.00")
-        s = str(v).strip()
-        if s == "" or s.lower() == "nan":
-            return Decimal("0.00")
-        return Decimal(s).quantize(Decimal("0.01"))
-    except (InvalidOperation, ValueError):
-        return Decimal("0.00")
+        cp = open_checkpoint(conn, checkpoint_name(), path) if (INCREMENTAL and use_checkpoint) else None
+        if cp and cp["unchanged"]:
+            print(f"{os.path.basename(path)}: unchanged since last import, skipped")
+            return {"path": path, "rows": 0, "skipped": 0, "first_day": None,
+                    "elapsed": time.perf_counter() - started}
+
+        if rollup:
+            with conn.cursor() as cur:
+                candle_rollup.create_touched_table(cur)
+
+        # {stock_id: 적재한 가장 이른 날짜}
+        first_days: dict = {}
+        if staging:
+            inserted, skipped = import_staging(conn, path, rollup, first_days)
+            if cp:
+                finish_checkpoint(conn, cp)
+        else:
+            touched: set = set()
+            inserted, skipped = import_batched(conn, path, cp, touched)
+            for sid, d in touched:
+                if d < first_days.get(sid, "9999-12-31"):
+                    first_days[sid] = d
+
+        if rollup:
+            t0 = time.perf_counter()
+            with conn.cursor() as cur:
+                candle_rollup.add_touched(cur, sorted(touched) if not staging else [])
+            done = candle_rollup.run_rollups(conn, TIMEFRAME)
+            print(f"{os.path.basename(path)}: rollup {done} in {time.perf_counter() - t0:.2f}s")
+
+        if UPDATE_LATEST_QUOTES and first_days:
+            t0 = time.perf_counter()
+            timeframes = [TIMEFRAME] + candle_rollup.targets_for(TIMEFRAME)
+            done = latest_quotes.refresh_latest_quotes(conn, timeframes, first_days.keys())
+            print(f"{os.path.basename(path)}: latest_quotes affected={done} in {time.perf_counter() - t0:.2f}s")
+    finally:
+        conn.close()
+    return {"path": path, "rows": inserted, "skipped": skipped,
+            "first_day": min(first_days.values()) if first_days else None,
+            "elapsed": time.perf_counter() - started}
 
 
-def main():
-    conn = pymysql.connect(**DB)
-    cur = conn.cursor()
+def import_partition(path: str) -> dict:
+    # 파티션 파일은 실행마다 내용이 달라서 체크포인트는 원본 파일 단위로 부모가 관리
+    return import_file(path, use_checkpoint=False)
 
-    stock_id_cache: dict[str, int] = {}
 
-    upsert_stock_sql = """
-    INSERT INTO stocks (ticker, name_ko, name_en)
-    VALUES (%s, %s, NULL)
-    ON DUPLICATE KEY UPDATE
-      name_ko = VALUES(name_ko)
-    """
+def append_parquet_part(writers: dict, i: int, path: str, df: pd.DataFrame, schema):
+    """파티션 parquet에 chunk를 이어 씀 (schema: 입력 파일들에서 한 번 정한 스키마로 맞춤)"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
 
-    get_stock_id_sql = """
-    SELECT id FROM stocks WHERE ticker = %s
-    """
+    table = pa.Table.from_pandas(df, preserve_index=False).select(schema.names).cast(schema)
+    w = writers.get(i)
+    if w is None:
+        w = writers[i] = pq.ParquetWriter(path, schema)
+    w.write_table(table)
 
-    upsert_candle_sql = """
-    INSERT INTO stock_price_candles
-      (stock_id, timeframe, candle_time,
-       open_price, high_price, low_price, close_price, volume)
-    VALUES
-      (%s, %s, %s, %s, %s, %s, %s, %s)
-    ON DUPLICATE KEY UPDATE
-      open_price  = VALUES(open_price),
-      high_price  = VALUES(high_price),
-      low_price   = VALUES(low_price),
-      close_price = VALUES(close_price),
-      volume      = VALUES(volume)
-    """
 
-    inserted = 0
-    skipped = 0
+def partition_by_ticker(paths: list[str], n: int, out_dir: str) -> tuple[list[str], dict[str, str]]:
+    """
+    입력 파일들을 ticker 해시로 n개 파티션 파일로 나눔.
+    ticker와 stocks.id는 1:1이라 같은 stock_id의 행은 항상 같은 파티션(= 같은 worker)으로 가고,
+    worker끼리 uq_candle_unique의 같은 키를 두고 경합하지 않음.
+    입력이 전부 Parquet / Arrow면 파티션도 parquet (worker가 문자열로 다시 파싱하지 않게), 아니면 CSV
+    return: (파티션 파일 경로 리스트, {ticker: name_ko})
+    """
+    columnar = all(is_columnar(p) for p in paths)
+    ext = "parquet" if columnar else "csv"
+    out_paths = [os.path.join(out_dir, f"part_{i:02d}.{ext}") for i in range(n)]
+    written = [False] * n
+    writers: dict = {}
+    names: dict[str, str] = {}
+    schema = columnar_frame_schema(paths, USECOLS) if columnar else None
 
     try:
-        with open(CSV_PATH, newline="", encoding="utf-8-sig") as f:
-            reader = csv.DictReader(f)
-
-            for row in reader:
-                try:
-                    ticker = zfill6(row[COL_CODE])
-                    name_ko = (row.get(COL_NAME) or "").strip()
-                    candle_time = normalize_ts(row[COL_DATE])
-
-                    o = to_decimal_2(row.get(COL_OPEN))
-                    h = to_decimal_2(row.get(COL_HIGH))
-                    l = to_decimal_2(row.get(COL_LOW))
-                    c = to_decimal_2(row.get(COL_CLOSE))
-                    vol = to_int_volume(row.get(COL_VOLUME))
-
-                    # 1) stocks upsert + id 조회(캐시)
-                    stock_id = stock_id_cache.get(ticker)
-                    if stock_id is None:
-                        cur.execute(upsert_stock_sql, (ticker, name_ko))
-                        cur.execute(get_stock_id_sql, (ticker,))
-                        fetched = cur.fetchone()
-                        if not fetched:
-                            skipped += 1
-                            continue
-                        stock_id = int(fetched[0])
-                        stock_id_cache[ticker] = stock_id
-
-                    # 2) candles upsert
-                    cur.execute(
-                        upsert_candle_sql,
-                        (stock_id, TIMEFRAME, candle_time, o, h, l, c, vol)
-                    )
-
-                    inserted += 1
-                    if COMMIT_EVERY > 0 and inserted % COMMIT_EVERY == 0:
-                        conn.commit()
-
-                except Exception:
-                    skipped += 1
-                    continue
+        for path in paths:
+            for df in iter_chunks(path, usecols=USECOLS):
+                key = col_ticker(df[COL_CODE]).fillna("")
+                seen = pd.DataFrame({"t": key, "n": col_text(df[COL_NAME])}).drop_duplicates("t", keep="last")
+                names.update(zip(seen["t"], seen["n"]))
+                part = pd.util.hash_pandas_object(key, index=False).to_numpy() % n
+                for i, g in df.groupby(part):
+                    if columnar:
+                        append_parquet_part(writers, i, out_paths[i], g, schema)
+                    else:
+                        g.to_csv(out_paths[i], mode="a", header=not written[i], index=False, encoding="utf-8")
+                    written[i] = True
+    finally:
+        for w in writers.values():
+            w.close()
 
-        conn.commit()
+    names.pop("", None)
+    return [p for p, w in zip(out_paths, written) if w], names
 
+
+def preload_stocks(names: dict[str, str]):
+    """
+    worker 시작 전에 stocks를 한 번에 upsert.
+    worker들이 동시에 stocks에 새 행을 넣으면서 unique index gap lock을 잡지 않도록.
+    """
+    conn = connect()
+    try:
+        with conn.cursor() as cur:
+            params = list(names.items())
+            for s in range(0, len(params), max(1, BATCH_SIZE)):
+                flush_rows(cur, UPSERT_STOCK_SQL, params[s:s + max(1, BATCH_SIZE)])
+        conn.commit()
     finally:
-        cur.close()
         conn.close()
 
-    print(f"Imported price data ({MARKET_TYPE}, timeframe={TIMEFRAME})")
+
+def import_parallel(paths: list[str], workers: int) -> list[dict]:
+    """
+    ticker 기준 파티션 -> 프로세스 풀 (worker당 DB 연결 1개)
+    INCREMENTAL=1이면 내용이 바뀌지 않은 원본 파일은 파티션 전에 제외
+    """
+    checkpoints = []
+    if INCREMENTAL:
+        conn = connect()
+        try:
+            checkpoints = [open_checkpoint(conn, checkpoint_name(), p) for p in paths]
+        finally:
+            conn.close()
+        for cp in checkpoints:
+            if cp["unchanged"]:
+                print(f"{cp['source_key']}: unchanged since last import, skipped")
+        paths = [p for p, cp in zip(paths, checkpoints) if not cp["unchanged"]]
+        checkpoints = [cp for cp in checkpoints if not cp["unchanged"]]
+        if not paths:
+            return []
+
+    with tempfile.TemporaryDirectory(prefix="price_parts_") as tmp:
+        t0 = time.perf_counter()
+        parts, names = partition_by_ticker(paths, workers, tmp)
+        preload_stocks(names)
+        print(f"partitioned {len(paths)} file(s) into {len(parts)} part(s) in {time.perf_counter() - t0:.2f}s")
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(import_partition, parts))
+
+    if checkpoints:
+        conn = connect()
+        try:
+            for cp in checkpoints:
+                finish_checkpoint(conn, cp)
+        finally:
+            conn.close()
+    return results
+
+
+def writes_timeframe(tf: str) -> bool:
+    """이번 실행이 tf 캔들을 직접 또는 롤업으로 쓰는지"""
+    return tf == TIMEFRAME or tf in candle_rollup.targets_for(TIMEFRAME)
+
+
+def writes_outcome_candles() -> bool:
+    """결과 판단용 캔들(OUTCOME_TIMEFRAME)을 쓰는지"""
+    return writes_timeframe(backfill_outcomes.OUTCOME_TIMEFRAME)
+
+
+def main():
+    paths = sys.argv[1:] or [CSV_PATH]
+    workers = max(1, WORKERS)
+
+    started = time.perf_counter()
+
+    if workers > 1:
+        results = import_parallel(paths, workers)
+    else:
+        results = [import_file(p) for p in paths]
+
+    inserted = sum(r["rows"] for r in results)
+    skipped = sum(r["skipped"] for r in results)
+
+    outcomes = None
+    metrics = None
+    if inserted:
+        conn = connect()
+        try:
+            # 새 종목이 생겼으면 recommendation_coverage의 전체 종목 수도 맞춘 뒤 version 올림
+            coverage.sync_coverage_totals(conn)
+            bump_data_version(conn, "stocks", "candles")
+            if BACKFILL_OUTCOMES and writes_outcome_candles():
+                outcomes = backfill_outcomes.backfill_outcomes(conn)
+                if outcomes["updated"]:
+                    bump_data_version(conn, "recommendations")
+            first_day = min((r["first_day"] for r in results if r["first_day"]), default=None)
+            if BUILD_DAILY_METRICS and first_day and writes_timeframe(build_daily_metrics.DAILY_METRICS_TIMEFRAME):
+                since = datetime.strptime(first_day, "%Y-%m-%d").date()
+                metrics = build_daily_metrics.build_daily_metrics(conn, since)
+                if metrics["rows"]:
+                    bump_data_version(conn, "daily_metrics")
+        finally:
+            conn.close()
+
+    elapsed = time.perf_counter() - started
+
+    print(f"Imported price data ({MARKET_TYPE}, timeframe={TIMEFRAME}, mode={LOAD_MODE}, workers={workers})")
+    if len(results) > 1:
+        for r in results:
+            rate = r["rows"] / r["elapsed"] if r["elapsed"] > 0 else 0.0
+            print(f"  {os.path.basename(r['path'])}: rows={r['rows']}, skipped={r['skipped']}, "
+                  f"elapsed={r['elapsed']:.2f}s, rows/sec={rate:,.0f}")
     print(f"rows processed={inserted}, skipped={skipped}")
+    if outcomes:
+        print(f"outcomes backfilled: computed={outcomes['computed']}, updated={outcomes['updated']}, "
+              f"elapsed={outcomes['elapsed']:.2f}s")
+    if metrics:
+        print(f"daily metrics: upserted={metrics['rows']} since {metrics['since']}, "
+              f"elapsed={metrics['elapsed']:.2f}s")
+    print_throughput({"rows": inserted, "elapsed": elapsed}, BATCH_SIZE)
 
 
 if __name__ == "__main__":
@@ -1,160 +1,158 @@
 import os
-import csv
-import pymysql
-from datetime import datetime
-
-DB = {
-    "host": os.getenv("DB_HOST", "localhost"),
-    "port": int(os.getenv("DB_PORT", "3306")),
-    "user": os.getenv("DB_USER", "root"),
-    "password": os.getenv("DB_PASS", "1047"),
-    "database": os.getenv("DB_NAME", "finsight"),
-    "charset": "utf8mb4",
-    "autocommit": False,
-}
+import numpy as np
+import pandas as pd
+
+from importer_core import (
+    connect, run_import, print_throughput, load_source_id, load_stock_map, to_params,
+    col_ticker, col_text, col_date_str, col_float,
+    open_checkpoint, track_high_water, after_high_water, bump_data_version, INCREMENTAL,
+)
+from coverage import refresh_coverage, sync_coverage_totals
 
 CSV_PATH = os.getenv("REC_CSV", "prediction_result_report.csv")
 THRESHOLD_USED = float(os.getenv("THRESHOLD_USED", "0.35"))
 
+# 1이면 이번에 적재한 날짜뿐 아니라 recommendation_coverage 전체를 다시 계산
+REBUILD_COVERAGE = os.getenv("REBUILD_COVERAGE", "0") == "1"
+
 # CSV 헤더
 COL_DATE = "Date"
 COL_CODE = "Code"
 COL_POS_RATIO = "Positive_Ratio"
 COL_PRED_SUCCESS = "Prediction_Success"
 
-COMMIT_EVERY = int(os.getenv("COMMIT_EVERY", "5000"))
-
-
-def zfill6(code: str) -> str:
-    return str(code).strip().zfill(6)
-
-
-def parse_date_yyyy_mm_dd(s: str) -> str | None:
-    s = str(s).strip()
-    if not s:
-        return None
-    try:
-        dt = datetime.strptime(s[:10], "%Y-%m-%d")
-        return dt.strftime("%Y-%m-%d")
-    except Exception:
-        return None
-
-
-def parse_success_flag(v) -> int | None:
+USECOLS = {COL_DATE, COL_CODE, COL_POS_RATIO, COL_PRED_SUCCESS}
+
+PARAM_COLS = [
+    "stock_id", "source_id", "signal_date",
+    "pos_ratio", "threshold_used",
+    "is_recommended", "actual_is_up", "is_hit",
+]
+
+# Prediction_Success가 빈 행(결과 미정)은 backfill_outcomes가 채운 결과를 NULL로 덮지 않음
+# ON DUPLICATE KEY UPDATE는 왼쪽부터 적용 -> is_hit은 방금 정해진 actual_is_up을 봄 (추천한 경우만)
+UPSERT_SQL = """
+INSERT INTO stock_daily_recommendations
+  (stock_id, source_id, signal_date,
+   positive_ratio, threshold_used,
+   is_recommended, actual_is_up, is_hit)
+VALUES
+  (%s, %s, %s, %s, %s, %s, %s, %s)
+ON DUPLICATE KEY UPDATE
+  positive_ratio = VALUES(positive_ratio),
+  threshold_used = VALUES(threshold_used),
+  is_recommended = VALUES(is_recommended),
+  actual_is_up   = COALESCE(VALUES(actual_is_up), actual_is_up),
+  is_hit         = IF(VALUES(is_recommended) = 1, actual_is_up, NULL)
+"""
+
+def parse_success_flag(s: pd.Series) -> pd.Series:
     """
     Prediction_Success:
       - success -> 1 (예측 맞음)
       - fail    -> 0 (예측 틀림)
       - 그 외   -> None
     """
-    if v is None:
-        return None
-    s = str(v).strip().lower()
-    if s == "success":
-        return 1
-    if s == "fail":
-        return 0
-    return None
+    v = col_text(s).str.lower()
+    return pd.Series(
+        np.select([v == "success", v == "fail"], [1.0, 0.0], default=np.nan),
+        index=s.index,
+    )
 
 
-def main():
-    conn = pymysql.connect(**DB)
-    cur = conn.cursor()
-
-    # 이번 모델: NAVER 고정
-    cur.execute("SELECT id FROM sources WHERE code='NAVER' LIMIT 1;")
-    row = cur.fetchone()
-    if not row:
-        raise RuntimeError("sources 테이블에 code='NAVER'가 없습니다.")
-    source_id = int(row[0])
-
-    stock_id_cache: dict[str, int] = {}
-    get_stock_id_sql = "SELECT id FROM stocks WHERE ticker = %s LIMIT 1;"
-
-    upsert_sql = """
-    INSERT INTO stock_daily_recommendations
-      (stock_id, source_id, signal_date,
-       positive_ratio, threshold_used,
-       is_recommended, actual_is_up, is_hit)
-    VALUES
-      (%s, %s, %s, %s, %s, %s, %s, %s)
-    ON DUPLICATE KEY UPDATE
-      positive_ratio = VALUES(positive_ratio),
-      threshold_used = VALUES(threshold_used),
-      is_recommended = VALUES(is_recommended),
-      actual_is_up   = VALUES(actual_is_up),
-      is_hit         = VALUES(is_hit)
+def make_prepare(source_id: int, stock_map: dict[str, int], checkpoint: dict | None = None,
+                 touched_dates: set[str] | None = None):
     """
+    run_import에 넘길 chunk -> UPSERT_SQL 파라미터 변환 함수
+    touched_dates: 적재한 signal_date를 모아둠 (coverage 갱신용)
+    """
+    def prepare(cur, df: pd.DataFrame):
+        out = pd.DataFrame({
+            "signal_date": col_date_str(df[COL_DATE]),
+            "ticker": col_ticker(df[COL_CODE]),
+            "pos_ratio": col_float(df[COL_POS_RATIO], default=None),
+        })
+        bad_row = out["signal_date"].isna() | out["pos_ratio"].isna()
+        out = out[~bad_row]
+
+        # 증분 모드: 이전 high_water(signal_date) 이전 행은 이미 적재됨
+        track_high_water(checkpoint, out["ticker"], out["signal_date"])
+        fresh = after_high_water(checkpoint, out["signal_date"], "%Y-%m-%d")
+        out = out[fresh]
+
+        out = out.assign(stock_id=out["ticker"].map(stock_map))
+        bad_stock = out["stock_id"].isna()
+        out = out[~bad_stock]
+
+        is_recommended = (out["pos_ratio"] > THRESHOLD_USED).astype("int64")
+
+        if COL_PRED_SUCCESS in df.columns:
+            success_flag = parse_success_flag(df.loc[out.index, COL_PRED_SUCCESS])
+        else:
+            success_flag = pd.Series(np.nan, index=out.index)
+
+        # 추천했으면 성공=상승, 추천 안 했으면 성공=하락
+        actual_is_up = success_flag.where(is_recommended == 1, 1 - success_flag)
+        # 적중 여부는 추천한 경우만 (정답 여부와 동일)
+        is_hit = success_flag.where(is_recommended == 1)
+
+        if touched_dates is not None:
+            touched_dates.update(out["signal_date"].unique())
+
+        out = out.assign(
+            stock_id=out["stock_id"].astype("int64"),
+            source_id=source_id,
+            threshold_used=THRESHOLD_USED,
+            is_recommended=is_recommended,
+            actual_is_up=actual_is_up.astype("Int64"),
+            is_hit=is_hit.astype("Int64"),
+        )
+        skips = {"row": int(bad_row.sum()), "stock": int(bad_stock.sum()), "unchanged": int((~fresh).sum())}
+        return to_params(out, PARAM_COLS), skips
+    return prepare
+
 
-    upserted = 0
-    skipped_stock = 0
-    skipped_row = 0
+def main():
+    conn = connect()
 
     try:
-        with open(CSV_PATH, newline="", encoding="utf-8-sig") as f:
-            reader = csv.DictReader(f)
-
-            for r in reader:
-                signal_date = parse_date_yyyy_mm_dd(r.get(COL_DATE))
-                if not signal_date:
-                    skipped_row += 1
-                    continue
-
-                ticker = zfill6(r.get(COL_CODE))
-
-                try:
-                    pos_ratio = float(r.get(COL_POS_RATIO))
-                except Exception:
-                    skipped_row += 1
-                    continue
-
-                is_recommended = 1 if (pos_ratio > THRESHOLD_USED) else 0
-
-
-                success_flag = parse_success_flag(r.get(COL_PRED_SUCCESS))
-
-                actual_is_up = None
-                if success_flag is not None:
-                    if is_recommended == 1:
-                        actual_is_up = success_flag
-                    else:
-                        actual_is_up = 0 if success_flag == 1 else 1
-
-                is_hit = None
-                if is_recommended == 1 and success_flag is not None:
-                    is_hit = success_flag  # 정답 여부와 동일
-
-                # stock_id 조회
-                stock_id = stock_id_cache.get(ticker)
-                if stock_id is None:
-                    cur.execute(get_stock_id_sql, (ticker,))
-                    srow = cur.fetchone()
-                    if not srow:
-                        skipped_stock += 1
-                        continue
-                    stock_id = int(srow[0])
-                    stock_id_cache[ticker] = stock_id
-
-                cur.execute(
-                    upsert_sql,
-                    (
-                        stock_id, source_id, signal_date,
-                        pos_ratio, THRESHOLD_USED,
-                        is_recommended, actual_is_up, is_hit
-                    )
-                )
-                upserted += 1
-
-                if COMMIT_EVERY > 0 and upserted % COMMIT_EVERY == 0:
-                    conn.commit()
-
-        conn.commit()
+        with conn.cursor() as cur:
+            # 이번 모델: NAVER 고정
+            source_id = load_source_id(cur, "NAVER")
+            stock_map = load_stock_map(cur)
+
+        cp = open_checkpoint(conn, "recommendation", CSV_PATH) if INCREMENTAL else None
+        if cp and cp["unchanged"]:
+            print(f"{cp['source_key']}: unchanged since last import, skipped")
+            if REBUILD_COVERAGE:
+                refresh_coverage(conn, source_id, None)
+            return
+
+        touched_dates: set[str] = set()
+        stats = run_import(
+            conn, CSV_PATH,
+            label="recommendation",
+            sql=UPSERT_SQL,
+            prepare=make_prepare(source_id, stock_map, cp, touched_dates),
+            usecols=lambda c: c in USECOLS,
+            checkpoint=cp,
+        )
+
+        # 재개한 실행은 중단 전에 적재한 날짜를 모르므로 전체 재계산
+        rebuild = REBUILD_COVERAGE or bool(cp and cp["resume_rows"])
+        refresh_coverage(conn, source_id, None if rebuild else touched_dates)
+        # 이번에 안 건드린 날짜도 지금 stocks 수에 맞춤
+        sync_coverage_totals(conn)
+        bump_data_version(conn, "recommendations")
 
     finally:
-        cur.close()
         conn.close()
 
-    print(f"Done. upserted={upserted}, skipped_stock={skipped_stock}, skipped_row={skipped_row}")
+    print(
+        f"Done. upserted={stats['rows']}, skipped_stock={stats.get('skip_stock', 0)}, "
+        f"skipped_row={stats.get('skip_row', 0) + stats.get('skip_error', 0)}, unchanged={stats['unchanged']}"
+    )
+    print_throughput(stats)
 
 
 if __name__ == "__main__":
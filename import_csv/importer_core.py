@@ -0,0 +1,701 @@
+"""
+CSV importer 공통 모듈
+
+- DB 설정 / 연결
+- 인코딩 감지 (앞부분 샘플만 읽음)
+- chunk 단위 스트리밍 읽기 (파일 크기와 무관하게 메모리 일정)
+  CSV / JSON Lines는 문자열로, Parquet / Arrow IPC는 타입 그대로 record batch 단위로 읽음
+- chunk 단위 벡터화 변환 헬퍼
+- 배치 upsert + N건마다 commit + chunk별 처리량 출력
+- (INCREMENTAL=1) import_checkpoints 기반 변경 감지 / 중단 지점부터 재개
+
+각 importer는 usecols / upsert SQL / prepare(cur, df) 만 넘기면 된다.
+"""
+import os
+import json
+import time
+import codecs
+import hashlib
+import numpy as np
+import pymysql
+import pandas as pd
+from datetime import datetime
+
+DB = {
+    "host": os.getenv("DB_HOST", "localhost"),
+    "port": int(os.getenv("DB_PORT", "3306")),
+    "user": os.getenv("DB_USER", "root"),
+    "password": os.getenv("DB_PASS", "1047"),
+    "database": os.getenv("DB_NAME", "finsight"),
+    "charset": "utf8mb4",
+    "autocommit": False,
+}
+
+# N건마다 commit (대용량일 때 속도 개선)
+COMMIT_EVERY = int(os.getenv("COMMIT_EVERY", "5000"))
+
+# 한 번에 executemany로 보내는 행 수 (1이면 행 단위 전송과 동일)
+BATCH_SIZE = int(os.getenv("BATCH_SIZE", "1000"))
+
+# 한 번에 메모리에 올리는 CSV 행 수
+READ_CHUNK_ROWS = int(os.getenv("READ_CHUNK_ROWS", "50000"))
+
+# 인코딩 감지용 샘플 크기 / 후보 (utf-8-sig는 BOM 없는 utf-8도 읽음)
+ENCODING_SAMPLE_BYTES = 64 * 1024
+ENCODING_CANDIDATES = ("utf-8-sig", "cp949")
+
+# iter_chunks가 JSON Lines로 읽는 확장자
+JSONL_SUFFIXES = (".jsonl", ".ndjson")
+
+# iter_chunks가 pyarrow로 읽는 확장자 (타입이 있는 컬럼 -> 문자열 파싱 없음)
+PARQUET_SUFFIXES = (".parquet", ".pq")
+ARROW_SUFFIXES = (".arrow", ".feather", ".ipc")
+COLUMNAR_SUFFIXES = PARQUET_SUFFIXES + ARROW_SUFFIXES
+
+# 1이면 import_checkpoints 테이블로 이미 적재한 파일/행을 건너뜀
+INCREMENTAL = os.getenv("INCREMENTAL", "0") == "1"
+
+
+def connect(**extra):
+    return pymysql.connect(**DB, **extra)
+
+
+# 스칼라 변환
+def zfill6(code: str) -> str:
+    return str(code).strip().zfill(6)
+
+
+def normalize_ts(ts: str) -> str:
+    """
+    MySQL DATETIME에 넣기 위한 정규화.
+    예: '2025-12-05 10:00:00+00:00' -> '2025-12-05 10:00:00'
+    """
+    s = str(ts).strip()
+    s = s.replace("T", " ")
+    s = s.replace("+00:00", "")
+    # 만약 끝에 'Z'가 붙는 형식이면 제거
+    if s.endswith("Z"):
+        s = s[:-1]
+    return s
+
+
+def parse_date_yyyy_mm_dd(s) -> str | None:
+    s = str(s).strip()
+    if not s:
+        return None
+    try:
+        return datetime.strptime(s[:10], "%Y-%m-%d").strftime("%Y-%m-%d")
+    except Exception:
+        return None
+
+
+# chunk(Series) 단위 벡터화 변환
+# Parquet / Arrow chunk는 컬럼이 타입을 가진 채로 들어오므로 문자열을 거치지 않는 경로를 먼저 탐
+def col_ticker(s: pd.Series) -> pd.Series:
+    """종목코드 6자리 (빈 값은 None)"""
+    if pd.api.types.is_numeric_dtype(s):
+        # 정수로 저장된 코드 (5930 -> '005930')
+        s = s.astype("Int64").astype("string")
+    t = s.fillna("").astype(str).str.strip()
+    return t.str.zfill(6).where(t != "", None).astype(object)
+
+
+def col_text(s: pd.Series) -> pd.Series:
+    return s.fillna("").astype(str).str.strip()
+
+
+def col_datetime_str(s: pd.Series) -> pd.Series:
+    """normalize_ts의 벡터화 버전 (빈 값은 None)"""
+    if pd.api.types.is_datetime64_any_dtype(s):
+        return _datetime64_str(s, "s")
+    out = (
+        s.fillna("").astype(str).str.strip()
+        .str.replace("T", " ", regex=False)
+        .str.replace("+00:00", "", regex=False)
+        .str.replace(r"Z$", "", regex=True)
+    )
+    return out.where(out != "", None).astype(object)
+
+
+def col_date_str(s: pd.Series) -> pd.Series:
+    """parse_date_yyyy_mm_dd의 벡터화 버전 (파싱 실패는 None)"""
+    if pd.api.types.is_datetime64_any_dtype(s):
+        return _datetime64_str(s, "D")
+    d = pd.to_datetime(s.fillna("").astype(str).str.strip().str.slice(0, 10), format="%Y-%m-%d", errors="coerce")
+    return d.dt.strftime("%Y-%m-%d").where(d.notna(), None).astype(object)
+
+
+def _datetime64_str(s: pd.Series, unit: str) -> pd.Series:
+    """
+    datetime64 컬럼 -> 'YYYY-MM-DD HH:MM:SS' / 'YYYY-MM-DD' (NaT는 None)
+    tz가 있으면 벽시계 시각 그대로 tz만 뗌 (CSV의 '+00:00' 제거와 같은 처리)
+    """
+    if getattr(s.dt, "tz", None) is not None:
+        s = s.dt.tz_localize(None)
+    v = s.to_numpy(dtype=f"datetime64[{unit}]")
+    out = pd.Series(np.datetime_as_string(v, unit=unit), index=s.index)
+    if unit == "s":
+        out = out.str.replace("T", " ", regex=False)
+    return out.where(s.notna(), None).astype(object)
+
+
+def col_float(s: pd.Series, default: float | None = 0.0) -> pd.Series:
+    if pd.api.types.is_float_dtype(s) or pd.api.types.is_integer_dtype(s):
+        out = s.astype("float64")
+        return out.fillna(default) if default is not None else out
+    out = pd.to_numeric(s, errors="coerce")
+    if default is not None:
+        out = out.fillna(default)
+    return out.astype(float)
+
+
+def col_money(s: pd.Series) -> pd.Series:
+    """DECIMAL(15,2)용: 빈 값/이상치는 0.00"""
+    return col_float(s, 0.0).round(2)
+
+
+def col_int(s: pd.Series) -> pd.Series:
+    """int(float(v)) 와 동일하게 소수점 버림, 이상치는 0"""
+    if pd.api.types.is_integer_dtype(s):
+        # 정수 컬럼은 float을 거치지 않음 (2^53 넘는 거래량도 그대로)
+        return s.fillna(0).astype("int64")
+    return col_float(s, 0.0).astype("int64")
+
+
+def to_params(df: pd.DataFrame, cols: list[str]) -> list[tuple]:
+    """
+    DataFrame -> executemany 파라미터.
+    numpy 타입을 파이썬 기본 타입으로 바꾸고 NaN은 None으로.
+    """
+    sub = df[cols].astype(object)
+    sub = sub.where(sub.notna(), None)
+    return list(sub.itertuples(index=False, name=None))
+
+
+# 읽기
+def detect_encoding(path: str) -> str:
+    """
+    앞부분 샘플만 디코딩해서 인코딩 결정 (파일 전체를 여러 번 읽지 않음)
+    Parquet / Arrow는 텍스트 파일이 아니므로 감지하지 않음
+    """
+    if is_columnar(path):
+        return "utf-8"
+    with open(path, "rb") as f:
+        sample = f.read(ENCODING_SAMPLE_BYTES)
+    for enc in ENCODING_CANDIDATES:
+        try:
+            # 샘플 끝에서 멀티바이트 문자가 잘릴 수 있으니 final=False
+            codecs.getincrementaldecoder(enc)().decode(sample, final=False)
+            return enc
+        except UnicodeDecodeError:
+            pass
+    raise RuntimeError(f"CSV 인코딩을 읽지 못했습니다. ({'/'.join(ENCODING_CANDIDATES)} 모두 실패)")
+
+
+def read_header(path: str, encoding: str | None = None) -> list[str]:
+    if is_columnar(path):
+        return list(_arrow_schema(path).names)
+    enc = encoding or detect_encoding(path)
+    return list(pd.read_csv(path, encoding=enc, nrows=0).columns)
+
+
+def require_columns(path: str, required: list[str], encoding: str | None = None):
+    cols = read_header(path, encoding)
+    missing = [c for c in required if c not in cols]
+    if missing:
+        raise RuntimeError(f"{os.path.basename(path)}에 필요한 컬럼이 없습니다: {missing}")
+
+
+def iter_chunks(path: str, usecols: list[str] | None = None,
+                chunk_rows: int | None = None, encoding: str | None = None,
+                skip_rows: int = 0, max_rows: int | None = None):
+    """
+    CSV를 chunk_rows 행씩 DataFrame으로 흘려줌.
+    (.jsonl / .ndjson은 iter_jsonl_chunks, .parquet / .arrow 등은 iter_columnar_chunks)
+    CSV는 모든 값을 문자열로 읽고 변환은 col_* 헬퍼로 chunk마다 벡터화 처리.
+    skip_rows: 헤더 다음 데이터 행을 앞에서부터 N개 건너뜀 (재개용)
+    max_rows : 앞에서부터 N행만 읽음
+    """
+    if path.lower().endswith(JSONL_SUFFIXES):
+        yield from iter_jsonl_chunks(path, usecols, chunk_rows, skip_rows, max_rows)
+        return
+    if is_columnar(path):
+        yield from iter_columnar_chunks(path, usecols, chunk_rows, skip_rows, max_rows)
+        return
+
+    enc = encoding or detect_encoding(path)
+    reader = pd.read_csv(
+        path,
+        encoding=enc,
+        usecols=usecols,
+        dtype=str,
+        chunksize=chunk_rows or READ_CHUNK_ROWS,
+        nrows=skip_rows + max_rows if max_rows is not None else None,
+    )
+    with reader:
+        # skiprows=range(...)는 pandas가 set으로 바꿔서 재개 위치만큼 메모리를 씀 -> chunk를 읽으며 버림
+        yield from skip_leading_rows(reader, skip_rows)
+
+
+def skip_leading_rows(chunks, skip_rows: int):
+    """chunk 흐름에서 앞쪽 skip_rows 행을 버림 (메모리는 chunk 하나 크기)"""
+    seen = 0
+    for df in chunks:
+        start = seen
+        seen += len(df)
+        if seen <= skip_rows:
+            continue
+        if start < skip_rows:
+            df = df.iloc[skip_rows - start:]
+        yield df
+
+
+def iter_jsonl_chunks(path: str, usecols=None, chunk_rows: int | None = None,
+                      skip_rows: int = 0, max_rows: int | None = None):
+    """
+    JSON Lines 버전 (한 줄 = 객체 하나, 키 = 컬럼). CSV와 같게 값은 원문 문자열, 없는 키 / null은 빈 값
+    pd.read_json은 dtype=str이어도 숫자를 float로 먼저 읽고(5930 -> '5930.0') *_at을 날짜로 바꿔서 직접 파싱
+    재개할 때 건너뛰는 줄은 json 파싱도 하지 않음
+    """
+    chunk_rows = chunk_rows or READ_CHUNK_ROWS
+    if usecols is None or callable(usecols):
+        keep = usecols
+    else:
+        keep = set(usecols).__contains__
+
+    def frame(records: list[dict]) -> pd.DataFrame:
+        df = pd.DataFrame.from_records(records)
+        if callable(usecols):
+            return df
+        if usecols is not None:
+            return df.reindex(columns=list(usecols))
+        return df
+
+    seen = 0
+    records: list[dict] = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            if max_rows is not None and seen >= skip_rows + max_rows:
+                break
+            seen += 1
+            if seen <= skip_rows:
+                continue
+            obj = json.loads(line, parse_int=str, parse_float=str)
+            records.append({k: _json_text(v) for k, v in obj.items() if keep is None or keep(k)})
+            if len(records) >= chunk_rows:
+                yield frame(records)
+                records = []
+    if records:
+        yield frame(records)
+
+
+def _json_text(v) -> str | None:
+    # 숫자는 parse_int / parse_float=str로 이미 원문 그대로
+    if v is None or isinstance(v, str):
+        return v
+    if isinstance(v, bool):
+        return "true" if v else "false"
+    return json.dumps(v, ensure_ascii=False)
+
+
+def is_columnar(path: str) -> bool:
+    return path.lower().endswith(COLUMNAR_SUFFIXES)
+
+
+def _pyarrow():
+    # pyarrow는 Parquet / Arrow 파일을 읽을 때만 필요
+    try:
+        import pyarrow
+    except ImportError:
+        raise RuntimeError("Parquet / Arrow 파일을 읽으려면 pyarrow가 필요합니다. (pip install pyarrow)")
+    return pyarrow
+
+
+def _open_ipc(pa, src):
+    # IPC file(= feather v2)을 먼저, 안 되면 stream 형식으로
+    import pyarrow.ipc as ipc
+
+    try:
+        return ipc.open_file(src)
+    except pa.ArrowInvalid:
+        src.seek(0)
+        return ipc.open_stream(src)
+
+
+def _arrow_schema(path: str):
+    pa = _pyarrow()
+    if path.lower().endswith(PARQUET_SUFFIXES):
+        import pyarrow.parquet as pq
+
+        return pq.read_schema(path)
+    with pa.OSFile(path) as src:
+        return _open_ipc(pa, src).schema
+
+
+def _iter_arrow_batches(path: str, columns: list[str], batch_rows: int):
+    pa = _pyarrow()
+    if path.lower().endswith(PARQUET_SUFFIXES):
+        import pyarrow.parquet as pq
+
+        with pq.ParquetFile(path) as pf:
+            yield from pf.iter_batches(batch_size=batch_rows, columns=columns)
+        return
+
+    # memory_map은 to_pandas가 매핑을 그대로 가리킬 수 있어서 닫은 뒤가 위험 -> 일반 파일로 읽음
+    with pa.OSFile(path) as src:
+        reader = _open_ipc(pa, src)
+        if isinstance(reader, pa.ipc.RecordBatchFileReader):
+            batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+        else:
+            batches = reader
+        for batch in batches:
+            yield batch.select(columns)
+
+
+def columnar_frame_schema(paths: list[str], columns: list[str]):
+    """
+    iter_columnar_chunks가 만든 DataFrame을 다시 arrow로 쓸 때의 스키마 (입력 파일 스키마들을 합침).
+    chunk 하나만 보고 정하면 그 chunk에서 전부 빈 컬럼이 null 타입으로 고정되므로 파일 스키마 기준.
+    decimal -> float64, date -> timestamp (_batch_to_frame과 같게), 어느 파일에도 없는 컬럼은 float64
+    """
+    pa = _pyarrow()
+
+    def frame_type(t):
+        if pa.types.is_dictionary(t):
+            t = t.value_type
+        if pa.types.is_decimal(t):
+            return pa.float64()
+        if pa.types.is_date(t):
+            return pa.timestamp("ms")
+        return t
+
+    schemas = []
+    for path in paths:
+        schema = _arrow_schema(path)
+        schemas.append(pa.schema([pa.field(c, frame_type(schema.field(c).type))
+                                  for c in columns if c in schema.names]))
+    merged = pa.unify_schemas(schemas, promote_options="permissive")
+    return pa.schema([merged.field(c) if c in merged.names else pa.field(c, pa.float64())
+                      for c in columns])
+
+
+def _batch_to_frame(batch) -> pd.DataFrame:
+    """
+    record batch -> DataFrame (숫자 / 시각 컬럼은 numpy 타입 그대로)
+    decimal은 파이썬 Decimal 객체가 되지 않게 float64로, date는 datetime64로
+    """
+    pa = _pyarrow()
+
+    if any(pa.types.is_decimal(f.type) for f in batch.schema):
+        cols = [c.cast(pa.float64()) if pa.types.is_decimal(f.type) else c
+                for f, c in zip(batch.schema, batch.columns)]
+        batch = pa.RecordBatch.from_arrays(cols, names=batch.schema.names)
+    return batch.to_pandas(date_as_object=False)
+
+
+def iter_columnar_chunks(path: str, usecols=None, chunk_rows: int | None = None,
+                         skip_rows: int = 0, max_rows: int | None = None):
+    """
+    Parquet / Arrow IPC 버전. 컬럼 타입(정수 / float64 / timestamp)을 유지한 채 chunk_rows 행씩.
+    필요한 컬럼만 읽고, 파일의 batch가 크면 chunk_rows로 잘라서(복사 없음) 넘김.
+    없는 컬럼은 JSONL처럼 빈 값
+    """
+    chunk_rows = chunk_rows or READ_CHUNK_ROWS
+    names = list(_arrow_schema(path).names)
+    if callable(usecols):
+        wanted = [c for c in names if usecols(c)]
+    elif usecols is not None:
+        wanted = list(usecols)
+    else:
+        wanted = names
+    present = [c for c in wanted if c in names]
+
+    batches = _iter_arrow_batches(path, present, chunk_rows)
+    seen = 0
+    left = max_rows
+    for batch in batches:
+        start = seen
+        seen += batch.num_rows
+        if seen <= skip_rows:
+            continue
+        if start < skip_rows:
+            batch = batch.slice(skip_rows - start)
+        for off in range(0, batch.num_rows, chunk_rows):
+            if left is not None and left <= 0:
+                return
+            part = batch.slice(off, chunk_rows if left is None else min(chunk_rows, left))
+            if left is not None:
+                left -= part.num_rows
+            df = _batch_to_frame(part)
+            if len(present) != len(wanted):
+                df = df.reindex(columns=wanted)
+            yield df
+
+
+def file_hash(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+# 체크포인트 (import_checkpoints)
+def open_checkpoint(conn, importer: str, path: str) -> dict:
+    """
+    파일 내용 해시로 이전 실행과 비교.
+      - 같은 해시 + DONE    -> unchanged=True (파일 전체 skip)
+      - 같은 해시 + RUNNING -> 마지막 commit 지점(rows_done)부터 재개
+      - 다른 해시 / 처음    -> 처음부터, 단 이전 high_water 이전 행은 skip
+    """
+    cp = {
+        "importer": importer,
+        "source_key": os.path.basename(path),
+        "hash": file_hash(path),
+        "high_water": None,
+        "resume_rows": 0,
+        "unchanged": False,
+        "seen_max": {},
+    }
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT content_hash, status, rows_done, high_water FROM import_checkpoints "
+            "WHERE importer=%s AND source_key=%s",
+            (importer, cp["source_key"]),
+        )
+        row = cur.fetchone()
+        if row:
+            old_hash, status, rows_done, high_water = row
+            cp["high_water"] = high_water
+            if old_hash == cp["hash"]:
+                if status == "DONE":
+                    cp["unchanged"] = True
+                    return cp
+                cp["resume_rows"] = int(rows_done)
+
+        cur.execute(
+            """
+            INSERT INTO import_checkpoints (importer, source_key, content_hash, rows_done, status)
+            VALUES (%s, %s, %s, %s, 'RUNNING')
+            ON DUPLICATE KEY UPDATE
+              content_hash = VALUES(content_hash),
+              rows_done = VALUES(rows_done),
+              status = 'RUNNING'
+            """,
+            (importer, cp["source_key"], cp["hash"], cp["resume_rows"]),
+        )
+    conn.commit()
+    return cp
+
+
+def save_checkpoint(cur, cp: dict, rows_done: int):
+    """데이터와 같은 트랜잭션 안에서 호출 (commit은 호출한 쪽에서)"""
+    cur.execute(
+        "UPDATE import_checkpoints SET rows_done=%s WHERE importer=%s AND source_key=%s",
+        (rows_done, cp["importer"], cp["source_key"]),
+    )
+
+
+def finish_checkpoint(conn, cp: dict, rows_done: int | None = None):
+    """
+    DONE 처리 + high_water 갱신.
+    high_water = 이번 파일에서 종목별 최신 시각 중 가장 이른 값
+    (모든 종목이 그 시각까지는 적재됐다고 보장되는 지점)
+    재개한 실행은 앞부분 행을 보지 못했으므로 이전 high_water를 유지
+    """
+    high_water = cp["high_water"]
+    if cp["seen_max"] and not cp["resume_rows"]:
+        high_water = min(cp["seen_max"].values())
+    with conn.cursor() as cur:
+        cur.execute(
+            """
+            UPDATE import_checkpoints
+            SET status='DONE', high_water=%s,
+                rows_done=COALESCE(%s, rows_done)
+            WHERE importer=%s AND source_key=%s
+            """,
+            (high_water, rows_done, cp["importer"], cp["source_key"]),
+        )
+    conn.commit()
+
+
+def track_high_water(cp: dict | None, keys: pd.Series, times: pd.Series):
+    """chunk의 종목별 최대 시각을 cp["seen_max"]에 누적"""
+    if cp is None or keys.empty:
+        return
+    seen = cp["seen_max"]
+    latest = pd.DataFrame({"k": keys, "t": times}).groupby("k")["t"].max()
+    for k, t in latest.items():
+        if k not in seen or t > seen[k]:
+            seen[k] = t
+
+
+def after_high_water(cp: dict | None, times: pd.Series, fmt: str) -> pd.Series:
+    """
+    이전 high_water 이후(같은 시각 포함) 행만 True.
+    high_water 시각의 행은 마지막 봉/결과가 바뀌었을 수 있어서 다시 upsert.
+    """
+    if cp is None or cp["high_water"] is None:
+        return pd.Series(True, index=times.index)
+    return times >= cp["high_water"].strftime(fmt)
+
+
+# 쓰기
+def load_source_id(cur, code: str) -> int:
+    cur.execute("SELECT id FROM sources WHERE code=%s LIMIT 1;", (code,))
+    row = cur.fetchone()
+    if not row:
+        raise RuntimeError(f"sources 테이블에 code='{code}'가 없습니다.")
+    return int(row[0])
+
+
+def load_source_map(cur) -> dict[str, int]:
+    """code -> sources.id"""
+    cur.execute("SELECT id, code FROM sources;")
+    return {str(c).strip(): int(i) for (i, c) in cur.fetchall()}
+
+
+def load_stocks(cur) -> tuple[dict[str, int], dict[str, str | None]]:
+    """
+    실행 시작 때 stocks를 한 번만 읽어 공유하는 맵 (API registry.py와 같은 역할)
+    return: (ticker -> stocks.id, ticker -> name_ko)
+    """
+    cur.execute("SELECT id, ticker, name_ko FROM stocks;")
+    ids: dict[str, int] = {}
+    names: dict[str, str | None] = {}
+    for i, t, n in cur.fetchall():
+        t = str(t).strip()
+        ids[t] = int(i)
+        names[t] = n
+    return ids, names
+
+
+def load_stock_map(cur) -> dict[str, int]:
+    """ticker -> stocks.id (SELECT 한 번)"""
+    return load_stocks(cur)[0]
+
+
+def bump_data_version(conn, *names: str):
+    """
+    data_versions 카운터 +1 (API 캐시가 다음 version 확인 때 무효화됨)
+    """
+    with conn.cursor() as cur:
+        cur.executemany(
+            """
+            INSERT INTO data_versions (name, version) VALUES (%s, 1)
+            ON DUPLICATE KEY UPDATE version = version + 1
+            """,
+            [(n,) for n in names],
+        )
+    conn.commit()
+
+
+def flush_rows(cur, sql: str, batch: list[tuple]) -> tuple[int, int]:
+    """
+    모아둔 행을 multi-row INSERT 한 번으로 upsert.
+    배치 전체가 실패하면 행 단위로 다시 넣어서 문제 행만 skip 처리.
+    return: (성공 행 수, skip 행 수)
+    """
+    if not batch:
+        return 0, 0
+    try:
+        # pymysql은 INSERT ... VALUES (...) ON DUPLICATE KEY UPDATE 를 multi-row VALUES로 묶어서 보냄
+        cur.executemany(sql, batch)
+        return len(batch), 0
+    except Exception:
+        ok = 0
+        bad = 0
+        for params in batch:
+            try:
+                cur.execute(sql, params)
+                ok += 1
+            except Exception:
+                bad += 1
+        return ok, bad
+
+
+def run_import(conn, path: str, *, label: str, sql: str, prepare,
+               usecols: list[str] | None = None, encoding: str | None = None,
+               batch_size: int | None = None, commit_every: int | None = None,
+               checkpoint: dict | None = None, verbose: bool = True) -> dict:
+    """
+    공통 import 루프.
+
+    prepare(cur, df) -> (params 리스트, {skip 사유: 건수})
+      chunk 하나를 벡터화 변환해서 sql 파라미터로 바꾸는 함수 (importer별로 다름)
+      사유가 "unchanged"인 행(high_water 이전)은 skip이 아니라 unchanged로 집계
+
+    checkpoint: open_checkpoint() 결과. 주면 COMMIT_EVERY 행 단위로 읽고,
+      chunk마다 데이터와 rows_done을 같은 트랜잭션으로 commit (중단 시 그 지점부터 재개)
+
+    return: {"rows": 성공 행 수, "skipped": skip 합계, "skip_<사유>": 건수..., "elapsed": 초}
+    """
+    batch_size = max(1, batch_size or BATCH_SIZE)
+    commit_every = COMMIT_EVERY if commit_every is None else commit_every
+
+    stats: dict = {"rows": 0, "skipped": 0, "unchanged": 0}
+    committed_at = 0
+    started = time.perf_counter()
+
+    chunk_rows = None
+    consumed = 0
+    if checkpoint is not None:
+        consumed = checkpoint["resume_rows"]
+        stats["resumed_from"] = consumed
+        if commit_every > 0:
+            chunk_rows = commit_every
+        if consumed and verbose:
+            print(f"[{label}] resuming {checkpoint['source_key']} after row {consumed}")
+
+    chunks = iter_chunks(path, usecols=usecols, encoding=encoding, chunk_rows=chunk_rows, skip_rows=consumed)
+
+    with conn.cursor() as cur:
+        for i, df in enumerate(chunks, start=1):
+            t0 = time.perf_counter()
+            params, skips = prepare(cur, df)
+
+            for reason, n in skips.items():
+                if reason == "unchanged":
+                    stats["unchanged"] += n
+                    continue
+                stats[f"skip_{reason}"] = stats.get(f"skip_{reason}", 0) + n
+                stats["skipped"] += n
+
+            chunk_ok = 0
+            for s in range(0, len(params), batch_size):
+                ok, bad = flush_rows(cur, sql, params[s:s + batch_size])
+                chunk_ok += ok
+                stats["rows"] += ok
+                stats["skip_error"] = stats.get("skip_error", 0) + bad
+                stats["skipped"] += bad
+
+                if checkpoint is None and commit_every > 0 and stats["rows"] - committed_at >= commit_every:
+                    conn.commit()
+                    committed_at = stats["rows"]
+
+            if checkpoint is not None:
+                # chunk = COMMIT_EVERY 행 -> 데이터와 진행 위치를 한 번에 commit
+                consumed += len(df)
+                save_checkpoint(cur, checkpoint, consumed)
+                conn.commit()
+
+            if verbose:
+                dt = time.perf_counter() - t0
+                rate = chunk_ok / dt if dt > 0 else 0.0
+                print(f"[{label}] chunk {i}: read={len(df)}, upserted={chunk_ok}, {rate:,.0f} rows/sec")
+
+        conn.commit()
+
+    if checkpoint is not None:
+        finish_checkpoint(conn, checkpoint, consumed)
+
+    stats["elapsed"] = time.perf_counter() - started
+    return stats
+
+
+def print_throughput(stats: dict, batch_size: int | None = None):
+    elapsed = stats["elapsed"]
+    rate = stats["rows"] / elapsed if elapsed > 0 else 0.0
+    print(f"batch_size={max(1, batch_size or BATCH_SIZE)}, elapsed={elapsed:.2f}s, rows/sec={rate:,.0f}")
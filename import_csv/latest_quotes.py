@@ -0,0 +1,92 @@
+"""
+latest_quotes 스냅샷 갱신: (timeframe, stock)마다 최신 캔들 1개 + 직전 종가
+
+- import가 건드린 종목만, 종목마다 uq_candle_unique를 역순으로 두 번 탐색 (최신 / 직전)
+- 이미 있는 행은 더 새로운(또는 같은 시각의 수정된) 캔들일 때만 바뀜
+  -> 과거 구간만 다시 적재해도 스냅샷은 그대로
+
+평소에는 import_price_csv.py가 적재 후 호출. 단독 실행하면 전체 종목을 다시 계산
+"""
+import os
+
+from importer_core import connect, bump_data_version
+
+# 단독 실행 때 다시 계산할 timeframe
+QUOTE_TIMEFRAMES = [t.strip() for t in os.getenv("QUOTE_TIMEFRAMES", "1H,1D,1W").split(",") if t.strip()]
+
+STOCKS_PER_QUERY = 1000
+
+# ON DUPLICATE KEY UPDATE는 왼쪽부터 적용 -> candle_time을 마지막에 바꿔야 앞의 비교가 기존 값을 봄
+# INSERT ... SELECT라 SELECT 쪽 l / p의 같은 이름 컬럼과 겹치지 않게 기존 값은 latest_quotes.로 적음
+REFRESH_SQL = """
+INSERT INTO latest_quotes
+  (timeframe, stock_id, candle_time, close_price, prev_close, change_pct, volume)
+SELECT
+  %s, s.id, l.candle_time, l.close_price, p.close_price,
+  CASE WHEN p.close_price > 0
+       THEN ROUND((l.close_price - p.close_price) / p.close_price * 100, 4) END,
+  l.volume
+FROM stocks s
+JOIN LATERAL (
+  SELECT c.candle_time, c.close_price, c.volume
+  FROM stock_price_candles c
+  WHERE c.stock_id = s.id AND c.timeframe = %s
+  ORDER BY c.candle_time DESC
+  LIMIT 1
+) l ON TRUE
+LEFT JOIN LATERAL (
+  SELECT c.close_price
+  FROM stock_price_candles c
+  WHERE c.stock_id = s.id AND c.timeframe = %s
+    AND c.candle_time < l.candle_time
+  ORDER BY c.candle_time DESC
+  LIMIT 1
+) p ON TRUE
+WHERE s.id IN %s
+ON DUPLICATE KEY UPDATE
+  close_price = IF(VALUES(candle_time) >= latest_quotes.candle_time, VALUES(close_price), latest_quotes.close_price),
+  prev_close  = IF(VALUES(candle_time) >= latest_quotes.candle_time, VALUES(prev_close), latest_quotes.prev_close),
+  change_pct  = IF(VALUES(candle_time) >= latest_quotes.candle_time, VALUES(change_pct), latest_quotes.change_pct),
+  volume      = IF(VALUES(candle_time) >= latest_quotes.candle_time, VALUES(volume), latest_quotes.volume),
+  candle_time = GREATEST(latest_quotes.candle_time, VALUES(candle_time))
+"""
+
+
+def refresh_latest_quotes(conn, timeframes: list[str], stock_ids) -> dict[str, int]:
+    """
+    stock_ids 종목의 timeframes별 스냅샷 갱신. return: {timeframe: affected rows}
+    affected rows는 MySQL 기준 그대로: 새 행 1, 값이 바뀐 기존 행 2, 그대로인 행 0
+    -> 바뀐 종목 수가 아님 (0이면 아무것도 안 바뀐 것만 확실)
+    """
+    ids = sorted({int(i) for i in stock_ids})
+    done: dict[str, int] = {}
+    if not ids:
+        return done
+    with conn.cursor() as cur:
+        for tf in timeframes:
+            affected = 0
+            for s in range(0, len(ids), STOCKS_PER_QUERY):
+                cur.execute(REFRESH_SQL, (tf, tf, tf, tuple(ids[s:s + STOCKS_PER_QUERY])))
+                affected += cur.rowcount
+            done[tf] = affected
+    conn.commit()
+    return done
+
+
+def main():
+    """전체 종목 다시 계산 (테이블을 처음 만들었을 때 / 캔들을 직접 고쳤을 때)"""
+    conn = connect()
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT id FROM stocks")
+            ids = [r[0] for r in cur.fetchall()]
+        done = refresh_latest_quotes(conn, QUOTE_TIMEFRAMES, ids)
+        if any(done.values()):
+            bump_data_version(conn, "candles")
+    finally:
+        conn.close()
+    print(f"Done. stocks={len(ids)}, affected={done}")
+
+
+if __name__ == "__main__":
+    main()
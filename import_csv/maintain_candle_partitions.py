@@ -0,0 +1,274 @@
+"""
+stock_price_candles 파티션 관리 (cron 등으로 하루 한 번 실행)
+
+파티션 구성: RANGE COLUMNS (timeframe, candle_time)
+  p_lt_1h      : 1D 등 '1H'보다 앞 문자열 timeframe (보관 정책 대상 아님)
+  p_1h_YYYYMM  : 1H 월별 (해당 월 + 그 이전에 남아 있는 1H)
+  p_1h_max     : 아직 월 파티션이 없는 미래 1H
+  p_gt_1h      : 1M / 1W
+
+1) 파티션이 없는 기존 테이블이면 migrate (CANDLE_PARTITION_MIGRATE=1일 때만)
+   - fk_candle_stock / 중복 인덱스 idx_candle_stock_time 삭제
+   - PK (id) -> (id, timeframe, candle_time), 1H 데이터가 있는 달부터 월 파티션 생성 (테이블 재작성 1번)
+2) 이번 달 + CANDLE_PARTITION_AHEAD_MONTHS개월까지 월 파티션 미리 생성 (빈 p_1h_max를 나눔)
+3) CANDLE_1H_RETENTION_MONTHS 지난 1H 월 파티션은 CANDLE_ARCHIVE_DIR에 gzip CSV로 보관 후 DROP PARTITION
+   (DELETE 없이 파일 삭제 수준으로 끝남, 1D / 1W 캔들은 다른 파티션이라 그대로)
+
+보관 파일은 import_price_csv.py 입력 형식 (Date, Stock, Code, Open, High, Low, Close, Volume)
+  -> 복원: gunzip 후 TIMEFRAME=1H PRICE_CSV=... python import_price_csv.py
+
+CANDLE_PARTITION_DRY_RUN=1이면 실행할 SQL만 출력
+빈 스키마에서 migrate / REORGANIZE / 보관 dry run / 파티션 pruning 확인: python -m benchmarks.mysql_check
+"""
+import os
+import re
+import csv
+import gzip
+import time
+import pymysql
+from datetime import date
+
+from importer_core import connect, bump_data_version
+
+TABLE = "stock_price_candles"
+HOURLY = "1H"
+
+# 1H 보관 개월 수 (이번 달 포함 안 함, 0이면 삭제 안 함)
+CANDLE_1H_RETENTION_MONTHS = int(os.getenv("CANDLE_1H_RETENTION_MONTHS", "12"))
+# 미리 만들어 둘 미래 월 파티션 수
+CANDLE_PARTITION_AHEAD_MONTHS = int(os.getenv("CANDLE_PARTITION_AHEAD_MONTHS", "3"))
+CANDLE_ARCHIVE_DIR = os.getenv("CANDLE_ARCHIVE_DIR", "candle_archive")
+CANDLE_PARTITION_MIGRATE = os.getenv("CANDLE_PARTITION_MIGRATE", "0") == "1"
+CANDLE_PARTITION_DRY_RUN = os.getenv("CANDLE_PARTITION_DRY_RUN", "0") == "1"
+
+# 보관 파일 쓸 때 한 번에 가져올 행 수
+ARCHIVE_FETCH_ROWS = 10000
+
+LOW_PARTITION = "p_lt_1h"
+MAX_PARTITION = "p_1h_max"
+HIGH_PARTITION = "p_gt_1h"
+MONTH_PARTITION_RE = re.compile(r"^p_1h_(\d{4})(\d{2})$")
+
+ARCHIVE_HEADER = ["Date", "Stock", "Code", "Open", "High", "Low", "Close", "Volume"]
+
+PARTITIONS_SQL = """
+SELECT PARTITION_NAME
+FROM information_schema.PARTITIONS
+WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+ORDER BY PARTITION_ORDINAL_POSITION
+"""
+
+CONSTRAINT_EXISTS_SQL = """
+SELECT COUNT(*) FROM information_schema.TABLE_CONSTRAINTS
+WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND CONSTRAINT_NAME = %s
+"""
+
+INDEX_EXISTS_SQL = """
+SELECT COUNT(*) FROM information_schema.STATISTICS
+WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s
+"""
+
+# 파티션 이름은 MONTH_PARTITION_RE로 검사한 값만 넣음
+ARCHIVE_SQL = """
+SELECT DATE_FORMAT(c.candle_time, '%Y-%m-%d %H:%i:%s'), s.name_ko, s.ticker,
+       c.open_price, c.high_price, c.low_price, c.close_price, c.volume
+FROM stock_price_candles PARTITION ({partition}) c
+LEFT JOIN stocks s ON s.id = c.stock_id
+"""
+
+
+def add_months(d: date, n: int) -> date:
+    y, m = divmod(d.month - 1 + n, 12)
+    return date(d.year + y, m + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"p_1h_{month:%Y%m}"
+
+
+def partition_month(name: str) -> date | None:
+    m = MONTH_PARTITION_RE.match(name or "")
+    return date(int(m.group(1)), int(m.group(2)), 1) if m else None
+
+
+def month_partition_def(month: date) -> str:
+    return f"PARTITION {partition_name(month)} VALUES LESS THAN ('{HOURLY}', '{add_months(month, 1)} 00:00:00')"
+
+
+def months_between(first: date, last: date) -> list[date]:
+    out = []
+    m = first
+    while m <= last:
+        out.append(m)
+        m = add_months(m, 1)
+    return out
+
+
+def load_partitions(cur) -> list[str]:
+    """파티션 이름 (정의 순서). 파티션 없는 테이블이면 []"""
+    cur.execute(PARTITIONS_SQL, (TABLE,))
+    return [r[0] for r in cur.fetchall() if r[0] is not None]
+
+
+def first_hourly_month(cur, partition: str | None = None) -> date | None:
+    where = f"PARTITION ({partition})" if partition else ""
+    cur.execute(f"SELECT MIN(candle_time) FROM {TABLE} {where} WHERE timeframe = %s", (HOURLY,))
+    first = cur.fetchone()[0]
+    return first.date().replace(day=1) if first else None
+
+
+def migrate_sqls(cur, first_month: date, last_month: date) -> list[str]:
+    """파티션 없는 기존 테이블 -> 파티션 테이블"""
+    sqls = []
+    cur.execute(CONSTRAINT_EXISTS_SQL, (TABLE, "fk_candle_stock"))
+    if cur.fetchone()[0]:
+        sqls.append(f"ALTER TABLE {TABLE} DROP FOREIGN KEY fk_candle_stock")
+    # uq_candle_unique와 같은 컬럼 -> insert마다 같은 B-tree를 두 번 갱신하던 인덱스
+    cur.execute(INDEX_EXISTS_SQL, (TABLE, "idx_candle_stock_time"))
+    if cur.fetchone()[0]:
+        sqls.append(f"ALTER TABLE {TABLE} DROP INDEX idx_candle_stock_time")
+
+    parts = [f"PARTITION {LOW_PARTITION} VALUES LESS THAN ('{HOURLY}', '1000-01-01 00:00:00')"]
+    parts += [month_partition_def(m) for m in months_between(first_month, last_month)]
+    parts += [
+        f"PARTITION {MAX_PARTITION} VALUES LESS THAN ('{HOURLY}', MAXVALUE)",
+        f"PARTITION {HIGH_PARTITION} VALUES LESS THAN (MAXVALUE, MAXVALUE)",
+    ]
+    sqls.append(
+        f"ALTER TABLE {TABLE} DROP PRIMARY KEY, ADD PRIMARY KEY (id, timeframe, candle_time)\n"
+        f"PARTITION BY RANGE COLUMNS (timeframe, candle_time) (\n  " + ",\n  ".join(parts) + "\n)"
+    )
+    return sqls
+
+
+def create_future_sql(partitions: list[str], cur, last_month: date) -> tuple[str | None, int]:
+    """
+    p_1h_max를 나눠서 last_month까지 월 파티션 생성. return: (SQL, 새 파티션 수)
+    월 파티션이 하나도 없으면 p_1h_max에 들어있는 가장 오래된 1H 달부터 (없으면 이번 달부터)
+    """
+    months = [m for m in map(partition_month, partitions) if m]
+    if months:
+        first = add_months(max(months), 1)
+    else:
+        first = first_hourly_month(cur, MAX_PARTITION) or date.today().replace(day=1)
+    new = months_between(first, last_month)
+    if not new:
+        return None, 0
+    parts = [month_partition_def(m) for m in new]
+    parts.append(f"PARTITION {MAX_PARTITION} VALUES LESS THAN ('{HOURLY}', MAXVALUE)")
+    sql = f"ALTER TABLE {TABLE} REORGANIZE PARTITION {MAX_PARTITION} INTO (\n  " + ",\n  ".join(parts) + "\n)"
+    return sql, len(new)
+
+
+def expired_partitions(partitions: list[str], cutoff: date) -> list[str]:
+    return [p for p in partitions if (m := partition_month(p)) and m < cutoff]
+
+
+def archive_partition(conn, partition: str, out_dir: str) -> tuple[str, int]:
+    """
+    파티션 전체를 gzip CSV로 저장 (server-side cursor로 흘려서 메모리 일정)
+    임시 파일에 다 쓴 뒤 rename -> 중간에 실패해도 반쯤 쓴 보관 파일이 남지 않음
+    """
+    if not MONTH_PARTITION_RE.match(partition):
+        raise ValueError(f"unexpected partition name: {partition}")
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, f"{TABLE}_{partition}.csv.gz")
+    tmp = path + ".tmp"
+
+    rows = 0
+    with conn.cursor(pymysql.cursors.SSCursor) as cur, gzip.open(tmp, "wt", encoding="utf-8", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(ARCHIVE_HEADER)
+        cur.execute(ARCHIVE_SQL.format(partition=partition))
+        while True:
+            batch = cur.fetchmany(ARCHIVE_FETCH_ROWS)
+            if not batch:
+                break
+            w.writerows(batch)
+            rows += len(batch)
+    os.replace(tmp, path)
+    return path, rows
+
+
+def drop_expired(conn, partition: str, out_dir: str) -> int | None:
+    """보관 -> 행 수가 그대로인지 확인 -> DROP PARTITION. return: 보관한 행 수 (건너뛰면 None)"""
+    path, rows = archive_partition(conn, partition, out_dir)
+    # 보관 때 읽은 스냅샷을 끝내야 그 사이 들어온 행이 COUNT에 보임
+    conn.commit()
+    with conn.cursor() as cur:
+        cur.execute(f"SELECT COUNT(*) FROM {TABLE} PARTITION ({partition})")
+        now = int(cur.fetchone()[0])
+        if now != rows:
+            # 보관 중에 과거 1H가 새로 들어옴 -> 다음 실행에서 다시 보관
+            print(f"[SKIP] {partition}: rows changed while archiving ({rows} -> {now})")
+            return None
+        cur.execute(f"ALTER TABLE {TABLE} DROP PARTITION {partition}")
+    print(f"[ARCHIVE] {partition}: {rows} rows -> {path}")
+    return rows
+
+
+def maintain(conn, today: date | None = None, dry_run: bool = CANDLE_PARTITION_DRY_RUN) -> dict:
+    today = today or date.today()
+    this_month = today.replace(day=1)
+    last_month = add_months(this_month, CANDLE_PARTITION_AHEAD_MONTHS)
+    cutoff = add_months(this_month, -CANDLE_1H_RETENTION_MONTHS) if CANDLE_1H_RETENTION_MONTHS > 0 else None
+
+    def run(cur, sql: str):
+        print(sql + ";")
+        if not dry_run:
+            cur.execute(sql)
+
+    res = {"migrated": False, "created": 0, "dropped": [], "archived_rows": 0}
+    with conn.cursor() as cur:
+        partitions = load_partitions(cur)
+        if not partitions:
+            if not CANDLE_PARTITION_MIGRATE:
+                raise SystemExit(f"{TABLE} is not partitioned. Run with CANDLE_PARTITION_MIGRATE=1 to migrate.")
+            first = first_hourly_month(cur) or this_month
+            if cutoff is not None:
+                # 어차피 보관 후 지울 달은 마이그레이션 때 따로 나누지 않음 (첫 월 파티션에 같이 들어감)
+                first = max(first, add_months(cutoff, -1))
+            for sql in migrate_sqls(cur, min(first, this_month), last_month):
+                run(cur, sql)
+            res["migrated"] = True
+            partitions = load_partitions(cur) if not dry_run else []
+
+        if partitions:
+            sql, res["created"] = create_future_sql(partitions, cur, last_month)
+            if sql:
+                run(cur, sql)
+                partitions = load_partitions(cur) if not dry_run else partitions
+
+    if cutoff is not None:
+        for p in expired_partitions(partitions, cutoff):
+            if dry_run:
+                print(f"-- archive {p} -> {CANDLE_ARCHIVE_DIR}")
+                print(f"ALTER TABLE {TABLE} DROP PARTITION {p};")
+                continue
+            rows = drop_expired(conn, p, CANDLE_ARCHIVE_DIR)
+            if rows is not None:
+                res["dropped"].append(p)
+                res["archived_rows"] += rows
+    conn.commit()
+    return res
+
+
+def main():
+    started = time.perf_counter()
+    conn = connect()
+    try:
+        res = maintain(conn)
+        if res["dropped"] and not CANDLE_PARTITION_DRY_RUN:
+            bump_data_version(conn, "candles")
+    finally:
+        conn.close()
+
+    print(
+        f"Done. migrated={res['migrated']}, created={res['created']}, "
+        f"dropped={len(res['dropped'])}, archived_rows={res['archived_rows']}, "
+        f"elapsed={time.perf_counter() - started:.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
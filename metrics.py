@@ -0,0 +1,245 @@
+"""
+API 지표 수집 + Prometheus text 형식 출력 (/metrics)
+
+- 요청 지연      : MetricsMiddleware (ASGI), method / route 템플릿 / status별
+- 요청당 DB 시간 : 요청 동안의 쿼리 실행 + 풀 대기 합계 (요청 지연에서 빼면 직렬화 / 앱 코드 시간)
+- 쿼리 실행 시간 : engine의 before/after_cursor_execute 이벤트, 라벨은 "plan 이름:단계"
+- 반환 행 수     : cursor.rowcount (SELECT는 가져온 행 수, 스트리밍 커서는 제외)
+- 풀 대기 시간   : db.execute / db.stream이 커넥션을 받기까지 걸린 시간
+- SLOW_QUERY_MS를 넘는 쿼리는 finsight.slow_query 로거로 SQL + 파라미터 기록
+
+외부 라이브러리 없이 프로세스 내에서만 집계 (워커가 여러 개면 워커별로 따로 보임)
+"""
+import os
+import re
+import time
+import logging
+import threading
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+# 이 시간(ms) 이상 걸린 쿼리는 slow query 로그로 (0이면 끔)
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+# slow query 로그에 남길 파라미터 문자열 최대 길이
+SLOW_QUERY_PARAMS_MAX = int(os.getenv("SLOW_QUERY_PARAMS_MAX", "1000"))
+
+# histogram 버킷 (초)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+ROWS_BUCKETS = (0, 1, 10, 50, 100, 500, 1000, 5000, 10000, 50000, 100000)
+
+slow_query_log = logging.getLogger("finsight.slow_query")
+
+# 현재 요청의 DB 시간 누적 ([초]; threadpool로 넘어가도 같은 list를 보게 mutable로 둠)
+_request_db = ContextVar("finsight_request_db", default=None)
+
+
+def _escape(v) -> str:
+    return str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _num(v: float) -> str:
+    return repr(float(v)) if v != int(v) else str(int(v))
+
+
+class Counter:
+    def __init__(self, name: str, help_: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help_
+        self.label_names = labels
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: tuple = (), amount: float = 1.0):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> list[str]:
+        out = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, v in items:
+            out.append(f"{self.name}{_labels(self.label_names, labels)} {_num(v)}")
+        return out
+
+
+class Histogram:
+    """
+    라벨 조합별 버킷 카운트 + 합계 (Prometheus histogram과 같은 누적 버킷으로 출력)
+    """
+
+    def __init__(self, name: str, help_: str, labels: tuple[str, ...] = (), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_
+        self.label_names = labels
+        self.buckets = tuple(buckets)
+        # labels -> [버킷별 개수(+Inf 포함), 합계]
+        self._series: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: tuple, value: float):
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            s = self._series.get(labels)
+            if s is None:
+                s = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            s[0][i] += 1
+            s[1] += value
+
+    def render(self) -> list[str]:
+        out = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((k, (list(c), total)) for k, (c, total) in self._series.items())
+        inf_label = 'le="+Inf"'
+        for labels, (counts, total) in items:
+            acc = 0
+            for le, c in zip(self.buckets, counts):
+                acc += c
+                le_label = f'le="{_num(le)}"'
+                out.append(f"{self.name}_bucket{_labels(self.label_names, labels, le_label)} {acc}")
+            acc += counts[-1]
+            out.append(f"{self.name}_bucket{_labels(self.label_names, labels, inf_label)} {acc}")
+            out.append(f"{self.name}_sum{_labels(self.label_names, labels)} {total!r}")
+            out.append(f"{self.name}_count{_labels(self.label_names, labels)} {acc}")
+        return out
+
+
+request_seconds = Histogram(
+    "finsight_request_duration_seconds", "HTTP request latency (until the last body chunk is sent)",
+    ("method", "route", "status"),
+)
+request_db_seconds = Histogram(
+    "finsight_request_db_seconds", "Time spent in SQL execution and pool checkout per request",
+    ("method", "route"),
+)
+query_seconds = Histogram(
+    "finsight_query_duration_seconds", "SQL statement execution time", ("query",),
+)
+query_rows = Histogram(
+    "finsight_query_rows", "Rows returned per SQL statement", ("query",), buckets=ROWS_BUCKETS,
+)
+pool_wait_seconds = Histogram(
+    "finsight_db_pool_wait_seconds", "Time waiting for a pooled DB connection", ("mode",),
+)
+slow_queries = Counter(
+    "finsight_slow_queries_total", f"SQL statements slower than SLOW_QUERY_MS ({SLOW_QUERY_MS:g}ms)", ("query",),
+)
+
+ALL_METRICS = [request_seconds, request_db_seconds, query_seconds, query_rows, pool_wait_seconds, slow_queries]
+
+
+def add_request_db_time(seconds: float):
+    acc = _request_db.get()
+    if acc is not None:
+        acc[0] += seconds
+
+
+def observe_pool_wait(mode: str, seconds: float):
+    pool_wait_seconds.observe((mode,), seconds)
+    add_request_db_time(seconds)
+
+
+# SQLAlchemy 이벤트
+# 시작 시각은 실행 단위 context에 둠 (실패한 실행이 남긴 값이 다음 쿼리에 섞이지 않게)
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._finsight_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_finsight_started", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    label = context.execution_options.get("metrics_label", "other")
+    query_seconds.observe((label,), elapsed)
+    add_request_db_time(elapsed)
+
+    # 스트리밍(server-side) 커서는 rowcount가 -1 / 의미 없는 큰 값
+    rowcount = getattr(cursor, "rowcount", -1)
+    if 0 <= rowcount < 2 ** 63 - 1 and not executemany:
+        query_rows.observe((label,), rowcount)
+
+    if SLOW_QUERY_MS > 0 and elapsed * 1000 >= SLOW_QUERY_MS:
+        slow_queries.inc((label,))
+        params = repr(parameters)
+        if len(params) > SLOW_QUERY_PARAMS_MAX:
+            params = params[:SLOW_QUERY_PARAMS_MAX] + "..."
+        slow_query_log.warning(
+            "slow query %.1fms [%s] %s params=%s",
+            elapsed * 1000, label, re.sub(r"\s+", " ", statement).strip(), params,
+        )
+
+
+def instrument_engine(sync_engine):
+    """sync Engine (async면 async_engine.sync_engine)에 쿼리 이벤트 연결"""
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# ASGI 미들웨어
+class MetricsMiddleware:
+    """
+    요청 지연 / 요청당 DB 시간 기록
+    StreamingResponse도 마지막 body 조각을 보낼 때까지 잼 (BaseHTTPMiddleware는 응답 시작까지만 잼)
+    route 라벨은 경로 템플릿 (/stocks/{stock_id}/candles) - 매칭 안 된 경로는 "unmatched"
+    """
+
+    def __init__(self, app, skip_paths: tuple[str, ...] = ("/metrics",)):
+        self.app = app
+        self.skip_paths = skip_paths
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.skip_paths:
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        db_time = [0.0]
+        token = _request_db.set(db_time)
+        status = [500]
+        done = [False]
+
+        def record():
+            if done[0]:
+                return
+            done[0] = True
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            method = scope["method"]
+            request_seconds.observe((method, route, str(status[0])), time.perf_counter() - started)
+            request_db_seconds.observe((method, route), db_time[0])
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                record()
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            record()
+            _request_db.reset(token)
+
+
+def sample(name: str, type_: str, help_: str, value: float) -> list[str]:
+    """라벨 없는 단일 값 (다른 모듈이 들고 있는 카운터 / 현재값을 /metrics에 같이 낼 때)"""
+    return [f"# HELP {name} {help_}", f"# TYPE {name} {type_}", f"{name} {_num(value)}"]
+
+
+def render(extra: list[str] | None = None) -> str:
+    lines: list[str] = []
+    for m in ALL_METRICS:
+        lines.extend(m.render())
+    if extra:
+        lines.extend(extra)
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,546 @@
+"""
+API 쿼리 레이어
+
+엔드포인트별 SQL + 결과 가공을 plan(제너레이터)으로 정의.
+실행은 db.execute()가 동기/비동기 엔진 중 하나로 처리한다. (규칙은 db.py 참고)
+"""
+import calendar
+from datetime import date
+
+from fastapi import HTTPException
+from sqlalchemy import text, bindparam
+
+import analytics
+from downsample import lttb_indices
+
+
+# 공통
+def data_versions_plan():
+    rows = yield text("SELECT name, version FROM data_versions;"), {}, "all"
+    return {r["name"]: int(r["version"]) for r in rows}
+
+
+def registry_plan():
+    sources = yield text("SELECT id, code FROM sources;"), {}, "all"
+    stocks = yield text("SELECT id, ticker, name_ko, name_en FROM stocks;"), {}, "all"
+    return {"sources": sources, "stocks": stocks}
+
+
+def require_source(reg, code: str) -> int:
+    sid = reg.source_id(code)
+    if sid is None:
+        raise HTTPException(status_code=404, detail=f"No source: {code}")
+    return sid
+
+
+# Recommendations
+# source id / 종목명은 registry에서 붙임 (sources 서브쿼리, stocks JOIN 없음)
+RECOMMENDATION_DATES_Q = text("""
+    SELECT
+      c.signal_date,
+      c.loaded_cnt,
+      c.total_stocks,
+      CAST(c.total_stocks AS SIGNED) - CAST(c.loaded_cnt AS SIGNED) AS missing_cnt
+    FROM recommendation_coverage c
+    WHERE c.source_id = :sid
+    ORDER BY c.signal_date DESC;
+""")
+
+# 날짜 선택은 recommendation_coverage 인덱스만 읽음
+LATEST_COMPLETE_DATE_Q = text("""
+    SELECT c.signal_date
+    FROM recommendation_coverage c
+    WHERE c.source_id = :sid
+      AND c.is_complete = 1
+    ORDER BY c.signal_date DESC
+    LIMIT 1;
+""")
+
+LATEST_DATE_Q = text("""
+    SELECT MAX(signal_date) AS signal_date
+    FROM recommendation_coverage
+    WHERE source_id = :sid;
+""")
+
+RECOMMENDATIONS_BY_DATE_Q = text("""
+    SELECT
+      r.stock_id, r.source_id, r.signal_date,
+      r.positive_ratio, r.threshold_used, r.is_recommended,
+      r.actual_is_up, r.is_hit
+    FROM stock_daily_recommendations r
+    WHERE r.source_id = :sid
+      AND r.signal_date = :signal_date
+    ORDER BY r.positive_ratio DESC
+    LIMIT :limit;
+""")
+
+# keyset 페이지: signal_date < :before 로 idx_rec_stock_date (stock_id, signal_date) 범위 스캔
+STOCK_RECOMMENDATIONS_COLUMNS = [
+    "signal_date", "positive_ratio", "threshold_used",
+    "is_recommended", "actual_is_up", "is_hit",
+]
+
+STOCK_RECOMMENDATIONS_Q = text("""
+    SELECT
+      r.signal_date, r.positive_ratio, r.threshold_used,
+      r.is_recommended, r.actual_is_up, r.is_hit
+    FROM stock_daily_recommendations r
+    WHERE r.stock_id = :stock_id
+      AND r.source_id = :sid
+      AND r.signal_date < :before
+    ORDER BY r.signal_date DESC
+    LIMIT :limit;
+""")
+
+# 전체 히스토리 export용 (LIMIT 없음, server-side cursor로 읽음)
+STOCK_RECOMMENDATIONS_ALL_Q = text("""
+    SELECT
+      r.signal_date, r.positive_ratio, r.threshold_used,
+      r.is_recommended, r.actual_is_up, r.is_hit
+    FROM stock_daily_recommendations r
+    WHERE r.stock_id = :stock_id
+      AND r.source_id = :sid
+      AND r.signal_date < :before
+    ORDER BY r.signal_date DESC;
+""")
+
+
+def recommendation_dates_plan(reg):
+    rows = yield RECOMMENDATION_DATES_Q, {"sid": require_source(reg, "NAVER")}, "all"
+    return {"items": rows}
+
+
+def latest_recommendations_plan(reg, limit: int, complete_only: bool):
+    sid = require_source(reg, "NAVER")
+    date_q = LATEST_COMPLETE_DATE_Q if complete_only else LATEST_DATE_Q
+    d = yield date_q, {"sid": sid}, "first"
+    if not d or not d["signal_date"]:
+        raise HTTPException(status_code=404, detail="No recommendation data")
+
+    chosen_date = d["signal_date"]
+    items = yield RECOMMENDATIONS_BY_DATE_Q, {"sid": sid, "signal_date": chosen_date, "limit": limit}, "all"
+    for r in items:
+        r["stock_ticker"], r["stock_name_ko"], r["stock_name_en"] = reg.stock(r["stock_id"])
+    return {"signal_date": str(chosen_date), "items": items}
+
+
+def stock_recommendations_plan(reg, stock_id: int, limit: int, before=None):
+    """
+    before(커서)보다 이전 날짜로 limit개. 다음 페이지는 next_before를 그대로 넘기면 됨
+    """
+    params = {"stock_id": stock_id, "sid": require_source(reg, "NAVER"),
+              "limit": limit, "before": before or date.max}
+    rows = yield STOCK_RECOMMENDATIONS_Q, params, "all"
+    if not rows and before is None:
+        raise HTTPException(status_code=404, detail="No data for this stock_id")
+
+    next_before = str(rows[-1]["signal_date"]) if len(rows) == limit else None
+    return {"stock_id": stock_id, "items": rows, "next_before": next_before}
+
+
+def stock_recommendations_stream_args(reg, stock_id: int, before=None):
+    params = {"stock_id": stock_id, "sid": require_source(reg, "NAVER"), "before": before or date.max}
+    return STOCK_RECOMMENDATIONS_ALL_Q, params
+
+
+# Hot Topics
+def hot_topics_q(limit: int):
+    return text(f"""
+        SELECT
+          h.topic_date,
+          h.stock_id,
+          h.mentions,
+          h.mentions_7d_ma,
+          h.daily_growth_pct,
+          h.weekly_growth_pct,
+          h.popularity
+        FROM hot_topics h
+        WHERE h.source_id = :sid
+          AND h.topic_date = :d
+        ORDER BY h.popularity DESC
+        LIMIT {int(limit)};
+    """)
+
+
+def with_stock_names(reg, rows: list[dict]) -> list[dict]:
+    """hot_topics 행에 code / name_ko 붙임 (기존 응답 키 순서 유지)"""
+    out = []
+    for r in rows:
+        ticker, name_ko, _ = reg.stock(r["stock_id"])
+        out.append({"topic_date": r.pop("topic_date"), "stock_id": r.pop("stock_id"),
+                    "code": ticker, "name_ko": name_ko, **r})
+    return out
+
+
+def hot_topics_latest_plan(reg, limit: int, source_code: str):
+    sid = require_source(reg, source_code)
+
+    last = yield text("SELECT MAX(topic_date) AS d FROM hot_topics WHERE source_id=:sid;"), {"sid": sid}, "first"
+    if not last or not last["d"]:
+        raise HTTPException(status_code=404, detail="No hot_topics data")
+
+    d = last["d"]
+    rows = yield hot_topics_q(limit), {"sid": sid, "d": d}, "all"
+    return {"topic_date": str(d), "items": with_stock_names(reg, rows)}
+
+
+def hot_topics_by_date_plan(reg, date_, limit: int, source_code: str):
+    sid = require_source(reg, source_code)
+
+    rows = yield hot_topics_q(limit), {"sid": sid, "d": date_}, "all"
+    if not rows:
+        raise HTTPException(status_code=404, detail="No hot_topics data for this date")
+    return {"topic_date": str(date_), "items": with_stock_names(reg, rows)}
+
+
+# 여러 종목 한 번에 (watchlist): 테이블당 쿼리 1번, 종목별 [start, end] 구간의 최신 행
+BATCH_RECOMMENDATIONS_Q = text("""
+    SELECT
+      r.stock_id, r.signal_date, r.positive_ratio, r.threshold_used,
+      r.is_recommended, r.actual_is_up, r.is_hit
+    FROM (
+      SELECT stock_id, MAX(signal_date) AS d
+      FROM stock_daily_recommendations
+      WHERE source_id = :sid
+        AND stock_id IN :ids
+        AND signal_date BETWEEN :start AND :end
+      GROUP BY stock_id
+    ) m
+    JOIN stock_daily_recommendations r
+      ON r.stock_id = m.stock_id
+     AND r.source_id = :sid
+     AND r.signal_date = m.d;
+""").bindparams(bindparam("ids", expanding=True))
+
+BATCH_HOT_TOPICS_Q = text("""
+    SELECT
+      h.stock_id, h.topic_date, h.mentions, h.mentions_7d_ma,
+      h.daily_growth_pct, h.weekly_growth_pct, h.popularity
+    FROM (
+      SELECT stock_id, MAX(topic_date) AS d
+      FROM hot_topics
+      WHERE source_id = :sid
+        AND stock_id IN :ids
+        AND topic_date BETWEEN :start AND :end
+      GROUP BY stock_id
+    ) m
+    JOIN hot_topics h
+      ON h.stock_id = m.stock_id
+     AND h.source_id = :sid
+     AND h.topic_date = m.d;
+""").bindparams(bindparam("ids", expanding=True))
+
+
+def stocks_batch_plan(reg, stock_ids: list[int], start, end, source_code: str):
+    """
+    종목별 {ticker, name_ko, recommendation, hot_topic} (입력 순서 유지, 없으면 None)
+    """
+    ids = list(dict.fromkeys(stock_ids))
+    params = {"ids": ids, "start": start, "end": end, "sid": require_source(reg, source_code)}
+
+    recs = yield BATCH_RECOMMENDATIONS_Q, params, "all"
+    hots = yield BATCH_HOT_TOPICS_Q, params, "all"
+
+    rec_by = {r.pop("stock_id"): r for r in recs}
+    hot_by = {h.pop("stock_id"): h for h in hots}
+    items = []
+    for i in ids:
+        ticker, name_ko, _ = reg.stock(i)
+        items.append({"stock_id": i, "ticker": ticker, "name_ko": name_ko,
+                      "recommendation": rec_by.get(i), "hot_topic": hot_by.get(i)})
+    return {"source_code": source_code, "start": str(start), "end": str(end), "items": items}
+
+
+# Quotes (latest_quotes 스냅샷, import 때 갱신)
+QUOTE_COLUMNS = "stock_id, candle_time, close_price, prev_close, change_pct, volume"
+
+# PK (timeframe, stock_id) 점 조회
+QUOTES_Q = text(f"""
+    SELECT {QUOTE_COLUMNS}
+    FROM latest_quotes
+    WHERE timeframe = :tf AND stock_id IN :ids
+    ORDER BY stock_id;
+""").bindparams(bindparam("ids", expanding=True))
+
+# PK 앞부분 (timeframe) 범위 스캔 = 전 종목
+QUOTES_ALL_Q = text(f"""
+    SELECT {QUOTE_COLUMNS}
+    FROM latest_quotes
+    WHERE timeframe = :tf
+    ORDER BY stock_id;
+""")
+
+
+def quote_fields(row: dict) -> dict:
+    """latest_quotes 행 -> 응답 필드 (시세가 없으면 전부 None)"""
+    if row["close_price"] is None:
+        return {"candle_time": None, "close": None, "prev_close": None, "change": None, "change_pct": None}
+    close = float(row["close_price"])
+    prev = float(row["prev_close"]) if row["prev_close"] is not None else None
+    return {
+        "candle_time": row["candle_time"],
+        "close": close,
+        "prev_close": prev,
+        "change": round(close - prev, 2) if prev is not None else None,
+        "change_pct": float(row["change_pct"]) if row["change_pct"] is not None else None,
+    }
+
+
+def quotes_plan(reg, stock_ids: list[int] | None, timeframe: str):
+    """stock_ids가 None이면 전 종목 (stock_id 순)"""
+    if stock_ids is None:
+        rows = yield QUOTES_ALL_Q, {"tf": timeframe}, "all"
+    else:
+        rows = yield QUOTES_Q, {"tf": timeframe, "ids": stock_ids}, "all"
+
+    items = []
+    for r in rows:
+        ticker, name_ko, _ = reg.stock(r["stock_id"])
+        items.append({
+            "stock_id": r["stock_id"],
+            "ticker": ticker,
+            "name_ko": name_ko,
+            **quote_fields(r),
+            "volume": int(r["volume"]),
+        })
+    return {"timeframe": timeframe, "count": len(items), "items": items}
+
+
+# Rankings (stock_daily_metrics, 일봉 import 후 계산)
+# metric 파라미터 -> 컬럼 (각각 (metric_date, 컬럼) 인덱스가 있음)
+RANKING_METRICS = {
+    "daily_return": "daily_return_pct",
+    "volatility": "volatility_pct",
+    "volume_ratio": "volume_ratio",
+}
+
+
+def rankings_q(metric: str, descending: bool, limit: int):
+    """
+    날짜 하나의 (metric_date, 컬럼) 인덱스 범위를 한쪽 끝부터 LIMIT개만 읽음 (filesort 없음)
+    NULL(이력이 짧은 종목)은 제외
+    """
+    col = RANKING_METRICS[metric]
+    order = "DESC" if descending else "ASC"
+    return text(f"""
+        SELECT stock_id, close_price, daily_return_pct, volatility_pct, volume, volume_ratio
+        FROM stock_daily_metrics
+        WHERE metric_date = :d
+          AND {col} IS NOT NULL
+        ORDER BY {col} {order}
+        LIMIT {int(limit)};
+    """)
+
+
+def rankings_plan(reg, date_, metric: str, descending: bool, limit: int):
+    """date_가 None이면 마지막 집계일"""
+    if date_ is None:
+        last = yield text("SELECT MAX(metric_date) AS d FROM stock_daily_metrics;"), {}, "first"
+        if not last or not last["d"]:
+            raise HTTPException(status_code=404, detail="No daily metrics data")
+        date_ = last["d"]
+
+    rows = yield rankings_q(metric, descending, limit), {"d": date_}, "all"
+    if not rows:
+        raise HTTPException(status_code=404, detail="No daily metrics for this date")
+    items = []
+    for rank, r in enumerate(rows, start=1):
+        ticker, name_ko, _ = reg.stock(r["stock_id"])
+        items.append({
+            "rank": rank,
+            "stock_id": r["stock_id"],
+            "ticker": ticker,
+            "name_ko": name_ko,
+            "close": float(r["close_price"]),
+            "daily_return_pct": float(r["daily_return_pct"]) if r["daily_return_pct"] is not None else None,
+            "volatility_pct": float(r["volatility_pct"]) if r["volatility_pct"] is not None else None,
+            "volume": int(r["volume"]),
+            "volume_ratio": float(r["volume_ratio"]) if r["volume_ratio"] is not None else None,
+        })
+    return {"date": str(date_), "metric": metric, "order": "desc" if descending else "asc", "items": items}
+
+
+# Dashboard (관심 종목)
+# 세 쿼리 모두 user_favorites(idx_fav_user)에서 시작해서 종목마다 인덱스 한 번씩만 탐색
+# -> 관심 종목 수가 늘어도 쿼리 수는 3개 그대로
+DASHBOARD_QUOTES_Q = text("""
+    SELECT f.stock_id, q.candle_time, q.close_price, q.prev_close, q.change_pct
+    FROM user_favorites f
+    LEFT JOIN latest_quotes q
+      ON q.timeframe = :tf AND q.stock_id = f.stock_id
+    WHERE f.user_id = :user_id
+    ORDER BY f.id;
+""")
+
+DASHBOARD_RECOMMENDATIONS_Q = text("""
+    SELECT f.stock_id, r.signal_date, r.positive_ratio, r.threshold_used,
+           r.is_recommended, r.actual_is_up, r.is_hit
+    FROM user_favorites f
+    JOIN LATERAL (
+      SELECT x.signal_date, x.positive_ratio, x.threshold_used,
+             x.is_recommended, x.actual_is_up, x.is_hit
+      FROM stock_daily_recommendations x
+      WHERE x.stock_id = f.stock_id AND x.source_id = :sid
+      ORDER BY x.signal_date DESC
+      LIMIT 1
+    ) r ON TRUE
+    WHERE f.user_id = :user_id;
+""")
+
+# source의 최신 topic_date 하루치 (uq_hot_source_date_stock)
+DASHBOARD_HOT_TOPICS_Q = text("""
+    SELECT f.stock_id, h.topic_date, h.mentions, h.popularity
+    FROM user_favorites f
+    JOIN hot_topics h
+      ON h.source_id = :sid
+     AND h.topic_date = (SELECT MAX(topic_date) FROM hot_topics WHERE source_id = :sid)
+     AND h.stock_id = f.stock_id
+    WHERE f.user_id = :user_id;
+""")
+
+
+def dashboard_plan(reg, user_id: int, source_code: str, timeframe: str):
+    sid = require_source(reg, source_code)
+    favs = yield DASHBOARD_QUOTES_Q, {"user_id": user_id, "tf": timeframe}, "all"
+    if not favs:
+        return {"user_id": user_id, "count": 0, "items": []}
+
+    params = {"user_id": user_id, "sid": sid}
+    recs = yield DASHBOARD_RECOMMENDATIONS_Q, params, "all"
+    hots = yield DASHBOARD_HOT_TOPICS_Q, params, "all"
+
+    rec_by = {r.pop("stock_id"): r for r in recs}
+    hot_by = {h.pop("stock_id"): h for h in hots}
+    items = []
+    for f in favs:
+        i = f["stock_id"]
+        ticker, name_ko, _ = reg.stock(i)
+        items.append({
+            "stock_id": i,
+            "ticker": ticker,
+            "name_ko": name_ko,
+            **quote_fields(f),
+            "recommendation": rec_by.get(i),
+            "hot_topic": hot_by.get(i),
+        })
+    return {"user_id": user_id, "count": len(items), "items": items}
+
+
+# Analytics
+# 결과가 나온 행만 (actual_is_up NULL은 아직 다음 거래일 전)
+SWEEP_ROWS_Q = text("""
+    SELECT r.signal_date, r.positive_ratio, r.actual_is_up
+    FROM stock_daily_recommendations r
+    WHERE r.source_id = :sid
+      AND r.signal_date BETWEEN :start AND :end
+      AND r.actual_is_up IS NOT NULL;
+""")
+
+
+def threshold_sweep_plan(reg, start, end, thresholds, daily: bool):
+    cols = yield SWEEP_ROWS_Q, {"sid": require_source(reg, "NAVER"), "start": start, "end": end}, "columns"
+    if not cols["signal_date"]:
+        raise HTTPException(status_code=404, detail="No recommendations with outcomes in this range")
+    return {"start": str(start), "end": str(end), **analytics.sweep_report(cols, thresholds, daily)}
+
+
+# Candles
+TIMEFRAME_ORDER = ["1H", "1D", "1W", "1M"]
+
+# 집계 단위별 버킷 시작 시각 (1W는 월요일, 1M은 1일 00:00)
+CANDLE_BUCKETS = {
+    "1D": "TIMESTAMP(DATE(candle_time))",
+    "1W": "TIMESTAMP(DATE(candle_time) - INTERVAL WEEKDAY(candle_time) DAY)",
+    "1M": "TIMESTAMP(DATE(candle_time) - INTERVAL (DAYOFMONTH(candle_time) - 1) DAY)",
+}
+
+# source_timeframe 미지정 시 읽을 원본 (1D / 1W는 import 때 롤업으로 저장됨, candle_rollup.py)
+DEFAULT_SOURCE_TIMEFRAME = {"1H": "1H", "1D": "1D", "1W": "1W", "1M": "1D"}
+
+# 원본 간격 그대로 (stock_id, timeframe, candle_time) 인덱스 범위 스캔
+# timeframe = / candle_time 범위가 파티션 키라 1H는 [start, end)에 걸친 월 파티션만 읽음
+RAW_CANDLES_Q = text("""
+    SELECT candle_time AS t, open_price AS o, high_price AS h,
+           low_price AS l, close_price AS c, volume AS v
+    FROM stock_price_candles
+    WHERE stock_id = :stock_id
+      AND timeframe = :source_tf
+      AND candle_time >= :start
+      AND candle_time < :end
+    ORDER BY candle_time;
+""")
+
+
+def aggregated_candles_q(timeframe: str):
+    """
+    같은 인덱스 범위 스캔 + 버킷별 집계
+    (시가=첫 봉 open, 고가=max, 저가=min, 종가=마지막 봉 close, 거래량=sum)
+    """
+    bucket = CANDLE_BUCKETS[timeframe]
+    return text(f"""
+        SELECT bucket AS t,
+               MAX(first_open) AS o, MAX(high_price) AS h, MIN(low_price) AS l,
+               MAX(last_close) AS c, SUM(volume) AS v
+        FROM (
+          SELECT {bucket} AS bucket, high_price, low_price, volume,
+                 FIRST_VALUE(open_price) OVER w AS first_open,
+                 LAST_VALUE(close_price) OVER w AS last_close
+          FROM stock_price_candles
+          WHERE stock_id = :stock_id
+            AND timeframe = :source_tf
+            AND candle_time >= :start
+            AND candle_time < :end
+          WINDOW w AS (
+            PARTITION BY {bucket} ORDER BY candle_time
+            ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING
+          )
+        ) x
+        GROUP BY bucket
+        ORDER BY bucket;
+    """)
+
+
+def to_columns(rows: list[dict]) -> dict:
+    """
+    캔들 리스트 -> 평행 배열 (t는 UTC epoch 초)
+    """
+    return {
+        "t": [calendar.timegm(r["t"].timetuple()) for r in rows],
+        "o": [float(r["o"]) for r in rows],
+        "h": [float(r["h"]) for r in rows],
+        "l": [float(r["l"]) for r in rows],
+        "c": [float(r["c"]) for r in rows],
+        "v": [int(r["v"]) for r in rows],
+    }
+
+
+def candles_plan(stock_id: int, start, end, timeframe: str, source_timeframe: str | None,
+                 max_points: int | None):
+    source_timeframe = source_timeframe or DEFAULT_SOURCE_TIMEFRAME[timeframe]
+    if TIMEFRAME_ORDER.index(timeframe) < TIMEFRAME_ORDER.index(source_timeframe):
+        raise HTTPException(status_code=400, detail="timeframe must not be finer than source_timeframe")
+
+    params = {"stock_id": stock_id, "source_tf": source_timeframe, "start": start, "end": end}
+    if timeframe == source_timeframe:
+        q = RAW_CANDLES_Q
+    else:
+        q = aggregated_candles_q(timeframe)
+
+    rows = yield q, params, "all"
+    if not rows:
+        raise HTTPException(status_code=404, detail="No candles for this stock_id / range")
+
+    cols = to_columns(rows)
+    total = len(cols["t"])
+    if max_points and total > max_points:
+        keep = lttb_indices(cols["t"], cols["c"], max_points)
+        cols = {k: [v[i] for i in keep] for k, v in cols.items()}
+
+    return {
+        "stock_id": stock_id,
+        "timeframe": timeframe,
+        "source_timeframe": source_timeframe,
+        "count": len(cols["t"]),
+        "total": total,
+        **cols,
+    }
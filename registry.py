@@ -0,0 +1,50 @@
+"""
+sources / stocks 인메모리 레지스트리
+
+- 작고 거의 안 바뀌는 테이블이라 프로세스 시작 때 한 번 읽어 dict로 들고 있음
+  (code -> source id, stock id -> ticker / name_ko / name_en, ticker -> stock id)
+- 엔드포인트는 sources 서브쿼리 / stocks JOIN 대신 여기서 찾아 붙임
+- data_versions의 "stocks" version이 바뀌면 다시 읽음 (importer가 stocks를 건드린 뒤 +1)
+"""
+import asyncio
+
+
+class Registry:
+    """
+    load: {"sources": [{id, code}], "stocks": [{id, ticker, name_ko, name_en}]}를 돌려주는 코루틴 함수
+    """
+
+    def __init__(self, load):
+        self.load = load
+        self.version: int | None = None
+        self.source_ids: dict[str, int] = {}
+        self.stocks: dict[int, tuple[str, str | None, str | None]] = {}
+        self.ticker_ids: dict[str, int] = {}
+        self._lock = asyncio.Lock()
+
+    async def refresh(self, version: int | None = None):
+        data = await self.load()
+        stocks = {int(s["id"]): (s["ticker"], s["name_ko"], s["name_en"]) for s in data["stocks"]}
+        # dict 통째로 바꿔 끼움 (읽는 쪽은 lock 없이 사용)
+        self.source_ids = {s["code"]: int(s["id"]) for s in data["sources"]}
+        self.stocks = stocks
+        self.ticker_ids = {t: i for i, (t, _, _) in stocks.items()}
+        self.version = version
+
+    async def ensure(self, version: int):
+        """stocks version이 바뀌었으면 다시 읽음"""
+        if version == self.version:
+            return self
+        async with self._lock:
+            if version != self.version:
+                await self.refresh(version)
+        return self
+
+    def source_id(self, code: str) -> int | None:
+        return self.source_ids.get(code)
+
+    def stock(self, stock_id: int) -> tuple[str | None, str | None, str | None]:
+        return self.stocks.get(stock_id, (None, None, None))
+
+    def stats(self) -> dict:
+        return {"version": self.version, "sources": len(self.source_ids), "stocks": len(self.stocks)}
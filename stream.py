@@ -0,0 +1,154 @@
+"""
+/stream (Server-Sent Events): 새 데이터 알림 push
+
+- 백그라운드 작업 하나가 STREAM_POLL_SEC마다 data_versions 스냅샷(DataVersions, 캐시와 공유)을 봄
+- 주제(topic)가 의존하는 version이 바뀌면 payload를 한 번만 계산하고,
+  SSE 프레임 bytes로 한 번 인코딩해서 모든 구독자 큐에 같은 객체를 넣음
+  -> 구독자가 몇 명이든 DB 읽기 / JSON 직렬화는 변경당 1번
+- version만 오르고 내용이 같으면 (같은 날짜 재적재 등) 보내지 않음
+- 새 구독자는 연결 직후 주제별 마지막 이벤트를 받음 (따로 /latest를 부를 필요 없음)
+- 느린 구독자는 큐가 차면 오래된 이벤트부터 버림 (주제별 최신 상태만 의미 있음)
+
+워커 프로세스마다 작업 하나 (구독자는 자기 워커의 작업에서만 받음)
+"""
+import os
+import json
+import asyncio
+import logging
+
+from fastapi.encoders import jsonable_encoder
+
+from cache import DataVersions, VERSION_CHECK_SEC
+
+STREAM_POLL_SEC = float(os.getenv("STREAM_POLL_SEC", str(VERSION_CHECK_SEC)))
+# 이벤트에 싣는 Top N (/hot-topics/latest 등의 기본 limit과 같으면 응답 캐시를 같이 씀)
+STREAM_TOP_N = int(os.getenv("STREAM_TOP_N", "20"))
+# 이벤트가 없을 때 보내는 주석 줄 간격 (프록시 idle timeout 방지)
+STREAM_HEARTBEAT_SEC = float(os.getenv("STREAM_HEARTBEAT_SEC", "15"))
+STREAM_QUEUE_SIZE = int(os.getenv("STREAM_QUEUE_SIZE", "16"))
+STREAM_MAX_CLIENTS = int(os.getenv("STREAM_MAX_CLIENTS", "10000"))
+# 끊겼을 때 브라우저 EventSource 재연결 대기 (ms)
+STREAM_RETRY_MS = int(os.getenv("STREAM_RETRY_MS", "5000"))
+
+log = logging.getLogger("finsight.stream")
+
+HEARTBEAT = b": ping\n\n"
+
+
+def sse_frame(event: str, data) -> bytes:
+    body = json.dumps(jsonable_encoder(data), ensure_ascii=False, separators=(",", ":"))
+    return f"event: {event}\ndata: {body}\n\n".encode("utf-8")
+
+
+class StreamHub:
+    """
+    topic(name, depends_on, compute)로 주제 등록
+      compute: payload를 돌려주는 코루틴 함수 (데이터가 없으면 None -> 이벤트 없음)
+    """
+
+    def __init__(self, versions: DataVersions, interval: float = STREAM_POLL_SEC,
+                 queue_size: int = STREAM_QUEUE_SIZE, max_clients: int = STREAM_MAX_CLIENTS):
+        self.versions = versions
+        self.interval = interval
+        self.queue_size = queue_size
+        self.max_clients = max_clients
+        self.topics: dict[str, tuple[tuple[str, ...], object]] = {}
+        # topic -> 마지막으로 처리한 version / 마지막으로 보낸 프레임
+        self._seen: dict[str, tuple[int, ...]] = {}
+        self._last: dict[str, bytes] = {}
+        # 구독자 큐 -> 받을 topic 집합
+        self._subscribers: dict[asyncio.Queue, frozenset[str]] = {}
+        self._task: asyncio.Task | None = None
+        self.published = 0
+        self.dropped = 0
+
+    def topic(self, name: str, depends_on: tuple[str, ...], compute):
+        self.topics[name] = (depends_on, compute)
+
+    # 백그라운드 작업
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await self.check()
+            except Exception:
+                # DB가 잠깐 안 될 때: 처리 못 한 topic은 다음 주기에 다시 시도
+                log.exception("stream check failed")
+            await asyncio.sleep(self.interval)
+
+    async def check(self):
+        snap = await self.versions.snapshot()
+        for name, (depends_on, compute) in self.topics.items():
+            version = tuple(snap.get(n, 0) for n in depends_on)
+            if self._seen.get(name) == version:
+                continue
+            payload = await compute()
+            self._seen[name] = version
+            if payload is None:
+                continue
+            frame = sse_frame(name, payload)
+            if self._last.get(name) == frame:
+                continue
+            self._last[name] = frame
+            self.publish(name, frame)
+
+    def publish(self, name: str, frame: bytes):
+        for q, topics in self._subscribers.items():
+            if name not in topics:
+                continue
+            if q.full():
+                q.get_nowait()
+                self.dropped += 1
+            q.put_nowait(frame)
+        self.published += 1
+
+    # 구독자
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscribers)
+
+    def full(self) -> bool:
+        return len(self._subscribers) >= self.max_clients
+
+    async def events(self, topics: frozenset[str]):
+        """
+        StreamingResponse용 async generator. 구독 등록은 첫 next()에서
+        (응답이 시작되기 전에 끊긴 연결이 구독자로 남지 않게)
+        """
+        q: asyncio.Queue = asyncio.Queue(max(self.queue_size, len(self.topics)))
+        for name, frame in self._last.items():
+            if name in topics:
+                q.put_nowait(frame)
+        self._subscribers[q] = topics
+        try:
+            yield f"retry: {STREAM_RETRY_MS}\n\n".encode("utf-8")
+            while True:
+                try:
+                    frame = await asyncio.wait_for(q.get(), STREAM_HEARTBEAT_SEC)
+                except asyncio.TimeoutError:
+                    frame = HEARTBEAT
+                yield frame
+        finally:
+            self._subscribers.pop(q, None)
+
+    def stats(self) -> dict:
+        return {
+            "subscribers": len(self._subscribers),
+            "published": self.published,
+            "dropped": self.dropped,
+            "running": self._task is not None and not self._task.done(),
+            "versions": dict(self._seen),
+        }